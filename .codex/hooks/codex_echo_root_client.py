@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Codex hook shim: hand the event to the resident hook daemon, or run the hook in-process.
+
+Only the standard library is imported until a fallback is needed, so a call
+answered by the daemon costs one interpreter start and one socket round trip.
+"""
+from __future__ import annotations
+
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+from typing import Any
+
+
+HOOKS_DIR = Path(__file__).resolve().parent
+REPO_ROOT = HOOKS_DIR.parents[1]
+RUNTIME_DIR = Path(os.environ.get("ECHO_ROOT_CODEX_HOOK_DIR", REPO_ROOT / "ve_data" / "codex_hooks"))
+SOCKET_PATH = RUNTIME_DIR / "codex_hook.sock"
+# Identity variables the hook reads; the daemon's own environment is not the caller's.
+FORWARDED_ENV = ("USERNAME", "USER", "CODEX_MODEL")
+CONNECT_TIMEOUT_SECONDS = 0.5
+
+
+class DaemonError(RuntimeError):
+    """The daemon took the event but failed while handling it."""
+
+
+def daemon_request(message: dict[str, Any], path: Path = SOCKET_PATH) -> dict[str, Any] | None:
+    """Send one request line to the daemon and return its reply, or None when no daemon is listening.
+
+    Once the request has been sent, errors raise instead of returning None:
+    the daemon may already have appended a receipt, so the caller must not
+    silently run the event a second time.
+    """
+    if not hasattr(socket, "AF_UNIX") or not path.exists():
+        return None
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        conn.settimeout(CONNECT_TIMEOUT_SECONDS)
+        try:
+            conn.connect(str(path))
+        except OSError:
+            return None
+        conn.settimeout(None)
+        conn.sendall(json.dumps(message).encode("utf-8") + b"\n")
+        with conn.makefile("rb") as reply:
+            line = reply.readline()
+    finally:
+        conn.close()
+    if not line:
+        raise DaemonError("hook daemon closed the connection without replying")
+    return json.loads(line)
+
+
+def main() -> int:
+    event = sys.argv[1] if len(sys.argv) > 1 else ""
+    raw = "" if sys.stdin.isatty() else sys.stdin.read()
+    message = {"event": event, "stdin": raw, "env": {key: os.environ[key] for key in FORWARDED_ENV if key in os.environ}}
+    reply = daemon_request(message)
+    if reply is not None and "error" in reply:
+        print(f"Echo Root hook daemon failed: {reply['error']}", file=sys.stderr)
+        return 1
+    if reply is None or reply.get("stale"):
+        sys.path.insert(0, str(HOOKS_DIR))
+        import codex_echo_root_hook as hook
+
+        if event not in hook.HOOK_EVENTS:
+            print(f"unknown hook event {event!r}; expected one of {', '.join(hook.HOOK_EVENTS)}", file=sys.stderr)
+            return 2
+        lines = hook.handle_event(event, hook._parse_payload(raw))
+    else:
+        lines = reply["lines"]
+    for line in lines:
+        print(json.dumps(line, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Resident Codex hook daemon: keeps the hook modules, score baseline, git state and repo map warm between events.
+
+Events arrive one JSON line per connection on a Unix socket in the hook
+runtime directory and are handled one at a time, so receipts append in the
+order events arrive. The daemon exits after an idle period, or as soon as one
+of its repo modules changes on disk; the client shim then runs the event
+in-process, so an edited hook never answers from stale code.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+from typing import Any
+
+
+HOOKS_DIR = Path(__file__).resolve().parent
+if str(HOOKS_DIR) not in sys.path:
+    sys.path.insert(0, str(HOOKS_DIR))
+
+import codex_echo_root_hook as hook  # noqa: E402
+from codex_echo_root_client import SOCKET_PATH, daemon_request  # noqa: E402
+
+
+IDLE_TIMEOUT_SECONDS = 30 * 60
+# A client that connects but never sends cannot hold up the events queued behind it.
+REQUEST_TIMEOUT_SECONDS = 5.0
+
+
+def _repo_modules() -> list[str]:
+    """Source files of every loaded module that lives in this repo."""
+    paths = []
+    for module in list(sys.modules.values()):
+        path = getattr(module, "__file__", None)
+        if path and Path(path).resolve().is_relative_to(hook.REPO_ROOT):
+            paths.append(path)
+    return paths
+
+
+def _source_stamp(paths: list[str]) -> list[int]:
+    stamp = []
+    for path in paths:
+        try:
+            stamp.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            stamp.append(-1)
+    return stamp
+
+
+class HookDaemon:
+    """Event state for one daemon process."""
+
+    def __init__(self) -> None:
+        self.events = 0
+        self.running = True
+        self.modules = _repo_modules()
+        self.sources = _source_stamp(self.modules)
+
+    def reply(self, message: dict[str, Any]) -> dict[str, Any]:
+        if message.get("ping"):
+            return {"pid": os.getpid(), "events": self.events}
+        if message.get("shutdown"):
+            self.running = False
+            return {"pid": os.getpid(), "events": self.events}
+        if _source_stamp(self.modules) != self.sources:
+            self.running = False
+            return {"stale": True}
+        try:
+            lines = hook.handle_event(str(message.get("event", "")), hook._parse_payload(str(message.get("stdin", ""))), dict(message.get("env", {})))
+        except Exception as exc:
+            return {"error": f"{type(exc).__name__}: {exc}"}
+        self.events += 1
+        return {"lines": lines}
+
+
+def serve(path: Path = SOCKET_PATH, idle_timeout: float = IDLE_TIMEOUT_SECONDS) -> int:
+    if not hasattr(socket, "AF_UNIX"):
+        print("Unix sockets are unavailable here; the hook shim runs every event in-process.", file=sys.stderr)
+        return 1
+    if daemon_request({"ping": True}, path) is not None:
+        print(f"A hook daemon is already listening on {path}.", file=sys.stderr)
+        return 1
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.unlink(missing_ok=True)
+    daemon = HookDaemon()
+    # Receipts land in the runtime directory; watching it would invalidate the git state on every event.
+    hook.GIT_STATE.start_watching(exclude=(hook.RUNTIME_DIR,))
+    hook.REPO_MAP.start_watching()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as listener:
+        listener.bind(str(path))
+        try:
+            os.chmod(path, 0o600)
+            listener.listen()
+            listener.settimeout(idle_timeout)
+            print(json.dumps({"socket": str(path), "pid": os.getpid(), "idle_timeout": idle_timeout}, sort_keys=True), flush=True)
+            while daemon.running:
+                try:
+                    conn, _ = listener.accept()
+                except socket.timeout:
+                    break
+                with conn:
+                    conn.settimeout(REQUEST_TIMEOUT_SECONDS)
+                    try:
+                        with conn.makefile("rwb") as stream:
+                            message = json.loads(stream.readline() or b"{}")
+                            stream.write(json.dumps(daemon.reply(message), sort_keys=True).encode("utf-8") + b"\n")
+                    except (OSError, ValueError):
+                        continue
+        finally:
+            path.unlink(missing_ok=True)
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Resident Echo Root Codex hook daemon")
+    parser.add_argument("--socket", default=str(SOCKET_PATH))
+    parser.add_argument("--idle-timeout", type=float, default=IDLE_TIMEOUT_SECONDS, help="Exit after this many seconds without events.")
+    parser.add_argument("--stop", action="store_true", help="Ask a running daemon to exit.")
+    args = parser.parse_args()
+    if args.stop:
+        reply = daemon_request({"shutdown": True}, Path(args.socket))
+        print(json.dumps({"stopped": reply is not None, **(reply or {})}, sort_keys=True))
+        return 0
+    return serve(Path(args.socket), args.idle_timeout)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
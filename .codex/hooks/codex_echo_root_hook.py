@@ -4,25 +4,29 @@ from __future__ import annotations
 import argparse
 import json
 import os
-import subprocess
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Mapping
 
 
 REPO_ROOT = Path(__file__).resolve().parents[2]
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
-from echo_root_receipt import append_receipt, verify_chain  # noqa: E402
-from repo_map import DEFAULT_EXCLUDES, build_repo_map, build_snapshot, write_snapshot  # noqa: E402
+from echo_root_receipt import append_receipt_verified  # noqa: E402
+from repo_map import DEFAULT_EXCLUDES, RepoMapCache, build_snapshot, write_snapshot  # noqa: E402
+from ve_git_state import GitStateCache  # noqa: E402
 
 
 RUNTIME_DIR = Path(os.environ.get("ECHO_ROOT_CODEX_HOOK_DIR", REPO_ROOT / "ve_data" / "codex_hooks"))
 LEDGER = RUNTIME_DIR / "codex_hook_receipts.jsonl"
 REPO_MAP_SNAPSHOT = RUNTIME_DIR / "repo_map_latest.json"
 BASELINE_PATH = Path(os.environ.get("ECHO_ROOT_SCORE_BASELINE", REPO_ROOT / ".codex" / "echo_root_score_baseline.json"))
+HOOK_EVENTS = ("SessionStart", "PreToolUse", "PermissionRequest", "PostToolUse", "Stop")
+_BASELINE_CACHE: dict[str, Any] = {}
+GIT_STATE = GitStateCache(REPO_ROOT)
+REPO_MAP = RepoMapCache(REPO_ROOT)
 
 
 def _utc_now() -> str:
@@ -32,7 +36,11 @@ def _utc_now() -> str:
 def _read_stdin_json() -> dict[str, Any]:
     if sys.stdin.isatty():
         return {}
-    raw = sys.stdin.read().strip()
+    return _parse_payload(sys.stdin.read())
+
+
+def _parse_payload(raw: str) -> dict[str, Any]:
+    raw = raw.strip()
     if not raw:
         return {}
     try:
@@ -42,13 +50,6 @@ def _read_stdin_json() -> dict[str, Any]:
         return {"stdin_text": raw[:4000]}
 
 
-def _git(args: list[str]) -> str:
-    try:
-        return subprocess.check_output(["git", *args], cwd=REPO_ROOT, text=True, stderr=subprocess.DEVNULL).strip()
-    except Exception:
-        return ""
-
-
 def _stringify_command(value: Any) -> str:
     if isinstance(value, str):
         return value
@@ -86,8 +87,13 @@ def _payload_tool_name(payload: dict[str, Any], fallback: str) -> str:
 
 
 def _load_score_baseline() -> dict[str, Any]:
+    """Read the score baseline, reusing the parsed copy while the file is unchanged."""
     try:
-        return json.loads(BASELINE_PATH.read_text(encoding="utf-8"))
+        stat = BASELINE_PATH.stat()
+        key = (str(BASELINE_PATH), stat.st_mtime_ns, stat.st_size)
+        if _BASELINE_CACHE.get("key") != key:
+            _BASELINE_CACHE.update(key=key, baseline=json.loads(BASELINE_PATH.read_text(encoding="utf-8")))
+        return _BASELINE_CACHE["baseline"]
     except Exception:
         return {
             "baseline_version": "fallback",
@@ -144,22 +150,23 @@ def _score_for_event(event: str, command: Any, dirty: bool) -> dict[str, Any]:
     return score
 
 
-def _event_request(event: str, payload: dict[str, Any]) -> dict[str, Any]:
+def _event_request(event: str, payload: dict[str, Any], env: Mapping[str, str] | None = None) -> dict[str, Any]:
+    env = os.environ if env is None else env
     tool_name = _payload_tool_name(payload, event)
     command = _payload_command(payload)
     requested_action = f"codex hook {event}"
     if command:
         requested_action = f"{requested_action}: {command[:220]}"
 
-    branch = _git(["branch", "--show-current"]) or "unknown"
-    status = _git(["status", "--porcelain"])
-    dirty = bool(status)
+    git_state = GIT_STATE.state()
+    branch = git_state.branch or "unknown"
+    dirty = git_state.dirty
     score = _score_for_event(event, command, dirty)
 
     return {
-        "actor_id": os.environ.get("USERNAME") or os.environ.get("USER") or "operator",
+        "actor_id": env.get("USERNAME") or env.get("USER") or "operator",
         "agent_id": "codex",
-        "model_id": os.environ.get("CODEX_MODEL", "codex"),
+        "model_id": env.get("CODEX_MODEL", "codex"),
         "provider_id": "openai-codex",
         "route_id": f"codex-hook:{event}:{branch}",
         "action_lane": score["action_lane"],
@@ -207,12 +214,11 @@ def _payload_shape_hash(payload: dict[str, Any]) -> str:
     return hashlib.sha256(body.encode("utf-8")).hexdigest()
 
 
-def _write_hook_receipt(event: str, payload: dict[str, Any]) -> int:
+def _write_hook_receipt(event: str, payload: dict[str, Any], env: Mapping[str, str] | None = None) -> dict[str, Any]:
     RUNTIME_DIR.mkdir(parents=True, exist_ok=True)
-    chain_valid, chain_errors = verify_chain(LEDGER)
-    request = _event_request(event, payload)
-    receipt = append_receipt(LEDGER, request, chain_valid=chain_valid)
-    result = {
+    request = _event_request(event, payload, env)
+    receipt, chain_valid, chain_errors = append_receipt_verified(LEDGER, request)
+    return {
         "event": event,
         "decision": receipt["decision"],
         "reason": receipt["reason"],
@@ -220,41 +226,47 @@ def _write_hook_receipt(event: str, payload: dict[str, Any]) -> int:
         "chain_valid_before_append": chain_valid,
         "chain_errors": chain_errors[:3],
     }
-    print(json.dumps(result, sort_keys=True))
-    return 0
 
 
-def _session_start(payload: dict[str, Any]) -> int:
+def _session_start(payload: dict[str, Any], env: Mapping[str, str] | None = None) -> list[dict[str, Any]]:
     RUNTIME_DIR.mkdir(parents=True, exist_ok=True)
     excludes = set(DEFAULT_EXCLUDES)
-    entries = build_repo_map(REPO_ROOT, depth=3, excludes=excludes)
+    entries = REPO_MAP.entries(depth=3, excludes=excludes)
     snapshot = build_snapshot(REPO_ROOT, 3, entries, excludes)
     write_snapshot(REPO_MAP_SNAPSHOT, snapshot)
-    _write_hook_receipt("SessionStart", payload | {"repo_map_hash": snapshot["map_hash"]})
-    print(
-        json.dumps(
-            {
-                "event": "SessionStart",
-                "repo_map_hash": snapshot["map_hash"],
-                "repo_map_entries": snapshot["entry_count"],
-                "snapshot": str(REPO_MAP_SNAPSHOT),
-                "boundary": "Repo map is orientation, not proof.",
-            },
-            sort_keys=True,
-        )
-    )
-    return 0
+    receipt = _write_hook_receipt("SessionStart", payload | {"repo_map_hash": snapshot["map_hash"]}, env)
+    return [
+        receipt,
+        {
+            "event": "SessionStart",
+            "repo_map_hash": snapshot["map_hash"],
+            "repo_map_entries": snapshot["entry_count"],
+            "snapshot": str(REPO_MAP_SNAPSHOT),
+            "boundary": "Repo map is orientation, not proof.",
+        },
+    ]
+
+
+def handle_event(event: str, payload: dict[str, Any], env: Mapping[str, str] | None = None) -> list[dict[str, Any]]:
+    """Run one hook event and return the JSON lines it reports.
+
+    env supplies the caller's identity variables; the resident daemon passes
+    the client's, since its own environment belongs to whoever started it.
+    """
+    if event not in HOOK_EVENTS:
+        raise ValueError(f"unknown hook event {event!r}")
+    if event == "SessionStart":
+        return _session_start(payload, env)
+    return [_write_hook_receipt(event, payload, env)]
 
 
 def main() -> int:
     parser = argparse.ArgumentParser(description="Echo Root Codex hook bridge")
-    parser.add_argument("event", choices=["SessionStart", "PreToolUse", "PermissionRequest", "PostToolUse", "Stop"])
+    parser.add_argument("event", choices=HOOK_EVENTS)
     args = parser.parse_args()
-    payload = _read_stdin_json()
-
-    if args.event == "SessionStart":
-        return _session_start(payload)
-    return _write_hook_receipt(args.event, payload)
+    for line in handle_event(args.event, _read_stdin_json()):
+        print(json.dumps(line, sort_keys=True))
+    return 0
 
 
 if __name__ == "__main__":
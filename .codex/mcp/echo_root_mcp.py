@@ -2,9 +2,14 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
 import json
+import locale
+import os
 import subprocess
 import sys
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
@@ -13,14 +18,24 @@ REPO_ROOT = Path(__file__).resolve().parents[2]
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
-from echo_root_receipt import append_receipt, gate_decision, verify_chain  # noqa: E402
-from repo_map import DEFAULT_EXCLUDES, build_repo_map, build_snapshot  # noqa: E402
+from echo_root_receipt import (  # noqa: E402
+    append_receipt,
+    append_receipts,
+    gate_decision,
+    gate_decisions,
+    verify_chain,
+)
+from repo_map import DEFAULT_EXCLUDES, RepoMapCache, build_snapshot  # noqa: E402
+from ve_ledger_tail import LedgerFollower, row_check  # noqa: E402
 
 
 SERVER_NAME = "echo-root-ve"
 SERVER_VERSION = "0.1.0"
 DEFAULT_PROTOCOL_VERSION = "2025-06-18"
 DEFAULT_LEDGER = REPO_ROOT / "ve_data" / "mcp_receipts" / "mcp_receipts.jsonl"
+DEFAULT_WORKERS = 4
+MAX_FOLLOW_WAIT_SECONDS = 30.0
+REPO_MAP = RepoMapCache(REPO_ROOT)
 INSTRUCTIONS = (
     "Echo Root VE tools provide orientation, gate posture, receipts, and replay checks. "
     "Presence is not proof. Permission is authority change. Receipt is evidence, not approval."
@@ -31,7 +46,7 @@ def tool_repo_map(arguments: dict[str, Any]) -> dict[str, Any]:
     depth = int(arguments.get("depth", 3))
     excludes = set(DEFAULT_EXCLUDES)
     excludes.update(str(item) for item in arguments.get("exclude", []))
-    entries = build_repo_map(REPO_ROOT, depth=depth, excludes=excludes)
+    entries = REPO_MAP.entries(depth=depth, excludes=excludes)
     snapshot = build_snapshot(REPO_ROOT, depth, entries, excludes)
     return {
         "receipt_type": "repo_map",
@@ -70,9 +85,7 @@ def _gate_request(arguments: dict[str, Any]) -> dict[str, Any]:
     }
 
 
-def tool_gate_action(arguments: dict[str, Any]) -> dict[str, Any]:
-    request = _gate_request(arguments)
-    decision, reason = gate_decision(request)
+def _gate_result(request: dict[str, Any], decision: str, reason: list[str]) -> dict[str, Any]:
     return {
         "decision": decision,
         "reason": reason,
@@ -83,10 +96,33 @@ def tool_gate_action(arguments: dict[str, Any]) -> dict[str, Any]:
     }
 
 
-def tool_append_receipt(arguments: dict[str, Any]) -> dict[str, Any]:
+def tool_gate_action(arguments: dict[str, Any]) -> dict[str, Any]:
+    request = _gate_request(arguments)
+    decision, reason = gate_decision(request)
+    return _gate_result(request, decision, reason)
+
+
+def _batch_items(arguments: dict[str, Any]) -> list[dict[str, Any]]:
+    items = arguments.get("requests")
+    if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+        raise ValueError("requests must be an array of objects")
+    return items
+
+
+def tool_gate_actions_batch(arguments: dict[str, Any]) -> dict[str, Any]:
+    requests = [_gate_request(item) for item in _batch_items(arguments)]
+    decided = gate_decisions(requests)
+    return {"results": [_gate_result(request, decision, reason) for request, (decision, reason) in zip(requests, decided)]}
+
+
+def _ledger_path(arguments: dict[str, Any]) -> Path:
     ledger = Path(arguments.get("ledger", DEFAULT_LEDGER))
     if not ledger.is_absolute():
         ledger = REPO_ROOT / ledger
+    return ledger
+
+
+def _receipt_request(arguments: dict[str, Any]) -> dict[str, Any]:
     request = _gate_request(arguments)
     request["calibration_reason"] = arguments.get(
         "calibration_reason",
@@ -95,9 +131,11 @@ def tool_append_receipt(arguments: dict[str, Any]) -> dict[str, Any]:
             "delta": f"delta={request['delta']} supplied by MCP caller",
         },
     )
-    receipt = append_receipt(ledger, request)
+    return request
+
+
+def _receipt_result(receipt: dict[str, Any]) -> dict[str, Any]:
     return {
-        "ledger": str(ledger),
         "receipt_id": receipt["receipt_id"],
         "decision": receipt["decision"],
         "reason": receipt["reason"],
@@ -105,40 +143,151 @@ def tool_append_receipt(arguments: dict[str, Any]) -> dict[str, Any]:
     }
 
 
+def tool_append_receipt(arguments: dict[str, Any]) -> dict[str, Any]:
+    ledger = _ledger_path(arguments)
+    receipt = append_receipt(ledger, _receipt_request(arguments))
+    return {"ledger": str(ledger), **_receipt_result(receipt)}
+
+
+def tool_append_receipts_batch(arguments: dict[str, Any]) -> dict[str, Any]:
+    ledger = _ledger_path(arguments)
+    receipts = append_receipts(ledger, [_receipt_request(item) for item in _batch_items(arguments)])
+    return {"ledger": str(ledger), "receipts": [_receipt_result(receipt) for receipt in receipts]}
+
+
 def tool_verify_chain(arguments: dict[str, Any]) -> dict[str, Any]:
-    ledger = Path(arguments.get("ledger", DEFAULT_LEDGER))
-    if not ledger.is_absolute():
-        ledger = REPO_ROOT / ledger
+    ledger = _ledger_path(arguments)
     ok, errors = verify_chain(ledger)
     return {"ledger": str(ledger), "ok": ok, "errors": errors}
 
 
-def tool_selftest(_: dict[str, Any]) -> dict[str, Any]:
-    proc = subprocess.run(
-        [sys.executable, str(REPO_ROOT / ".codex" / "hooks" / "codex_echo_root_selftest.py")],
-        cwd=REPO_ROOT,
-        text=True,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.STDOUT,
-        check=False,
+def _open_follower(arguments: dict[str, Any]) -> LedgerFollower:
+    signing_key = os.environ.get("VE_AUDIT_SIGNING_KEY", "demo-local-signing-key")
+    return LedgerFollower(
+        _ledger_path(arguments),
+        from_offset=int(arguments["from_offset"]) if "from_offset" in arguments else None,
+        after_hash=arguments.get("after_hash"),
+        check_row=row_check(str(arguments.get("kind", "receipt")), signing_key),
     )
+
+
+def _follow_limits(arguments: dict[str, Any]) -> tuple[int, float]:
+    return int(arguments.get("max_events", 200)), min(float(arguments.get("wait_seconds", 0)), MAX_FOLLOW_WAIT_SECONDS)
+
+
+def tool_follow_ledger(arguments: dict[str, Any]) -> dict[str, Any]:
+    max_events, wait_seconds = _follow_limits(arguments)
+    follower = _open_follower(arguments)
     try:
-        parsed = json.loads(proc.stdout)
-    except json.JSONDecodeError:
-        parsed = {"raw_output": proc.stdout}
-    return {"ok": proc.returncode == 0, "returncode": proc.returncode, "report": parsed}
+        deadline = time.monotonic() + wait_seconds
+        events = follower.poll(max_events)
+        while not events and (remaining := deadline - time.monotonic()) > 0:
+            follower.wait(remaining)
+            events = follower.poll(max_events)
+    finally:
+        follower.close()
+    return {"ledger": str(follower.path), "events": events, "cursor": follower.cursor()}
+
+
+async def _wait_for_change(follower: LedgerFollower, timeout: float) -> None:
+    """follower.wait without holding a thread: the inotify fd is watched by the event loop, else sleep one poll interval."""
+    loop = asyncio.get_running_loop()
+    watcher = follower.watcher
+    ready = loop.create_future()
+    try:
+        if watcher is None:
+            raise NotImplementedError
+        loop.add_reader(watcher.fd, lambda: ready.done() or ready.set_result(None))
+    except NotImplementedError:
+        await asyncio.sleep(min(timeout, follower.poll_interval))
+        return
+    try:
+        await asyncio.wait_for(ready, timeout)
+    except asyncio.TimeoutError:
+        return
+    finally:
+        loop.remove_reader(watcher.fd)
+    watcher.changed()
 
 
-def tool_live_probe(arguments: dict[str, Any]) -> dict[str, Any]:
+def _close_follower_when_idle(opening: Future, last: Future) -> None:
+    """Close the follower once no worker uses it; a cancelled call can leave a read still running."""
+
+    def close(_: Future) -> None:
+        if not opening.cancelled() and opening.exception() is None:
+            opening.result().close()
+
+    last.add_done_callback(close)
+
+
+async def tool_follow_ledger_async(arguments: dict[str, Any], pool: ThreadPoolExecutor) -> dict[str, Any]:
+    """tool_follow_ledger for the async server: reads run on the pool but the wait runs on the event loop.
+
+    A long poll therefore holds no worker between reads, and cancelling the
+    call ends the wait.
+    """
+    loop = asyncio.get_running_loop()
+    max_events, wait_seconds = _follow_limits(arguments)
+    deadline = loop.time() + wait_seconds
+    opening = pool.submit(_open_follower, arguments)
+    reading = opening
+    try:
+        follower = await asyncio.wrap_future(opening)
+        reading = pool.submit(follower.poll, max_events)
+        events = await asyncio.wrap_future(reading)
+        while not events and (remaining := deadline - loop.time()) > 0:
+            await _wait_for_change(follower, remaining)
+            reading = pool.submit(follower.poll, max_events)
+            events = await asyncio.wrap_future(reading)
+    finally:
+        _close_follower_when_idle(opening, reading)
+    return {"ledger": str(follower.path), "events": events, "cursor": follower.cursor()}
+
+
+def _selftest_command(_: dict[str, Any]) -> list[str]:
+    return [sys.executable, str(REPO_ROOT / ".codex" / "hooks" / "codex_echo_root_selftest.py")]
+
+
+def _live_probe_command(arguments: dict[str, Any]) -> list[str]:
     cmd = [sys.executable, str(REPO_ROOT / ".codex" / "hooks" / "codex_hook_live_probe.py")]
     if "before_count" in arguments:
         cmd.extend(["--before-count", str(arguments["before_count"])])
-    proc = subprocess.run(cmd, cwd=REPO_ROOT, text=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, check=False)
+    return cmd
+
+
+def _command_report(returncode: int, output: str) -> dict[str, Any]:
     try:
-        parsed = json.loads(proc.stdout)
+        parsed = json.loads(output)
     except json.JSONDecodeError:
-        parsed = {"raw_output": proc.stdout}
-    return {"ok": proc.returncode == 0, "returncode": proc.returncode, "report": parsed}
+        parsed = {"raw_output": output}
+    return {"ok": returncode == 0, "returncode": returncode, "report": parsed}
+
+
+def _run_command(cmd: list[str]) -> dict[str, Any]:
+    proc = subprocess.run(cmd, cwd=REPO_ROOT, text=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, check=False)
+    return _command_report(proc.returncode, proc.stdout)
+
+
+async def _run_command_async(cmd: list[str]) -> dict[str, Any]:
+    """Run a tool subprocess without holding a worker; cancelling the call kills the process."""
+    proc = await asyncio.create_subprocess_exec(*cmd, cwd=REPO_ROOT, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    try:
+        output, _ = await proc.communicate()
+    except asyncio.CancelledError:
+        if proc.returncode is None:
+            proc.kill()
+        await proc.wait()
+        raise
+    text = output.decode(locale.getpreferredencoding(False), errors="replace").replace("\r\n", "\n")
+    return _command_report(proc.returncode or 0, text)
+
+
+def tool_selftest(arguments: dict[str, Any]) -> dict[str, Any]:
+    return _run_command(_selftest_command(arguments))
+
+
+def tool_live_probe(arguments: dict[str, Any]) -> dict[str, Any]:
+    return _run_command(_live_probe_command(arguments))
 
 
 TOOLS = {
@@ -189,20 +338,59 @@ TOOLS = {
         },
         "handler": tool_append_receipt,
     },
+    "echo_root_gate_actions_batch": {
+        "description": "Classify many proposed actions in one call. Each item takes the echo_root_gate_action arguments; results keep request order.",
+        "inputSchema": {
+            "type": "object",
+            "properties": {"requests": {"type": "array", "items": {"type": "object"}}},
+            "required": ["requests"],
+        },
+        "handler": tool_gate_actions_batch,
+    },
+    "echo_root_append_receipts_batch": {
+        "description": "Gate and append many receipts as one contiguous hash-chained block with a single lock and fsync. Nothing is appended if any item is invalid.",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "ledger": {"type": "string"},
+                "requests": {"type": "array", "items": {"type": "object"}},
+            },
+            "required": ["requests"],
+        },
+        "handler": tool_append_receipts_batch,
+    },
     "echo_root_verify_chain": {
         "description": "Verify a local Echo Root JSONL receipt chain.",
         "inputSchema": {"type": "object", "properties": {"ledger": {"type": "string"}}},
         "handler": tool_verify_chain,
     },
+    "echo_root_follow_ledger": {
+        "description": "Return receipts or audit rows appended after a cursor as verified events, waiting up to wait_seconds for new ones. Pass the returned cursor's offset and hash back as from_offset and after_hash to continue.",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "ledger": {"type": "string"},
+                "kind": {"type": "string", "enum": ["receipt", "audit"], "default": "receipt"},
+                "from_offset": {"type": "integer"},
+                "after_hash": {"type": "string"},
+                "wait_seconds": {"type": "number", "default": 0},
+                "max_events": {"type": "integer", "default": 200},
+            },
+        },
+        "handler": tool_follow_ledger,
+        "async_handler": tool_follow_ledger_async,
+    },
     "echo_root_selftest": {
         "description": "Run the Codex/Echo Root workflow self-test.",
         "inputSchema": {"type": "object", "properties": {}},
         "handler": tool_selftest,
+        "command": _selftest_command,
     },
     "echo_root_live_probe": {
         "description": "Inspect whether live Codex hook receipts have appended since a previous count.",
         "inputSchema": {"type": "object", "properties": {"before_count": {"type": "integer"}}},
         "handler": tool_live_probe,
+        "command": _live_probe_command,
     },
 }
 
@@ -221,6 +409,20 @@ def _tool_result(data: Any) -> dict[str, Any]:
     }
 
 
+def _tool_call_params(message: dict[str, Any]) -> tuple[Any, dict[str, Any]]:
+    params = message.get("params", {})
+    arguments = params.get("arguments", {})
+    return params.get("name"), arguments if isinstance(arguments, dict) else {}
+
+
+def _unknown_tool(msg_id: Any, name: Any) -> dict[str, Any]:
+    return {"jsonrpc": "2.0", "id": msg_id, "error": {"code": -32601, "message": f"unknown tool: {name}"}}
+
+
+def _tool_error(msg_id: Any, exc: Exception) -> dict[str, Any]:
+    return {"jsonrpc": "2.0", "id": msg_id, "error": {"code": -32000, "message": str(exc)}}
+
+
 def handle_request(message: dict[str, Any]) -> dict[str, Any] | None:
     method = message.get("method")
     msg_id = message.get("id")
@@ -252,16 +454,14 @@ def handle_request(message: dict[str, Any]) -> dict[str, Any] | None:
     if method == "tools/list":
         return {"jsonrpc": "2.0", "id": msg_id, "result": {"tools": _tool_specs()}}
     if method == "tools/call":
-        params = message.get("params", {})
-        name = params.get("name")
-        arguments = params.get("arguments", {})
+        name, arguments = _tool_call_params(message)
         if name not in TOOLS:
-            return {"jsonrpc": "2.0", "id": msg_id, "error": {"code": -32601, "message": f"unknown tool: {name}"}}
+            return _unknown_tool(msg_id, name)
         try:
-            data = TOOLS[name]["handler"](arguments if isinstance(arguments, dict) else {})
+            data = TOOLS[name]["handler"](arguments)
             return {"jsonrpc": "2.0", "id": msg_id, "result": _tool_result(data)}
         except Exception as exc:
-            return {"jsonrpc": "2.0", "id": msg_id, "error": {"code": -32000, "message": str(exc)}}
+            return _tool_error(msg_id, exc)
     if msg_id is None:
         return None
     return {"jsonrpc": "2.0", "id": msg_id, "error": {"code": -32601, "message": f"unknown method: {method}"}}
@@ -283,31 +483,123 @@ def _read_content_length_message(stdin: Any) -> dict[str, Any] | None:
     return json.loads(stdin.buffer.read(length).decode("utf-8"))
 
 
-def _write_message(message: dict[str, Any]) -> None:
+def _write_message(message: dict[str, Any], stdout: Any = None) -> None:
+    stream = (stdout or sys.stdout).buffer
     body = json.dumps(message, separators=(",", ":"), ensure_ascii=True).encode("utf-8")
-    sys.stdout.buffer.write(f"Content-Length: {len(body)}\r\n\r\n".encode("ascii") + body)
-    sys.stdout.buffer.flush()
-
-
-def serve() -> int:
-    while True:
-        message = _read_content_length_message(sys.stdin)
-        if message is None:
-            return 0
+    stream.write(f"Content-Length: {len(body)}\r\n\r\n".encode("ascii") + body)
+    stream.flush()
+
+
+class AsyncServer:
+    """Concurrent tools/call dispatch for one stdio session.
+
+    Each tool call runs as its own task, so replies go out as calls finish and
+    are matched to requests by JSON-RPC id. Subprocess tools run as asyncio
+    subprocesses and ledger follows wait on the event loop; every other
+    handler runs on a worker thread. A `notifications/cancelled` for an
+    in-flight call cancels its task, kills its subprocess or ends its wait if
+    it has one, and suppresses its reply. A call already running on a worker
+    thread finishes in the background, but its reply is still dropped.
+    Everything else is answered inline, in arrival order.
+    """
+
+    def __init__(self, stdout: Any = None, workers: int = DEFAULT_WORKERS) -> None:
+        self.stdout = stdout
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="echo-root-mcp")
+        self.inflight: dict[str, asyncio.Task] = {}
+
+    def dispatch(self, message: dict[str, Any]) -> None:
+        method = message.get("method")
+        if method == "notifications/cancelled":
+            params = message.get("params")
+            task = self.inflight.get(_id_key(params.get("requestId") if isinstance(params, dict) else None))
+            if task is not None:
+                task.cancel()
+            return
+        if method == "tools/call" and message.get("id") is not None:
+            key = _id_key(message["id"])
+            task = asyncio.get_running_loop().create_task(self._call(message))
+            self.inflight[key] = task
+
+            def forget(done: asyncio.Task) -> None:
+                if self.inflight.get(key) is done:
+                    del self.inflight[key]
+
+            task.add_done_callback(forget)
+            return
         response = handle_request(message)
         if response is not None:
-            _write_message(response)
+            _write_message(response, self.stdout)
+
+    async def _call(self, message: dict[str, Any]) -> None:
+        msg_id = message["id"]
+        name, arguments = _tool_call_params(message)
+        spec = TOOLS.get(name)
+        if spec is None:
+            _write_message(_unknown_tool(msg_id, name), self.stdout)
+            return
+        try:
+            if "command" in spec:
+                data = await _run_command_async(spec["command"](arguments))
+            elif "async_handler" in spec:
+                data = await spec["async_handler"](arguments, self.pool)
+            else:
+                data = await asyncio.get_running_loop().run_in_executor(self.pool, spec["handler"], arguments)
+        except asyncio.CancelledError:
+            return
+        except Exception as exc:
+            _write_message(_tool_error(msg_id, exc), self.stdout)
+            return
+        _write_message({"jsonrpc": "2.0", "id": msg_id, "result": _tool_result(data)}, self.stdout)
+
+    async def drain(self) -> None:
+        while self.inflight:
+            await asyncio.gather(*self.inflight.values(), return_exceptions=True)
+
+    def close(self) -> None:
+        self.pool.shutdown(wait=False)
+
+
+def _id_key(msg_id: Any) -> str:
+    return json.dumps(msg_id, sort_keys=True)
+
+
+async def serve_async(stdin: Any = None, stdout: Any = None, workers: int = DEFAULT_WORKERS) -> int:
+    """Read framed messages on a dedicated thread, which works for pipes on every platform, and dispatch them as they arrive."""
+    loop = asyncio.get_running_loop()
+    server = AsyncServer(stdout, workers)
+    reader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="echo-root-mcp-stdin")
+    try:
+        while True:
+            message = await loop.run_in_executor(reader, _read_content_length_message, stdin or sys.stdin)
+            if message is None:
+                break
+            server.dispatch(message)
+        await server.drain()
+    finally:
+        reader.shutdown(wait=False)
+        server.close()
+    return 0
+
+
+def serve(workers: int = DEFAULT_WORKERS) -> int:
+    REPO_MAP.start_watching()
+    try:
+        return asyncio.run(serve_async(workers=workers))
+    finally:
+        REPO_MAP.close()
 
 
 def main() -> int:
     parser = argparse.ArgumentParser(description="Echo Root VE MCP server")
     parser.add_argument("--oneshot", help="Handle one JSON request from this argument and print response JSON")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Worker threads for concurrent tool calls.")
     args = parser.parse_args()
     if args.oneshot:
         response = handle_request(json.loads(args.oneshot))
         print(json.dumps(response, indent=2, sort_keys=True))
         return 0
-    return serve()
+    return serve(args.workers)
 
 
 if __name__ == "__main__":
@@ -25,6 +25,7 @@ from __future__ import annotations
 import os
 import sys
 import subprocess
+import tempfile
 from pathlib import Path
 
 
@@ -41,6 +42,8 @@ REQUIRED_FILES = [
     ".codex/hooks.json",
     ".codex/echo_root_score_baseline.json",
     ".codex/hooks/codex_echo_root_hook.py",
+    ".codex/hooks/codex_echo_root_client.py",
+    ".codex/hooks/codex_echo_root_daemon.py",
     ".codex/hooks/codex_echo_root_selftest.py",
     ".codex/hooks/codex_hook_live_probe.py",
     ".codex/config.toml",
@@ -126,10 +129,9 @@ def main() -> int:
     print("[OK] Unit tests passed.")
 
     # 5) Receipt demo on temp ledger
-    temp_ledger = repo / "_tmp_receipt_demo.jsonl"
-    try:
-        if temp_ledger.exists():
-            temp_ledger.unlink()
+    # In a temp dir, so the ledger's sidecars (head, lock, checkpoint) go with it.
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_ledger = Path(temp_dir) / "receipt_demo.jsonl"
         for scenario in ("proceed", "pause", "abort"):
             rc = run(
                 [
@@ -161,9 +163,6 @@ def main() -> int:
                 print(f"[FAIL] receipt demo {command} failed with rc=", rc)
                 return 20
         print("[OK] v0.1 receipt demo verified and replayed.")
-    finally:
-        if temp_ledger.exists():
-            temp_ledger.unlink()
 
     # 6) Repo map receipt and delta receipt
     temp_snapshot = repo / "_tmp_repo_map_snapshot.json"
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import json
 import os
+import socket
 import subprocess
 import sys
 import tempfile
@@ -13,17 +14,19 @@ REPO = Path(__file__).resolve().parent.parent
 HOOK = REPO / ".codex" / "hooks" / "codex_echo_root_hook.py"
 BASELINE = REPO / ".codex" / "echo_root_score_baseline.json"
 SELFTEST = REPO / ".codex" / "hooks" / "codex_echo_root_selftest.py"
+CLIENT = REPO / ".codex" / "hooks" / "codex_echo_root_client.py"
+DAEMON = REPO / ".codex" / "hooks" / "codex_echo_root_daemon.py"
 
 
 class CodexEchoRootHookTests(unittest.TestCase):
     def run_hook(self, event: str, runtime_dir: Path) -> list[dict]:
         return self.run_hook_with_payload(event, runtime_dir, {})
 
-    def run_hook_with_payload(self, event: str, runtime_dir: Path, payload: dict) -> list[dict]:
+    def run_hook_with_payload(self, event: str, runtime_dir: Path, payload: dict, script: Path = HOOK) -> list[dict]:
         env = dict(os.environ)
         env["ECHO_ROOT_CODEX_HOOK_DIR"] = str(runtime_dir)
         proc = subprocess.run(
-            [sys.executable, str(HOOK), event],
+            [sys.executable, str(script), event],
             cwd=REPO,
             env=env,
             input=json.dumps(payload),
@@ -80,6 +83,35 @@ class CodexEchoRootHookTests(unittest.TestCase):
             self.assertIn("payload_shape_hash", receipts[-1]["hook_metadata"])
             self.assertEqual(receipts[-1]["hook_metadata"]["tool_name_extracted"], "functions.shell_command")
 
+    def test_client_shim_matches_hook_with_and_without_daemon(self) -> None:
+        payload = {"tool_name": "Bash", "command": "git reset --hard HEAD"}
+        with tempfile.TemporaryDirectory() as temp:
+            direct_dir, shim_dir = Path(temp) / "direct", Path(temp) / "shim"
+            direct = self.run_hook_with_payload("PreToolUse", direct_dir, payload)
+            in_process = self.run_hook_with_payload("PreToolUse", shim_dir, payload, CLIENT)
+            self.assertEqual([dict(row, ledger="") for row in in_process], [dict(row, ledger="") for row in direct])
+            if not hasattr(socket, "AF_UNIX"):
+                return
+
+            env = dict(os.environ, ECHO_ROOT_CODEX_HOOK_DIR=str(shim_dir))
+            daemon = subprocess.Popen([sys.executable, str(DAEMON), "--idle-timeout", "60"], cwd=REPO, env=env, stdout=subprocess.PIPE, text=True)
+            try:
+                self.assertIn("socket", json.loads(daemon.stdout.readline()))
+                served = self.run_hook_with_payload("PreToolUse", shim_dir, payload, CLIENT)
+                stopped = subprocess.run([sys.executable, str(DAEMON), "--stop"], cwd=REPO, env=env, stdout=subprocess.PIPE, text=True, check=True)
+                daemon.wait(timeout=10)
+            finally:
+                if daemon.poll() is None:
+                    daemon.kill()
+                daemon.stdout.close()
+
+            self.assertEqual(json.loads(stopped.stdout)["events"], 1)
+            self.assertEqual(served, in_process)
+            receipts = self.read_ledger(shim_dir)
+            self.assertEqual([row["decision"] for row in receipts], ["ABORT", "ABORT"])
+            self.assertEqual(receipts[1]["hash_prev"], receipts[0]["hash_self"])
+            self.assertFalse((shim_dir / "codex_hook.sock").exists())
+
     def test_score_baseline_records_lessons_learned(self) -> None:
         baseline = json.loads(BASELINE.read_text(encoding="utf-8"))
 
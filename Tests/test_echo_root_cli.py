@@ -55,6 +55,19 @@ class EchoRootCliTests(unittest.TestCase):
             self.assertTrue(ledger.exists())
             self.assertIn("MCP is optional", data["mcp_boundary"])
 
+    def test_replay_and_verify_stream_ndjson(self) -> None:
+        with tempfile.TemporaryDirectory() as temp:
+            ledger = Path(temp) / "proof.jsonl"
+            self.run_cli("--ledger", str(ledger), "prove", "--root", str(REPO), "--depth", "2")
+
+            replay = [json.loads(line) for line in self.run_cli("--ledger", str(ledger), "replay", "--ndjson").stdout.splitlines()]
+            verify = [json.loads(line) for line in self.run_cli("--ledger", str(ledger), "verify-chain", "--ndjson").stdout.splitlines()]
+
+            self.assertEqual([row["original_decision"] for row in replay[:-1]], ["PROCEED", "PAUSE", "ABORT"])
+            self.assertEqual(replay[-1]["replayed"], 3)
+            self.assertTrue(replay[-1]["all_match"])
+            self.assertEqual(verify, [{"error_count": 0, "ledger": str(ledger), "ok": True}])
+
 
 if __name__ == "__main__":
     unittest.main()
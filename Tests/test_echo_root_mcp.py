@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+import asyncio
+import io
 import json
 import tempfile
+import time
 import unittest
 from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
 
 import sys
 
@@ -124,6 +129,128 @@ class EchoRootMcpTests(unittest.TestCase):
             self.assertEqual(append_response["result"]["structuredContent"]["decision"], "PROCEED")
             self.assertTrue(verify_response["result"]["structuredContent"]["ok"])
 
+    def test_batch_tools_match_single_calls_and_append_one_block(self) -> None:
+        items = [
+            {"requested_action": "read notes", "consent_scope_present": True, "rho": 0.9, "delta": 0.1, "confidence": "high"},
+            {"requested_action": "write notes", "consent_scope_present": False, "rho": 0.8, "delta": 0.1},
+            {"requested_action": "rm -rf build", "consent_scope_present": True, "rho": 0.9, "delta": 0.9},
+        ]
+
+        def call(msg_id: int, name: str, arguments: dict) -> dict:
+            return echo_root_mcp.handle_request({"jsonrpc": "2.0", "id": msg_id, "method": "tools/call", "params": {"name": name, "arguments": arguments}})
+
+        singles = [call(20 + index, "echo_root_gate_action", item)["result"]["structuredContent"] for index, item in enumerate(items)]
+        batch = call(30, "echo_root_gate_actions_batch", {"requests": items})["result"]["structuredContent"]
+        self.assertEqual(batch["results"], singles)
+
+        with tempfile.TemporaryDirectory() as temp:
+            ledger = Path(temp) / "mcp_receipts.jsonl"
+            call(31, "echo_root_append_receipt", {**items[0], "ledger": str(ledger)})
+            with patch("ve_ledger_io.os.fsync") as fsync:
+                appended = call(32, "echo_root_append_receipts_batch", {"ledger": str(ledger), "requests": items})["result"]["structuredContent"]
+            rejected = call(33, "echo_root_append_receipts_batch", {"ledger": str(ledger), "requests": [items[0], "not an object"]})
+            rows = [json.loads(line) for line in ledger.read_text(encoding="utf-8").splitlines()]
+
+            self.assertEqual([item["decision"] for item in appended["receipts"]], [item["decision"] for item in singles])
+            self.assertEqual([row["hash_self"] for row in rows[1:]], [item["hash_self"] for item in appended["receipts"]])
+            self.assertEqual(rows[1]["hash_prev"], rows[0]["hash_self"])
+            self.assertIn("error", rejected)
+            self.assertEqual(len(rows), 4)
+            self.assertEqual(fsync.call_count, 1)
+            self.assertTrue(call(34, "echo_root_verify_chain", {"ledger": str(ledger)})["result"]["structuredContent"]["ok"])
+
+    def test_follow_ledger_returns_new_receipts_and_a_resumable_cursor(self) -> None:
+        def call(arguments: dict) -> dict:
+            response = echo_root_mcp.handle_request({"jsonrpc": "2.0", "id": 40, "method": "tools/call", "params": {"name": "echo_root_follow_ledger", "arguments": arguments}})
+            return response["result"]["structuredContent"]
+
+        with tempfile.TemporaryDirectory() as temp:
+            ledger = str(Path(temp) / "mcp_receipts.jsonl")
+            item = {"requested_action": "read notes", "consent_scope_present": True, "rho": 0.9, "delta": 0.1}
+            echo_root_mcp.tool_append_receipt({**item, "ledger": ledger})
+            first = call({"ledger": ledger, "from_offset": 0})
+            echo_root_mcp.tool_append_receipts_batch({"ledger": ledger, "requests": [item, item]})
+            cursor = first["cursor"]
+            second = call({"ledger": ledger, "from_offset": cursor["offset"], "after_hash": cursor["hash"], "max_events": 1})
+            third = call({"ledger": ledger, "from_offset": second["cursor"]["offset"], "after_hash": second["cursor"]["hash"], "wait_seconds": 0.1})
+
+            self.assertEqual(len(first["events"]), 1)
+            self.assertEqual(len(second["events"]), 1)
+            self.assertEqual(len(third["events"]), 1)
+            self.assertTrue(all(event["valid"] for event in first["events"] + second["events"] + third["events"]))
+            self.assertEqual(third["events"][0]["record"]["hash_prev"], second["events"][0]["hash_self"])
+            self.assertEqual(call({"ledger": ledger, "wait_seconds": 0.05})["events"], [])
+
+    def test_async_server_replies_out_of_order_and_drops_cancelled_calls(self) -> None:
+        def frame(message: dict) -> bytes:
+            body = json.dumps(message).encode("utf-8")
+            return f"Content-Length: {len(body)}\r\n\r\n".encode("ascii") + body
+
+        def slow_handler(arguments: dict) -> dict:
+            time.sleep(0.5)
+            return {"slept": True}
+
+        def call(msg_id: int, name: str, arguments: dict | None = None) -> dict:
+            return {"jsonrpc": "2.0", "id": msg_id, "method": "tools/call", "params": {"name": name, "arguments": arguments or {}}}
+
+        tools = {
+            "test_sleep_command": {"handler": None, "command": lambda _: [sys.executable, "-c", "import time; time.sleep(30)"]},
+            "test_slow_handler": {"handler": slow_handler},
+        }
+        gate = {"requested_action": "read notes", "consent_scope_present": True, "rho": 0.9, "delta": 0.1, "confidence": "high"}
+        stdin = SimpleNamespace(
+            buffer=io.BytesIO(
+                frame(call(1, "test_sleep_command"))
+                + frame(call(2, "test_slow_handler"))
+                + frame(call(3, "echo_root_gate_action", gate))
+                + frame({"jsonrpc": "2.0", "method": "notifications/cancelled", "params": {"requestId": 1, "reason": "test"}})
+                + frame({"jsonrpc": "2.0", "id": 4, "method": "ping"})
+            )
+        )
+        stdout = SimpleNamespace(buffer=io.BytesIO())
+        started = time.monotonic()
+        with patch.dict(echo_root_mcp.TOOLS, tools):
+            asyncio.run(echo_root_mcp.serve_async(stdin, stdout, workers=2))
+        elapsed = time.monotonic() - started
+
+        stdout.buffer.seek(0)
+        replies = []
+        while (reply := echo_root_mcp._read_content_length_message(stdout)) is not None:
+            replies.append(reply)
+        by_id = {reply["id"]: reply for reply in replies}
+        self.assertEqual(len(replies), 3)
+        self.assertEqual(replies[-1]["id"], 2)
+        self.assertNotIn(1, by_id)
+        self.assertEqual(by_id[3]["result"]["structuredContent"]["decision"], "PROCEED")
+        self.assertTrue(by_id[2]["result"]["structuredContent"]["slept"])
+        self.assertLess(elapsed, 10)
+
+    def test_follow_waits_hold_no_worker_and_stop_when_cancelled(self) -> None:
+        def frame(message: dict) -> bytes:
+            body = json.dumps(message).encode("utf-8")
+            return f"Content-Length: {len(body)}\r\n\r\n".encode("ascii") + body
+
+        def call(msg_id: int, name: str, arguments: dict) -> dict:
+            return {"jsonrpc": "2.0", "id": msg_id, "method": "tools/call", "params": {"name": name, "arguments": arguments}}
+
+        with tempfile.TemporaryDirectory() as temp:
+            follow = {"ledger": str(Path(temp) / "mcp_receipts.jsonl"), "wait_seconds": 1.0}
+            gate = {"requested_action": "read notes", "consent_scope_present": True, "rho": 0.9, "delta": 0.1, "confidence": "high"}
+            messages = [call(msg_id, "echo_root_follow_ledger", follow) for msg_id in range(1, 5)]
+            messages.append(call(5, "echo_root_gate_action", gate))
+            messages.append({"jsonrpc": "2.0", "method": "notifications/cancelled", "params": {"requestId": 1, "reason": "test"}})
+            stdin = SimpleNamespace(buffer=io.BytesIO(b"".join(frame(message) for message in messages)))
+            stdout = SimpleNamespace(buffer=io.BytesIO())
+            asyncio.run(echo_root_mcp.serve_async(stdin, stdout, workers=4))
+
+        stdout.buffer.seek(0)
+        replies = []
+        while (reply := echo_root_mcp._read_content_length_message(stdout)) is not None:
+            replies.append(reply)
+        self.assertEqual(replies[0]["id"], 5)
+        self.assertEqual(sorted(reply["id"] for reply in replies[1:]), [2, 3, 4])
+        self.assertTrue(all(reply["result"]["structuredContent"]["events"] == [] for reply in replies[1:]))
+
     def test_response_can_be_encoded_as_json(self) -> None:
         response = echo_root_mcp.handle_request({"jsonrpc": "2.0", "id": 7, "method": "tools/list"})
 
@@ -1,13 +1,34 @@
 import json
+import os
+import random
 import sys
 import tempfile
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
-from echo_root_receipt import GateConfig, append_receipt, replay_receipt, validate_schema, verify_chain
+from echo_root_receipt import (
+    Categorical,
+    GateConfig,
+    _check_rows,
+    append_receipt,
+    append_receipt_verified,
+    decode_gate_batch,
+    gate_decision,
+    gate_decisions,
+    gate_decisions_batch,
+    replay_ledger,
+    replay_ledger_parallel,
+    replay_receipt,
+    request_columns,
+    validate_schema,
+    verify_chain,
+    verify_chain_parallel,
+)
+from ve_ledger_segments import compress_sealed_segments, rotate_ledger
 
 
 class EchoRootReceiptTests(unittest.TestCase):
@@ -114,6 +135,121 @@ class EchoRootReceiptTests(unittest.TestCase):
             self.assertEqual(replay["replay_decision"], "PAUSE")
             self.assertTrue(replay["matches"])
 
+    def test_parallel_verify_reports_same_errors_as_serial(self):
+        with tempfile.TemporaryDirectory() as temp:
+            ledger = Path(temp) / "receipts.jsonl"
+            for _ in range(40):
+                append_receipt(ledger, self.base_request())
+            rows = ledger.read_text(encoding="utf-8").splitlines()
+            rows[3] = rows[3].replace("PROCEED", "PAUSE")
+            rows[17] = rows[17][:-4]
+            rows.insert(25, "")
+            del rows[31]
+            ledger.write_text("\n".join(rows) + "\n", encoding="utf-8")
+
+            with patch("echo_root_receipt.PARALLEL_VERIFY_MIN_BYTES", 0):
+                parallel = verify_chain_parallel(ledger, workers=3)
+            serial = verify_chain(ledger)
+
+            self.assertFalse(serial[0])
+            self.assertEqual(parallel, serial)
+
+    def test_verified_append_reads_only_new_rows_and_fails_closed_like_verify_chain(self):
+        with tempfile.TemporaryDirectory() as temp:
+            ledger = Path(temp) / "receipts.jsonl"
+            read = []
+
+            def counting(rows, expected_prev):
+                rows = list(rows)
+                read.append(len(rows))
+                return _check_rows(rows, expected_prev)
+
+            def append_and_compare():
+                expected = verify_chain(ledger)
+                with patch("echo_root_receipt._check_rows", counting):
+                    receipt, ok, errors = append_receipt_verified(ledger, self.base_request())
+                self.assertEqual((ok, errors), expected)
+                return receipt
+
+            for _ in range(12):
+                append_and_compare()
+            self.assertEqual(read, [1] * 12)
+
+            stat = ledger.stat()
+            text = ledger.read_text(encoding="utf-8")
+            ledger.write_text(text.replace('"decision": "PROCEED"', '"decision": "ABORTED"', 1), encoding="utf-8")
+            os.utime(ledger, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+            self.assertEqual(ledger.stat().st_size, stat.st_size)
+            read.clear()
+            self.assertEqual(append_and_compare()["decision"], "SAFE_MODE")
+            self.assertEqual(read, [12, 1])
+
+            append_receipt(ledger, self.base_request())
+            read.clear()
+            append_and_compare()
+            append_and_compare()
+            self.assertEqual(read, [14, 1, 1])
+            self.assertFalse(verify_chain(ledger)[0])
+
+    def test_parallel_replay_matches_serial_order_across_segments(self):
+        with tempfile.TemporaryDirectory() as temp:
+            ledger = Path(temp) / "receipts.jsonl"
+
+            def append(count, flip):
+                for index in range(count):
+                    append_receipt(ledger, {**self.base_request(), "empty_folder": index % 3 == 0})
+                rows = ledger.read_text(encoding="utf-8").splitlines()
+                rows[flip] = rows[flip].replace('"decision": "PROCEED"', '"decision": "ABORT"').replace('"decision": "PAUSE"', '"decision": "ABORT"')
+                ledger.write_text("\n".join(rows) + "\n", encoding="utf-8")
+
+            append(30, 4)
+            rotate_ledger(ledger)
+            compress_sealed_segments(ledger)
+            append(20, 7)
+            rotate_ledger(ledger)
+            append(25, 11)
+
+            serial = list(replay_ledger(ledger))
+            with patch("echo_root_receipt.PARALLEL_REPLAY_MIN_BYTES", 0), patch("echo_root_receipt.REPLAY_CHUNK_BYTES", 2048):
+                parallel = list(replay_ledger_parallel(ledger, workers=3))
+                mismatches = list(replay_ledger_parallel(ledger, workers=3, only_mismatches=True))
+
+            self.assertEqual(len(serial), 75)
+            self.assertEqual(parallel, serial)
+            self.assertEqual(mismatches, [row for row in serial if not row["matches"]])
+            self.assertEqual(len(mismatches), 3)
+
+    def test_batch_gate_matches_scalar_gate(self):
+        rng = random.Random(11)
+        choices = {
+            "requested_action": ["summarize", "Delete old logs", "overwrite config", "ignore policy", "read"],
+            "action_lane": ["L1_READ_CLASSIFY", "L2_WRITE_LOCAL", "L3_DESTRUCTIVE", "l3_destructive"],
+            "fallback_status": ["none", "route_fallback", "unverified"],
+            "consent_scope_present": [True, False],
+            "dry_run": [True, False],
+            "rho": [0.2, 0.5, 0.8, 0.95],
+            "delta": [0.0, 0.3, 0.6, 0.9],
+            "confidence": ["high", "Medium", "unclear"],
+            "files_created": [0, 2, 50],
+            "failed_checks": [0, 1, 3],
+            "empty_folder": [False, True],
+            "files_touched": [[], ["a/b.py"], ["a/b.py", "c/d.py", "c/e.py"]],
+        }
+        requests = [{key: rng.choice(values) for key, values in choices.items() if rng.random() < 0.8} for _ in range(400)]
+        config = GateConfig(max_files_created_per_run=10, dry_run_required=False)
+        columns = request_columns(requests)
+        codes = {value: code for code, value in enumerate(dict.fromkeys(columns["action_lane"]))}
+        columns["action_lane"] = Categorical([codes[value] for value in columns["action_lane"]], list(codes))
+
+        for chain_valid in (True, False):
+            expected = [gate_decision(request, config, chain_valid=chain_valid) for request in requests]
+            self.assertEqual(decode_gate_batch(*gate_decisions_batch(columns, config, chain_valid=chain_valid)), expected)
+        self.assertEqual(decode_gate_batch(*gate_decisions_batch({})), [])
+        self.assertEqual(gate_decisions(requests, config), [gate_decision(request, config) for request in requests])
+        with patch("echo_root_receipt.np", None), patch("echo_root_receipt.gate_decisions_batch") as batch:
+            self.assertEqual(gate_decisions(requests, config), [gate_decision(request, config) for request in requests])
+        batch.assert_not_called()
+
 
 if __name__ == "__main__":
     unittest.main()
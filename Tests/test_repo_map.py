@@ -1,12 +1,15 @@
+import errno
+import os
 import sys
 import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
 
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
-from repo_map import build_delta_receipt, build_receipt, build_repo_map, build_snapshot, map_hash
+from repo_map import RepoMapCache, build_delta_receipt, build_receipt, build_repo_map, build_snapshot, map_hash
 
 
 class RepoMapTests(unittest.TestCase):
@@ -29,6 +32,59 @@ class RepoMapTests(unittest.TestCase):
             self.assertNotIn("src/deep/skip.py", paths)
             self.assertNotIn("archive/old.txt", paths)
 
+    def test_cached_map_tracks_edits_and_never_lists_excluded_or_deep_dirs(self):
+        with tempfile.TemporaryDirectory() as temp:
+            root = Path(temp)
+            (root / "src" / "deep" / "deeper").mkdir(parents=True)
+            (root / "src" / "App.py").write_text("print('ok')\n", encoding="utf-8")
+            (root / "src" / "app.py").write_text("print('ok')\n", encoding="utf-8")
+            (root / "archive" / "a" / "b").mkdir(parents=True)
+            (root / "receipts").mkdir()
+            (root / "receipts" / "run.jsonl").write_text("{}\n", encoding="utf-8")
+
+            def age() -> None:
+                for directory, _, _ in os.walk(root):
+                    os.utime(directory, ns=(1_000_000_000, 1_000_000_000))
+
+            for watch in (False, True):
+                age()
+                cache = RepoMapCache(root)
+                if watch and not cache.start_watching():
+                    continue
+                try:
+                    self.assertEqual(cache.entries(depth=2), build_repo_map(root, depth=2))
+                    self.assertEqual(cache.scans, 3)
+                    self.assertEqual(cache.entries(depth=2), build_repo_map(root, depth=2))
+                    self.assertEqual(cache.scans, 3)
+
+                    (root / "src" / "app.py").write_text("print('changed')\n", encoding="utf-8")
+                    self.assertEqual(cache.entries(depth=2), build_repo_map(root, depth=2))
+                    (root / "src" / "new.txt").write_text("new\n", encoding="utf-8")
+                    (root / "src" / "deep" / "skip.txt").write_text("skip\n", encoding="utf-8")
+                    self.assertEqual(cache.entries(depth=2), build_repo_map(root, depth=2))
+                    self.assertEqual(cache.scans, 4)
+                    (root / "src" / "new.txt").unlink()
+                finally:
+                    cache.close()
+
+    def test_watch_failure_falls_back_to_mtime_mode(self):
+        with tempfile.TemporaryDirectory() as temp:
+            root = Path(temp)
+            (root / "src" / "deep").mkdir(parents=True)
+            (root / "src" / "app.py").write_text("print('ok')\n", encoding="utf-8")
+            cache = RepoMapCache(root)
+            if not cache.start_watching():
+                self.skipTest("inotify is unavailable")
+            try:
+                full = OSError(errno.ENOSPC, "inotify_add_watch failed")
+                with mock.patch.object(cache.watcher, "watch", side_effect=full):
+                    self.assertEqual(cache.entries(depth=3), build_repo_map(root, depth=3))
+                self.assertIsNone(cache.watcher)
+                (root / "src" / "new.txt").write_text("new\n", encoding="utf-8")
+                self.assertEqual(cache.entries(depth=3), build_repo_map(root, depth=3))
+            finally:
+                cache.close()
+
     def test_repo_map_hash_is_deterministic(self):
         with tempfile.TemporaryDirectory() as temp:
             root = Path(temp)
@@ -0,0 +1,69 @@
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from ve_audit_chain import (
+    append_audit_record,
+    checkpoint_path,
+    read_checkpoint,
+    verify_audit_chain,
+    verify_audit_chain_incremental,
+)
+
+
+class AuditChainCheckpointTests(unittest.TestCase):
+    def test_incremental_verify_writes_signed_checkpoint(self):
+        with tempfile.TemporaryDirectory() as temp:
+            ledger = Path(temp) / "audit.jsonl"
+            append_audit_record(ledger, "TEST", "unit", {"n": 1}, "key")
+            last = append_audit_record(ledger, "TEST", "unit", {"n": 2}, "key")
+
+            self.assertTrue(verify_audit_chain_incremental(ledger, "key"))
+            checkpoint = read_checkpoint(ledger, "key")
+            self.assertEqual(checkpoint["lines"], 2)
+            self.assertEqual(checkpoint["offset"], ledger.stat().st_size)
+            self.assertEqual(checkpoint["hash_self"], last.hash_self)
+            self.assertIsNone(read_checkpoint(ledger, "wrong-key"))
+
+    def test_incremental_verify_covers_only_new_rows(self):
+        with tempfile.TemporaryDirectory() as temp:
+            ledger = Path(temp) / "audit.jsonl"
+            append_audit_record(ledger, "TEST", "unit", {"n": 1}, "key")
+            self.assertTrue(verify_audit_chain_incremental(ledger, "key"))
+            append_audit_record(ledger, "TEST", "unit", {"n": 2}, "key")
+
+            self.assertTrue(verify_audit_chain_incremental(ledger, "key"))
+            self.assertEqual(read_checkpoint(ledger, "key")["lines"], 2)
+
+    def test_incremental_verify_rejects_tampered_new_row(self):
+        with tempfile.TemporaryDirectory() as temp:
+            ledger = Path(temp) / "audit.jsonl"
+            append_audit_record(ledger, "TEST", "unit", {"n": 1}, "key")
+            self.assertTrue(verify_audit_chain_incremental(ledger, "key"))
+            append_audit_record(ledger, "TEST", "unit", {"n": 2}, "key")
+            text = ledger.read_text(encoding="utf-8")
+            ledger.write_text(text.replace('"n": 2', '"n": 3'), encoding="utf-8")
+
+            self.assertFalse(verify_audit_chain_incremental(ledger, "key"))
+            self.assertFalse(verify_audit_chain(ledger, "key"))
+
+    def test_forged_checkpoint_falls_back_to_full_verify(self):
+        with tempfile.TemporaryDirectory() as temp:
+            ledger = Path(temp) / "audit.jsonl"
+            append_audit_record(ledger, "TEST", "unit", {"n": 1}, "key")
+            self.assertTrue(verify_audit_chain_incremental(ledger, "key"))
+            ledger.write_text(ledger.read_text(encoding="utf-8").replace('"n": 1', '"n": 9'), encoding="utf-8")
+            checkpoint = json.loads(checkpoint_path(ledger).read_text(encoding="utf-8"))
+            checkpoint["hmac"] = "0" * 64
+            checkpoint_path(ledger).write_text(json.dumps(checkpoint), encoding="utf-8")
+
+            self.assertFalse(verify_audit_chain_incremental(ledger, "key"))
+
+
+if __name__ == "__main__":
+    unittest.main()
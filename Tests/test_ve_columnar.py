@@ -0,0 +1,102 @@
+import random
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from echo_root_receipt import append_receipt
+from ve_columnar import (
+    ColumnTable,
+    column_max,
+    columns_dir,
+    count_where,
+    group_count,
+    group_max,
+    group_sum,
+    receipt_columns,
+    summarize_receipts,
+)
+from ve_gate_pipeline import run_gate_pipeline
+from ve_gate_replay import replay_gate_audit
+
+
+class ColumnarTests(unittest.TestCase):
+    def test_group_aggregates_match_row_loops_and_survive_save(self):
+        rng = random.Random(7)
+        rows = [
+            {"group": rng.choice(["a", "b", "c"]), "kind": rng.choice(["x", "y"]), "flag": rng.random() < 0.3, "value": rng.uniform(-1, 1)}
+            for _ in range(500)
+        ]
+        table = ColumnTable({"group": "str", "kind": "str", "flag": "bool", "value": "f8"})
+        for row in rows:
+            table.append(row)
+        with tempfile.TemporaryDirectory() as temp:
+            table.save(Path(temp) / "cols")
+            loaded, _ = ColumnTable.load(Path(temp) / "cols")
+
+        for candidate in (table, loaded):
+            order = list(dict.fromkeys(row["group"] for row in rows))
+            self.assertEqual(list(group_count(candidate, "group")), order)
+            for group in order:
+                members = [row for row in rows if row["group"] == group]
+                self.assertEqual(group_count(candidate, "group")[group], len(members))
+                self.assertEqual(group_count(candidate, "group", ("kind", "y"))[group], sum(row["kind"] == "y" for row in members))
+                self.assertEqual(group_count(candidate, "group", ("flag", True))[group], sum(row["flag"] for row in members))
+                self.assertEqual(group_max(candidate, "group", "value", 0.0)[group], max([0.0] + [row["value"] for row in members]))
+                self.assertAlmostEqual(group_sum(candidate, "group", "value")[group], sum(row["value"] for row in members))
+            self.assertEqual(count_where(candidate, "kind", "missing"), 0)
+            self.assertEqual(column_max(candidate, "value"), max(row["value"] for row in rows))
+            self.assertEqual(candidate.values("flag"), [row["flag"] for row in rows])
+
+    def test_receipt_export_summarizes_and_refreshes_after_append(self):
+        with tempfile.TemporaryDirectory() as temp:
+            ledger = Path(temp) / "receipts.jsonl"
+            base = {"requested_action": "summarize", "consent_scope_present": True, "rho": 0.8, "delta": 0.1, "dry_run": True}
+            append_receipt(ledger, base)
+            append_receipt(ledger, {**base, "consent_scope_present": False})
+
+            first = summarize_receipts(receipt_columns(ledger), "decision")
+            self.assertTrue((columns_dir(ledger) / "columns.json").exists())
+            append_receipt(ledger, {**base, "action_lane": "L2_WRITE_ANNOTATE_INDEX"})
+            second = summarize_receipts(receipt_columns(ledger), "action_lane")
+
+            self.assertEqual(first["receipts"], 2)
+            self.assertEqual({group["decision"]: group["receipts"] for group in first["groups"]}, {"PROCEED": 1, "PAUSE": 1})
+            self.assertEqual(second["receipts"], 3)
+            self.assertEqual([group["action_lane"] for group in second["groups"]], ["L1_READ_CLASSIFY", "L2_WRITE_ANNOTATE_INDEX"])
+
+    def test_replay_sessions_match_record_level_totals(self):
+        with tempfile.TemporaryDirectory() as temp:
+            audit = Path(temp) / "audit.jsonl"
+            twin = Path(temp) / "twin.json"
+            for pairing_id, delta in (("pair-a", 0.42), ("pair-b", 0.1), ("pair-a", 0.05)):
+                run_gate_pipeline(
+                    description="Use your judgment and record this private chat for training.",
+                    action_class="MUTATE_LIVE",
+                    expected_decision="PROPOSE",
+                    consent_to_store=True,
+                    consent_to_train=True,
+                    delta=delta,
+                    pairing_id=pairing_id,
+                    audit_ledger=audit,
+                    twin_state_path=twin,
+                    signing_key="key",
+                )
+            summary = replay_gate_audit(audit, "key", include_records=True)
+
+            records = summary["records"]
+            self.assertEqual([session["pairing_id"] for session in summary["sessions"]], ["pair-a", "pair-b"])
+            for session in summary["sessions"]:
+                members = [row for row in records if row["pairing_id"] == session["pairing_id"]]
+                self.assertEqual(session["records"], len(members))
+                self.assertEqual(session["advisory_events"], sum(row["replay_deviation_class"] == "advisory" for row in members))
+                self.assertEqual(session["max_twin_delta"], max([0.0] + [row["twin_delta"] for row in members]))
+            self.assertEqual(summary["advisory_events"], sum(session["advisory_events"] for session in summary["sessions"]))
+            self.assertEqual(summary["max_twin_delta"], max(row["twin_delta"] for row in records))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,12 +2,14 @@ import sys
 import tempfile
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
 from ve_gate_pipeline import run_gate_pipeline
-from ve_gate_replay import replay_gate_audit
+import ve_gate_replay
+from ve_gate_replay import replay_columns_dir, replay_gate_audit
 
 
 class GateReplayTests(unittest.TestCase):
@@ -27,7 +29,7 @@ class GateReplayTests(unittest.TestCase):
                 twin_state_path=twin,
                 signing_key="key",
             )
-            summary = replay_gate_audit(audit, "key")
+            summary = replay_gate_audit(audit, "key", include_records=True)
             self.assertTrue(summary["audit_chain_valid"])
             self.assertEqual(summary["records_replayed"], 1)
             self.assertEqual(summary["advisory_events"], 1)
@@ -70,6 +72,44 @@ class GateReplayTests(unittest.TestCase):
             summary = replay_gate_audit(audit, "wrong-key")
             self.assertEqual(summary["classifier_changes"], 1)
 
+    def test_persisted_replay_columns_fold_in_only_new_rows(self):
+        with tempfile.TemporaryDirectory() as temp:
+            audit = Path(temp) / "audit.jsonl"
+            twin = Path(temp) / "twin.json"
+
+            def decide(pairing_id: str, delta: float) -> None:
+                run_gate_pipeline(
+                    description="Summarize the notes.",
+                    action_class="READ_ONLY",
+                    expected_decision="PROPOSE",
+                    delta=delta,
+                    pairing_id=pairing_id,
+                    audit_ledger=audit,
+                    twin_state_path=twin,
+                    signing_key="key",
+                )
+
+            decide("alpha", 0.1)
+            decide("beta", 0.2)
+            first = replay_gate_audit(audit, "key")
+            self.assertNotIn("records", first)
+            self.assertTrue((replay_columns_dir(audit) / "columns.json").exists())
+            decide("alpha", 0.5)
+
+            with patch.object(ve_gate_replay, "replay_record", wraps=ve_gate_replay.replay_record) as replayed:
+                second = replay_gate_audit(audit, "key")
+            self.assertEqual(replayed.call_count, 1)
+            full = replay_gate_audit(audit, "key", include_records=True)
+            self.assertEqual(second["records_replayed"], 3)
+            self.assertEqual(len(full["records"]), 3)
+            for key in ("records_replayed", "advisory_events", "max_twin_delta", "sessions"):
+                self.assertEqual(second[key], full[key], key)
+
+            audit.write_text(audit.read_text(encoding="utf-8").replace('"pairing_id": "beta"', '"pairing_id": "gamma"'), encoding="utf-8")
+            rebuilt = replay_gate_audit(audit, "key")
+            self.assertFalse(rebuilt["audit_chain_valid"])
+            self.assertEqual([session["pairing_id"] for session in rebuilt["sessions"]], ["alpha", "gamma"])
+
 
 if __name__ == "__main__":
     unittest.main()
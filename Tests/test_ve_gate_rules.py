@@ -0,0 +1,66 @@
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from ve_gate_rules import Rule, RuleSet
+from ve_gatecheck import gate
+from ve_kernel import normalize_policy
+
+
+def _rules(calls):
+    return RuleSet(
+        "unit",
+        [
+            Rule("PROCEED", "ok", "score >= 0.7"),
+            Rule("PAUSE", "no scope", "not source.get('scope')"),
+            Rule("PAUSE", "parsed path", "parsed == 'x'"),
+            Rule("ABORT", "forbidden", "bool(source.get('forbidden'))"),
+            Rule("SAFE_MODE", "chain broken", "not chain_valid"),
+        ],
+        default=Rule("PAUSE", "below threshold", "True"),
+        context={"chain_valid": True},
+        derive={"parsed": "_parse(source)", "score": "float(source.get('score', 0.0))"},
+        names={"_parse": lambda source: calls.append(source) or str(source.get("path", ""))},
+    )
+
+
+class GateRuleTests(unittest.TestCase):
+    def test_tiers_decide_regardless_of_declaration_order(self):
+        rules = _rules([])
+
+        self.assertEqual(rules.decide({"forbidden": True}, chain_valid=False), ("SAFE_MODE", ["chain broken"]))
+        self.assertEqual(rules.decide({"forbidden": True, "scope": True, "score": 0.9}), ("ABORT", ["forbidden"]))
+        self.assertEqual(rules.decide({"path": "x"}), ("PAUSE", ["no scope", "parsed path"]))
+        self.assertEqual(rules.decide({"scope": True, "score": 0.9}), ("PROCEED", ["ok"]))
+        self.assertEqual(rules.decide({"scope": True}), ("PAUSE", ["below threshold"]))
+
+    def test_derived_values_are_skipped_once_a_higher_tier_decides(self):
+        calls = []
+        rules = _rules(calls)
+
+        outcome = rules.evaluate({"forbidden": True})
+        self.assertEqual((outcome.decision, outcome.reasons, calls), ("ABORT", ["forbidden"], []))
+        rules.evaluate({"scope": True})
+        self.assertEqual(calls, [{"scope": True}])
+
+    def test_invalid_rule_sets_are_rejected_at_compile_time(self):
+        with self.assertRaises(ValueError):
+            RuleSet("unit", [Rule("MAYBE", "unknown", "True")], default=Rule("PAUSE", "fallback", "True"))
+        with self.assertRaises(ValueError):
+            RuleSet("unit", [Rule("PAUSE", "loop", "a")], default=Rule("PAUSE", "fallback", "True"), derive={"a": "b", "b": "a"})
+        with self.assertRaises(SyntaxError):
+            RuleSet("unit", [Rule("PAUSE", "broken", "a >")], default=Rule("PAUSE", "fallback", "True"))
+
+    def test_kernel_and_gatecheck_keep_their_decisions(self):
+        self.assertEqual(normalize_policy("proceed", "normal"), ("PROCEED", "proceed", "decision_proceed"))
+        self.assertEqual(normalize_policy("PROCEED", "safe_only"), ("PAUSE", "safe_mode", "route_hint_safe_only"))
+        self.assertEqual(normalize_policy("maybe", "normal"), ("ABORT", "blocked", "unknown_decision:MAYBE"))
+        self.assertEqual(normalize_policy(None, "warp"), ("ABORT", "blocked", "unknown_route_hint:warp"))
+        self.assertEqual([gate(0.8, 0.8, 0.2), gate(0.8, 0.6, 0.2), gate(0.6, 0.8, 0.35)], ["PROCEED", "ABORT", "PAUSE"])
+
+
+if __name__ == "__main__":
+    unittest.main()
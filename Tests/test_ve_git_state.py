@@ -0,0 +1,91 @@
+import errno
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from ve_git_state import GitState, GitStateCache
+
+
+def _git(root: Path, *args: str) -> None:
+    subprocess.run(["git", *args], cwd=root, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+@unittest.skipIf(shutil.which("git") is None, "git is not installed")
+class GitStateCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.temp = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp.name)
+        _git(self.root, "init", "-q", "-b", "main")
+        _git(self.root, "config", "user.email", "test@example.invalid")
+        _git(self.root, "config", "user.name", "test")
+        (self.root / ".gitignore").write_text("runtime/\n", encoding="utf-8")
+        (self.root / "a.txt").write_text("a\n", encoding="utf-8")
+        _git(self.root, "add", ".")
+        _git(self.root, "commit", "-q", "-m", "init")
+        (self.root / "runtime").mkdir()
+
+    def tearDown(self):
+        self.temp.cleanup()
+
+    def test_without_a_watcher_every_answer_is_rechecked(self):
+        cache = GitStateCache(self.root)
+        self.assertEqual(cache.state(), GitState("main", False))
+        (self.root / "a.txt").write_text("changed\n", encoding="utf-8")
+        self.assertEqual(cache.state(), GitState("main", True))
+        (self.root / "a.txt").write_text("a\n", encoding="utf-8")
+        self.assertEqual(cache.state(), GitState("main", False))
+        self.assertEqual(cache.refreshes, 3)
+
+        _git(self.root, "checkout", "-q", "-b", "feature")
+        self.assertEqual(cache.state(), GitState("feature", False))
+        self.assertEqual(cache.refreshes, 4)
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "worktree watching uses inotify")
+    def test_watcher_reuses_clean_answers_until_the_worktree_changes(self):
+        cache = GitStateCache(self.root)
+        self.assertTrue(cache.start_watching())
+        try:
+            self.assertEqual(cache.state(), GitState("main", False))
+            (self.root / "runtime" / "receipts.jsonl").write_text("{}\n", encoding="utf-8")
+            self.assertEqual(cache.state(), GitState("main", False))
+            self.assertEqual(cache.refreshes, 1)
+
+            (self.root / "nested").mkdir()
+            self.assertEqual(cache.state(), GitState("main", False))
+            (self.root / "nested" / "new.txt").write_text("new\n", encoding="utf-8")
+            self.assertEqual(cache.state(), GitState("main", True))
+            self.assertEqual(cache.state(), GitState("main", True))
+            self.assertEqual(cache.refreshes, 3)
+
+            (self.root / "nested" / "new.txt").unlink()
+            self.assertEqual(cache.state(), GitState("main", False))
+            self.assertEqual(cache.refreshes, 4)
+        finally:
+            cache.close()
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "worktree watching uses inotify")
+    def test_watch_failure_on_a_new_directory_falls_back_to_rechecking(self):
+        cache = GitStateCache(self.root)
+        self.assertTrue(cache.start_watching())
+        try:
+            self.assertEqual(cache.state(), GitState("main", False))
+            full = OSError(errno.ENOSPC, "inotify_add_watch failed")
+            with mock.patch.object(cache.watcher, "watch", side_effect=full):
+                (self.root / "nested").mkdir()
+                self.assertEqual(cache.state(), GitState("main", False))
+            self.assertIsNone(cache.watcher)
+            (self.root / "nested" / "new.txt").write_text("new\n", encoding="utf-8")
+            self.assertEqual(cache.state(), GitState("main", True))
+        finally:
+            cache.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import sqlite3
+import sys
+import tempfile
+import unittest
+from contextlib import closing
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from echo_root_receipt import append_receipt
+from ve_audit_chain import append_audit_record
+from ve_ledger_index import build_index, lookup, query, verify_index
+from ve_ledger_io import index_path
+
+
+REQUEST = {"requested_action": "summarize", "consent_scope_present": True, "rho": 0.8, "delta": 0.1, "dry_run": True}
+
+
+class LedgerIndexTests(unittest.TestCase):
+    def test_lookup_finds_receipt_by_id_and_index_follows_appends(self):
+        with tempfile.TemporaryDirectory() as temp:
+            ledger = Path(temp) / "receipts.jsonl"
+            first = append_receipt(ledger, REQUEST)
+            summary = build_index(ledger)
+            second = append_receipt(ledger, {**REQUEST, "actor_id": "reviewer"})
+
+            self.assertEqual(summary["lines"], 1)
+            self.assertEqual(lookup(ledger, "receipt_id", first["receipt_id"]), [first])
+            self.assertEqual(lookup(ledger, "actor_id", "reviewer"), [second])
+            self.assertEqual(len(lookup(ledger, "decision", "PROCEED")), 2)
+            self.assertEqual(verify_index(ledger), (True, []))
+
+    def test_range_query_filters_on_timestamp(self):
+        with tempfile.TemporaryDirectory() as temp:
+            ledger = Path(temp) / "receipts.jsonl"
+            for day in ("2026-01-01", "2026-01-02", "2026-01-03"):
+                append_receipt(ledger, {**REQUEST, "timestamp": f"{day}T09:30:00+00:00"})
+
+            rows = [record for _, record in query(ledger, since="2026-01-02", until="2026-01-03")]
+            hour = [record for _, record in query(ledger, "hour", "2026-01-03T09")]
+
+            self.assertEqual([row["timestamp"][:10] for row in rows], ["2026-01-02"])
+            self.assertEqual(len(hour), 1)
+            self.assertEqual(len(list(query(ledger, "decision", "PROCEED", limit=2))), 2)
+
+    def test_range_query_compares_timestamps_as_utc_instants(self):
+        with tempfile.TemporaryDirectory() as temp:
+            ledger = Path(temp) / "receipts.jsonl"
+            # 23:30-05:00 on the 1st is 04:30 UTC on the 2nd; 02:00+05:00 on the 2nd is 21:00 UTC on the 1st.
+            for stamp in ("2026-01-01T23:30:00-05:00", "2026-01-02T02:00:00+05:00", "2026-01-02T03:00:00Z"):
+                append_receipt(ledger, {**REQUEST, "timestamp": stamp})
+
+            rows = [record["timestamp"] for _, record in query(ledger, since="2026-01-02T00:00:00+00:00", until="2026-01-03")]
+            hour = [record["timestamp"] for _, record in query(ledger, "hour", "2026-01-02T04")]
+
+            self.assertEqual(rows, ["2026-01-01T23:30:00-05:00", "2026-01-02T03:00:00Z"])
+            self.assertEqual(hour, ["2026-01-01T23:30:00-05:00"])
+            self.assertEqual(verify_index(ledger), (True, []))
+
+    def test_audit_rows_are_indexed_by_payload_trace_id(self):
+        with tempfile.TemporaryDirectory() as temp:
+            ledger = Path(temp) / "audit.jsonl"
+            append_audit_record(ledger, "GATE_PIPELINE_DECISION", "unit", {"trace_id": "t-1", "pairing_id": "p-1", "actual_decision": "PAUSE"}, "key")
+            append_audit_record(ledger, "GATE_PIPELINE_DECISION", "unit", {"trace_id": "t-2", "pairing_id": "p-1", "actual_decision": "PROCEED"}, "key")
+
+            self.assertEqual([row["payload"]["trace_id"] for row in lookup(ledger, "pairing_id", "p-1")], ["t-1", "t-2"])
+            self.assertEqual(lookup(ledger, "decision", "PAUSE")[0]["payload"]["trace_id"], "t-1")
+
+    def test_rewritten_ledger_rebuilds_index_and_tampered_index_fails_verify(self):
+        with tempfile.TemporaryDirectory() as temp:
+            ledger = Path(temp) / "receipts.jsonl"
+            first = append_receipt(ledger, REQUEST)
+            build_index(ledger)
+            ledger.unlink()
+            replacement = append_receipt(ledger, REQUEST)
+
+            self.assertEqual(lookup(ledger, "receipt_id", first["receipt_id"]), [])
+            self.assertEqual(lookup(ledger, "receipt_id", replacement["receipt_id"]), [replacement])
+
+            with closing(sqlite3.connect(index_path(ledger))) as conn, conn:
+                conn.execute("UPDATE rows SET hash_self = ?", ("f" * 64,))
+            ok, errors = verify_index(ledger)
+            self.assertFalse(ok)
+            self.assertIn("index row does not match", errors[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
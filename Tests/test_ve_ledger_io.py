@@ -0,0 +1,250 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import ve_ledger_io
+from echo_root_receipt import append_receipt, build_receipt, gate_decision, verify_chain
+from ve_ledger_io import (
+    ZERO_HASH,
+    LedgerWriter,
+    _exclusive_file_lock,
+    append_record,
+    iter_records,
+    head_path,
+    ledger_lock,
+    lock_metrics,
+    lock_path,
+    read_head,
+    reset_lock_metrics,
+    scan_records,
+    tail_hash,
+    tail_record,
+)
+
+
+class LedgerIoTests(unittest.TestCase):
+    def test_tail_hash_of_missing_or_blank_ledger_is_zero(self):
+        with tempfile.TemporaryDirectory() as temp:
+            ledger = Path(temp) / "ledger.jsonl"
+            self.assertEqual(tail_hash(ledger), ZERO_HASH)
+            ledger.write_text("\n\n  \n", encoding="utf-8")
+            self.assertEqual(tail_hash(ledger), ZERO_HASH)
+
+    def test_append_advances_head_pointer(self):
+        with tempfile.TemporaryDirectory() as temp:
+            ledger = Path(temp) / "ledger.jsonl"
+            first = append_record(ledger, {"n": 1, "hash_prev": ZERO_HASH, "hash_self": "a" * 64})
+            second = append_record(ledger, {"n": 2, "hash_prev": "a" * 64, "hash_self": "b" * 64})
+            head = read_head(ledger)
+
+            self.assertEqual(first, 0)
+            self.assertEqual(head["line_offset"], second)
+            self.assertEqual(head["size"], ledger.stat().st_size)
+            self.assertEqual(tail_hash(ledger), "b" * 64)
+
+    def test_stale_head_pointer_falls_back_to_backward_scan(self):
+        with tempfile.TemporaryDirectory() as temp:
+            ledger = Path(temp) / "ledger.jsonl"
+            append_record(ledger, {"n": 1, "hash_prev": ZERO_HASH, "hash_self": "a" * 64})
+            with ledger.open("a", encoding="utf-8") as handle:
+                handle.write(json.dumps({"n": 2, "hash_self": "c" * 64}) + "\n\n")
+
+            offset, record = tail_record(ledger)
+
+            self.assertEqual(record["hash_self"], "c" * 64)
+            self.assertEqual(ledger.read_bytes()[offset:].strip(), json.dumps({"n": 2, "hash_self": "c" * 64}).encode("utf-8"))
+            self.assertEqual(read_head(ledger)["hash_self"], "c" * 64)
+
+    def test_tail_scan_handles_rows_longer_than_one_block(self):
+        with tempfile.TemporaryDirectory() as temp:
+            ledger = Path(temp) / "ledger.jsonl"
+            append_record(ledger, {"pad": "x" * 20000, "hash_prev": ZERO_HASH, "hash_self": "a" * 64})
+            append_record(ledger, {"pad": "y" * 20000, "hash_prev": "a" * 64, "hash_self": "b" * 64})
+            head_path(ledger).unlink()
+
+            self.assertEqual(tail_hash(ledger), "b" * 64)
+
+    def test_receipt_chain_links_through_tail_reader(self):
+        with tempfile.TemporaryDirectory() as temp:
+            ledger = Path(temp) / "receipts.jsonl"
+            request = {"requested_action": "summarize", "consent_scope_present": True, "rho": 0.8, "delta": 0.1, "dry_run": True}
+            first = append_receipt(ledger, request)
+            second = append_receipt(ledger, request)
+
+            self.assertEqual(second["hash_prev"], first["hash_self"])
+            self.assertEqual(verify_chain(ledger), (True, []))
+
+    def test_writer_group_commits_concurrent_appends_in_chain_order(self):
+        with tempfile.TemporaryDirectory() as temp:
+            ledger = Path(temp) / "receipts.jsonl"
+            writer = LedgerWriter(ledger)
+            request = {"requested_action": "summarize", "consent_scope_present": True, "rho": 0.8, "delta": 0.1, "dry_run": True}
+            decision, reason = gate_decision(request)
+            results: list[dict] = []
+            release = threading.Event()
+
+            def held(prev: str) -> dict:
+                release.wait(10)
+                return build_receipt(request, decision, reason, prev)
+
+            def worker() -> None:
+                for _ in range(20):
+                    results.append(append_receipt_via(writer, request))
+
+            with patch("ve_ledger_io.os.fsync", wraps=os.fsync) as fsync:
+                first = writer.submit(held)
+                threads = [threading.Thread(target=worker) for _ in range(8)]
+                for thread in threads:
+                    thread.start()
+                deadline = time.monotonic() + 10
+                while writer._queue.qsize() < 8 and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                release.set()
+                for thread in threads:
+                    thread.join()
+                results.append(first.result())
+                writer.close()
+
+            rows = [json.loads(line) for line in ledger.read_text(encoding="utf-8").splitlines()]
+            self.assertEqual(len(rows), 161)
+            self.assertEqual({row["receipt_id"] for row in rows}, {row["receipt_id"] for row in results})
+            # The eight requests queued behind the held builder commit together, so at least seven fsyncs are saved.
+            self.assertLessEqual(writer.batches, 161 - 7)
+            self.assertEqual(fsync.call_count, writer.batches)
+            self.assertEqual(verify_chain(ledger), (True, []))
+
+    def test_writer_failed_builder_does_not_break_chain(self):
+        with tempfile.TemporaryDirectory() as temp:
+            ledger = Path(temp) / "ledger.jsonl"
+            writer = LedgerWriter(ledger)
+
+            def bad(_: str) -> dict:
+                raise ValueError("schema error")
+
+            good = writer.submit(lambda prev: {"n": 1, "hash_prev": prev, "hash_self": "a" * 64})
+            failed = writer.submit(bad)
+            after = writer.submit(lambda prev: {"n": 2, "hash_prev": prev, "hash_self": "b" * 64})
+
+            self.assertEqual(good.result()["hash_prev"], ZERO_HASH)
+            with self.assertRaises(ValueError):
+                failed.result()
+            self.assertEqual(after.result()["hash_prev"], "a" * 64)
+            writer.close()
+
+    def test_head_sidecar_failure_does_not_fail_durable_appends(self):
+        with tempfile.TemporaryDirectory() as temp:
+            ledger = Path(temp) / "ledger.jsonl"
+            append_record(ledger, {"n": 0, "hash_prev": ZERO_HASH, "hash_self": "0" * 64})
+            writer = LedgerWriter(ledger)
+            full = OSError(28, "No space left on device")
+            with patch("ve_ledger_io.write_head", side_effect=full):
+                first = writer.submit(lambda prev: {"n": 1, "hash_prev": prev, "hash_self": "a" * 64})
+                second = writer.submit(lambda prev: {"n": 2, "hash_prev": prev, "hash_self": "b" * 64})
+                self.assertEqual(first.result()["hash_prev"], "0" * 64)
+                self.assertEqual(second.result()["hash_prev"], "a" * 64)
+            writer.close()
+
+            self.assertEqual([record["n"] for record in iter_records(ledger)], [0, 1, 2])
+            self.assertEqual(tail_hash(ledger), "b" * 64)
+            self.assertEqual(read_head(ledger)["hash_self"], "b" * 64)
+
+    def test_scan_records_yields_offsets_and_projected_fields(self):
+        with tempfile.TemporaryDirectory() as temp:
+            ledger = Path(temp) / "ledger.jsonl"
+            first = append_record(ledger, {"n": 1, "pad": "x", "hash_self": "a" * 64})
+            with ledger.open("a", encoding="utf-8") as handle:
+                handle.write("\n  \n")
+            second = append_record(ledger, {"n": 2, "pad": "y", "hash_self": "b" * 64})
+
+            self.assertEqual(list(scan_records(ledger, fields=("n",))), [(first, {"n": 1}), (second, {"n": 2})])
+            self.assertEqual(list(scan_records(ledger, start=second)), [(second, {"hash_self": "b" * 64, "n": 2, "pad": "y"})])
+            self.assertEqual([row["n"] for row in iter_records(ledger)], [1, 2])
+            self.assertEqual(list(iter_records(Path(temp) / "missing.jsonl")), [])
+
+
+class LedgerLockTests(unittest.TestCase):
+    def test_lock_blocks_second_holder_and_records_wait(self):
+        with tempfile.TemporaryDirectory() as temp:
+            ledger = Path(temp) / "ledger.jsonl"
+            reset_lock_metrics()
+            order: list[str] = []
+            held = threading.Event()
+
+            def second() -> None:
+                held.wait()
+                with ledger_lock(ledger):
+                    order.append("second")
+
+            thread = threading.Thread(target=second)
+            thread.start()
+            with ledger_lock(ledger):
+                held.set()
+                thread.join(0.2)
+                order.append("first")
+            thread.join()
+
+            metrics = lock_metrics()
+            self.assertEqual(order, ["first", "second"])
+            self.assertEqual(metrics["acquisitions"], 2)
+            self.assertEqual(metrics["contended"], 1)
+            self.assertGreater(metrics["max_wait_seconds"], 0.1)
+            self.assertFalse(lock_path(ledger).exists())
+
+    def test_leftover_lock_file_does_not_block_writers(self):
+        with tempfile.TemporaryDirectory() as temp:
+            ledger = Path(temp) / "ledger.jsonl"
+            lock_path(ledger).write_text("999999", encoding="utf-8")
+            with ledger_lock(ledger):
+                append_record(ledger, {"n": 1})
+            self.assertEqual(len(ledger.read_text(encoding="utf-8").splitlines()), 1)
+
+    def test_fallback_lock_breaks_lock_of_dead_pid(self):
+        with tempfile.TemporaryDirectory() as temp:
+            target = Path(temp) / "ledger.jsonl.lock.excl"
+            proc = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"], stdout=subprocess.PIPE, text=True, check=True)
+            target.write_text(proc.stdout.strip(), encoding="utf-8")
+            reset_lock_metrics()
+            with _exclusive_file_lock(target):
+                self.assertEqual(target.read_text(encoding="utf-8"), str(os.getpid()))
+            self.assertEqual(lock_metrics()["stale_recoveries"], 1)
+            self.assertFalse(target.exists())
+
+    def test_windows_blocking_lock_keeps_waiting_past_msvcrt_retry_limit(self):
+        calls: list[int] = []
+
+        def locking(handle: int, mode: int, size: int) -> None:
+            calls.append(mode)
+            if len(calls) < 3:
+                raise OSError(ve_ledger_io._LOCK_RETRY_ERRNO, "Resource deadlock avoided")
+
+        fake = SimpleNamespace(LK_LOCK=1, LK_NBLCK=2, locking=locking)
+        with tempfile.TemporaryDirectory() as temp:
+            handle = os.open(Path(temp) / "ledger.jsonl.lock", os.O_RDWR | os.O_CREAT)
+            try:
+                with patch.object(ve_ledger_io, "fcntl", None), patch.object(ve_ledger_io, "msvcrt", fake, create=True):
+                    self.assertTrue(ve_ledger_io._kernel_lock(handle, blocking=True))
+                    calls.clear()
+                    self.assertFalse(ve_ledger_io._kernel_lock(handle, blocking=False))
+            finally:
+                os.close(handle)
+        self.assertEqual(calls, [2])
+
+
+def append_receipt_via(writer: LedgerWriter, request: dict) -> dict:
+    decision, reason = gate_decision(request)
+    return writer.append(lambda prev: build_receipt(request, decision, reason, prev))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from echo_root_receipt import append_receipt, build_receipt, gate_decision, receipt_segment_errors, replay_ledger, verify_chain
+from ve_audit_chain import append_audit_record, audit_segment_check, verify_audit_chain, verify_audit_chain_incremental
+from ve_ledger_io import LedgerWriter, RotationPolicy, read_manifest, tail_hash
+from ve_ledger_segments import rotate_ledger, rotation_due, sealed_segment_paths, segments_dir
+
+
+REQUEST = {"requested_action": "summarize", "consent_scope_present": True, "rho": 0.8, "delta": 0.1, "dry_run": True}
+
+
+class LedgerSegmentTests(unittest.TestCase):
+    def test_rotation_links_new_segment_to_sealed_tail(self):
+        with tempfile.TemporaryDirectory() as temp:
+            ledger = Path(temp) / "receipts.jsonl"
+            append_receipt(ledger, REQUEST)
+            sealed_tail = append_receipt(ledger, REQUEST)["hash_self"]
+
+            entry = rotate_ledger(ledger)
+            self.assertFalse(ledger.exists())
+            self.assertEqual(tail_hash(ledger), sealed_tail)
+            after = append_receipt(ledger, REQUEST)
+
+            self.assertEqual(entry["lines"], 2)
+            self.assertEqual(entry["hash_tail"], sealed_tail)
+            self.assertEqual(after["hash_prev"], sealed_tail)
+            self.assertEqual(verify_chain(ledger), (True, []))
+            self.assertEqual(verify_chain(ledger, active_only=True), (True, []))
+            self.assertEqual(len(list(replay_ledger(ledger))), 3)
+            self.assertEqual(len(list(replay_ledger(ledger, active_only=True))), 1)
+            self.assertIsNone(rotate_ledger(ledger, RotationPolicy(max_bytes=10**9)))
+
+    def test_tampered_sealed_segment_fails_default_verify(self):
+        with tempfile.TemporaryDirectory() as temp:
+            ledger = Path(temp) / "receipts.jsonl"
+            append_receipt(ledger, REQUEST)
+            rotate_ledger(ledger)
+            segment = sealed_segment_paths(ledger)[0]
+            self.assertEqual(verify_chain(ledger), (True, []))
+            segment.write_text(segment.read_text(encoding="utf-8").replace('"rho": 0.8', '"rho": 0.9'), encoding="utf-8")
+
+            self.assertEqual(verify_chain(ledger, active_only=True), (False, ["segment 000001.jsonl: sha256 does not match manifest"]))
+            ok, errors = verify_chain(ledger)
+            self.assertFalse(ok)
+            self.assertIn("segment 000001.jsonl: sha256 does not match manifest", errors)
+            self.assertGreater(len(errors), 1)
+
+            segment.write_text("", encoding="utf-8")
+            self.assertEqual(verify_chain(ledger), (False, ["segment 000001.jsonl: size does not match manifest"]))
+
+    def test_sealing_refuses_rows_that_fail_the_ledger_verifier(self):
+        with tempfile.TemporaryDirectory() as temp:
+            ledger = Path(temp) / "receipts.jsonl"
+            append_receipt(ledger, REQUEST)
+            ledger.write_text(ledger.read_text(encoding="utf-8").replace('"rho": 0.8', '"rho": 0.9'), encoding="utf-8")
+
+            with self.assertRaisesRegex(ValueError, "refusing to seal"):
+                rotate_ledger(ledger, check_segment=receipt_segment_errors)
+            self.assertEqual(read_manifest(ledger)["segments"], [])
+
+            audit = Path(temp) / "audit.jsonl"
+            append_audit_record(audit, "TEST", "unit", {"n": 1}, "key")
+            with self.assertRaisesRegex(ValueError, "refusing to seal"):
+                rotate_ledger(audit, check_segment=audit_segment_check("wrong-key"))
+            self.assertEqual(rotate_ledger(audit, check_segment=audit_segment_check("key"))["lines"], 1)
+
+    def test_writer_rotates_by_size_policy(self):
+        with tempfile.TemporaryDirectory() as temp:
+            ledger = Path(temp) / "receipts.jsonl"
+            writer = LedgerWriter(ledger, rotation=RotationPolicy(max_bytes=1), check_segment=receipt_segment_errors)
+            decision, reason = gate_decision(REQUEST)
+            for _ in range(3):
+                writer.append(lambda prev: build_receipt(REQUEST, decision, reason, prev))
+            writer.close()
+
+            self.assertEqual(len(read_manifest(ledger)["segments"]), 2)
+            self.assertEqual(sorted(path.name for path in segments_dir(ledger).iterdir()), ["000001.jsonl", "000002.jsonl"])
+            self.assertEqual(verify_chain(ledger), (True, []))
+
+    def test_rotation_due_by_active_segment_age(self):
+        with tempfile.TemporaryDirectory() as temp:
+            ledger = Path(temp) / "receipts.jsonl"
+            append_receipt(ledger, {**REQUEST, "timestamp": "2026-01-01T00:00:00+00:00"})
+            policy = RotationPolicy(max_age_seconds=3600)
+
+            self.assertTrue(rotation_due(ledger, policy, datetime(2026, 1, 1, 2, tzinfo=timezone.utc)))
+            self.assertFalse(rotation_due(ledger, policy, datetime(2026, 1, 1, 0, 30, tzinfo=timezone.utc)))
+            rotate_ledger(ledger)
+            append_receipt(ledger, REQUEST)
+            sealed_at = datetime.fromisoformat(read_manifest(ledger)["active_since"])
+            self.assertFalse(rotation_due(ledger, policy, sealed_at + timedelta(minutes=5)))
+
+    def test_audit_chain_verifies_across_segments(self):
+        with tempfile.TemporaryDirectory() as temp:
+            ledger = Path(temp) / "audit.jsonl"
+            append_audit_record(ledger, "TEST", "unit", {"n": 1}, "key")
+            self.assertTrue(verify_audit_chain_incremental(ledger, "key"))
+            rotate_ledger(ledger)
+            append_audit_record(ledger, "TEST", "unit", {"n": 2}, "key")
+
+            self.assertTrue(verify_audit_chain_incremental(ledger, "key"))
+            self.assertTrue(verify_audit_chain(ledger, "key"))
+            self.assertTrue(verify_audit_chain(ledger, "key", active_only=True))
+            self.assertFalse(verify_audit_chain(ledger, "wrong-key"))
+
+
+if __name__ == "__main__":
+    unittest.main()
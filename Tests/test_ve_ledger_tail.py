@@ -0,0 +1,83 @@
+import json
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from echo_root_receipt import append_receipt, build_receipt
+from ve_audit_chain import append_audit_record
+from ve_ledger_segments import rotate_ledger
+from ve_ledger_tail import LedgerFollower, resolve_start, row_check
+
+
+REQUEST = {"requested_action": "read notes", "consent_scope_present": True, "rho": 0.9, "delta": 0.1, "confidence": "high"}
+
+
+class LedgerTailTests(unittest.TestCase):
+    def test_follow_verifies_rows_across_partial_writes_and_rotation(self):
+        with tempfile.TemporaryDirectory() as temp:
+            ledger = Path(temp) / "receipts.jsonl"
+            first = append_receipt(ledger, REQUEST)
+            follower = LedgerFollower(ledger, check_row=row_check("receipt"))
+            try:
+                self.assertEqual(follower.poll(), [])
+                appended = [append_receipt(ledger, REQUEST) for _ in range(2)]
+                events = follower.poll()
+                self.assertEqual([event["hash_self"] for event in events], [item["hash_self"] for item in appended])
+                self.assertTrue(all(event["valid"] for event in events))
+                self.assertEqual(events[0]["record"]["hash_prev"], first["hash_self"])
+
+                line = (json.dumps(build_receipt(REQUEST, "PROCEED", [], appended[-1]["hash_self"]), sort_keys=True) + "\n").encode("utf-8")
+                with ledger.open("ab") as handle:
+                    handle.write(line[:40])
+                    handle.flush()
+                    self.assertEqual(follower.poll(), [])
+                    handle.write(line[40:])
+                torn = follower.poll()
+                self.assertEqual(len(torn), 1)
+                self.assertTrue(torn[0]["valid"])
+                cursor = follower.cursor()
+
+                rotate_ledger(ledger)
+                after_rotation = append_receipt(ledger, REQUEST)
+                events = follower.poll()
+                self.assertEqual([(event["offset"], event["hash_self"], event["valid"]) for event in events], [(0, after_rotation["hash_self"], True)])
+
+                self.assertEqual(resolve_start(ledger, cursor["offset"], cursor["hash"]), (0, cursor["hash"]))
+
+                forged = build_receipt(REQUEST, "PROCEED", [], "f" * 64)
+                with ledger.open("a", encoding="utf-8") as handle:
+                    handle.write(json.dumps(forged, sort_keys=True) + "\n")
+                self.assertEqual(follower.poll()[0]["errors"], ["hash_prev mismatch"])
+            finally:
+                follower.close()
+
+    def test_follow_wakes_on_append_and_flags_bad_audit_signatures(self):
+        with tempfile.TemporaryDirectory() as temp:
+            ledger = Path(temp) / "audit.jsonl"
+            append_audit_record(ledger, "TEST", "unit", {"n": 1}, "key")
+            follower = LedgerFollower(ledger, from_offset=0, check_row=row_check("audit", "key"))
+            writer = threading.Timer(0.2, lambda: append_audit_record(ledger, "TEST", "unit", {"n": 2}, "other-key"))
+            try:
+                writer.start()
+                started = time.monotonic()
+                events = []
+                for event in follower.follow(timeout=5):
+                    events.append(event)
+                    if len(events) == 2:
+                        break
+                self.assertLess(time.monotonic() - started, 4)
+                self.assertEqual([event["valid"] for event in events], [True, False])
+                self.assertEqual(events[1]["errors"], ["signature does not verify"])
+            finally:
+                writer.join()
+                follower.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,8 @@
 import json
+import statistics
 import sys
 import tempfile
+import threading
 import unittest
 from pathlib import Path
 
@@ -9,7 +11,7 @@ sys.path.insert(0, str(ROOT))
 
 from ve_audit_chain import append_audit_record, verify_audit_chain
 from ve_deviation_classifier import classify_deviation
-from ve_twin_state import load_twin, predicted_delta, update_twin
+from ve_twin_state import TwinStore, delta_quantile, delta_stddev, load_twin, predicted_delta, update_twin
 
 
 class MedicalGradeControlTests(unittest.TestCase):
@@ -49,6 +51,66 @@ class MedicalGradeControlTests(unittest.TestCase):
             self.assertEqual(twin.observations, 1)
             self.assertEqual(predicted_delta(twin, 0.5), 0.3)
 
+    def test_twin_store_imports_legacy_json_once_on_first_open(self):
+        with tempfile.TemporaryDirectory() as temp:
+            legacy = Path(temp) / "twin_state.json"
+            for delta in (0.2, 0.4):
+                update_twin(legacy, "pairing-1", "PROPOSE", "PAUSE", 0.8, 0.7, delta)
+            store_path = Path(temp) / "twin_state.sqlite"
+            store = TwinStore(store_path)
+            try:
+                imported = store.load("pairing-1")
+                store.update("pairing-1", "PROPOSE", "PAUSE", 0.8, 0.7, 0.6)
+            finally:
+                store.close()
+            update_twin(legacy, "pairing-1", "PROPOSE", "PAUSE", 0.8, 0.7, 0.9)
+            reopened = TwinStore(store_path)
+            try:
+                twin = reopened.load("pairing-1")
+            finally:
+                reopened.close()
+
+        self.assertEqual((imported.observations, imported.delta_baseline), (2, 0.3))
+        self.assertEqual((twin.observations, twin.delta_baseline), (3, 0.4))
+
+    def test_twin_store_keeps_many_pairings_with_running_statistics(self):
+        deltas = [0.1, 0.3, 0.2, 0.6, 0.25]
+        with tempfile.TemporaryDirectory() as temp:
+            path = Path(temp) / "twins.sqlite"
+            store = TwinStore(path)
+            try:
+                for delta in deltas:
+                    store.update("pairing-a", "OBSERVE", "PROCEED", 0.8, 0.7, delta)
+                store.update("pairing-b", "PROPOSE", "PAUSE", 0.6, 0.7, 0.9)
+
+                def hammer(pairing_id: str) -> None:
+                    local = TwinStore(path)
+                    try:
+                        for _ in range(20):
+                            local.update(pairing_id, "OBSERVE", "PROCEED", 0.8, 0.7, 0.2)
+                    finally:
+                        local.close()
+
+                workers = [threading.Thread(target=hammer, args=(f"pairing-{index % 2}",)) for index in range(4)]
+                for worker in workers:
+                    worker.start()
+                for worker in workers:
+                    worker.join()
+                twin = store.load("pairing-a")
+                counts = [store.load(f"pairing-{index}").observations for index in range(2)]
+                pairings = store.pairings()
+            finally:
+                store.close()
+
+        self.assertEqual(twin.observations, 5)
+        self.assertEqual(twin.delta_baseline, round(statistics.mean(deltas), 3))
+        self.assertAlmostEqual(delta_stddev(twin), statistics.stdev(deltas))
+        self.assertEqual(delta_quantile(twin, 0.5), 0.25)
+        self.assertEqual(counts, [40, 40])
+        self.assertEqual(pairings, ["pairing-0", "pairing-1", "pairing-a", "pairing-b"])
+        self.assertEqual(predicted_delta(twin, twin.delta_ewma + delta_stddev(twin), variance_aware=True), 0.0)
+        self.assertGreater(predicted_delta(twin, 1.5, variance_aware=True), 0.0)
+
 
 if __name__ == "__main__":
     unittest.main()
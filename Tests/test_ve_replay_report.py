@@ -2,12 +2,17 @@ import sys
 import tempfile
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
+import ve_ledger_segments
+from ve_audit_chain import audit_segment_check
 from ve_gate_pipeline import run_gate_pipeline
-from ve_replay_report import write_replay_report
+from ve_gate_replay import replay_gate_audit
+from ve_ledger_segments import rotate_ledger
+from ve_replay_report import iter_html, iter_markdown, pages_dir, render_html, render_markdown, state_path, write_replay_report, write_replay_report_incremental
 
 
 class ReplayReportTests(unittest.TestCase):
@@ -32,8 +37,124 @@ class ReplayReportTests(unittest.TestCase):
             summary = write_replay_report(audit, html, markdown, "key")
             self.assertTrue(summary["audit_chain_valid"])
             self.assertIn("VE Gate Replay Report", html.read_text(encoding="utf-8"))
+            self.assertEqual(html.read_text(encoding="utf-8"), render_html(replay_gate_audit(audit, "key", include_records=True)))
+            self.assertEqual(markdown.read_text(encoding="utf-8"), render_markdown(summary))
+            self.assertNotIn("records", summary)
             self.assertIn("cipher-richard", markdown.read_text(encoding="utf-8"))
 
+    def test_streamed_reports_match_rendered_strings_from_iterators(self):
+        record = {"trace_id": "t<1>", "pairing_id": "alpha", "action_class": "READ_ONLY", "actual_decision": "PROCEED", "replay_deviation_class": "nominal", "twin_delta": 0.25, "classifier_changed": False}
+        session = {"pairing_id": "alpha", "records": 3, "advisory_events": 0, "adverse_events": 0, "classifier_changes": 0, "max_twin_delta": 0.25}
+        summary = {"audit_chain_valid": True, "records_replayed": 3, "advisory_events": 0, "adverse_events": 0, "classifier_changes": 0, "max_twin_delta": 0.25, "sessions": [session], "records": [record] * 3}
+        streamed = dict(summary, sessions=iter(summary["sessions"]), records=(dict(record, trace_id=f"t<{index + 1}>") for index in range(3)))
+        chunks = list(iter_html(streamed))
+
+        self.assertGreater(len(chunks), 3)
+        self.assertEqual("".join(chunks).count("t&lt;2&gt;"), 1)
+        self.assertEqual(render_html(summary).count("<tr><td>t&lt;1&gt;"), 3)
+        self.assertEqual("".join(iter_markdown(dict(summary, sessions=iter([session])))), render_markdown(summary))
+
+    def test_incremental_report_processes_only_new_rows_and_matches_full_replay(self):
+        with tempfile.TemporaryDirectory() as temp:
+            audit = Path(temp) / "audit.jsonl"
+            twin = Path(temp) / "twin.json"
+            html = Path(temp) / "report.html"
+            markdown = Path(temp) / "report.md"
+
+            def decide(pairing_id: str, delta: float) -> None:
+                run_gate_pipeline(
+                    description="Summarize the notes.",
+                    action_class="READ_ONLY",
+                    expected_decision="PROPOSE",
+                    delta=delta,
+                    pairing_id=pairing_id,
+                    audit_ledger=audit,
+                    twin_state_path=twin,
+                    signing_key="key",
+                )
+
+            for index in range(3):
+                decide("alpha" if index % 2 else "beta", 0.1 * index)
+            first = write_replay_report_incremental(audit, html, markdown, "key", page_size=2)
+            decide("alpha", 0.5)
+            decide("gamma", 0.2)
+            second = write_replay_report_incremental(audit, html, markdown, "key", page_size=2)
+            idle = write_replay_report_incremental(audit, html, markdown, "key", page_size=2)
+            full = replay_gate_audit(audit, "key", include_records=True)
+
+            self.assertEqual((first["records_added"], second["records_added"], idle["records_added"]), (3, 2, 0))
+            self.assertTrue(first["rebuilt"])
+            self.assertFalse(second["rebuilt"])
+            for key in ("audit_chain_valid", "records_replayed", "adverse_events", "advisory_events", "max_twin_delta", "classifier_changes", "sessions"):
+                self.assertEqual(idle[key], full[key], key)
+            self.assertEqual(idle["records"], full["records"][-1:])
+            pages = sorted(path.name for path in pages_dir(html).iterdir())
+            self.assertEqual(pages, ["records-000001.html", "records-000002.html", "records-000003.html"])
+            self.assertIn(full["records"][2]["trace_id"], (pages_dir(html) / pages[1]).read_text(encoding="utf-8"))
+            self.assertIn("report_pages/records-000003.html", html.read_text(encoding="utf-8"))
+
+            state = state_path(html)
+            state.write_text(state.read_text(encoding="utf-8").replace('"records_replayed": 5', '"records_replayed": 50'), encoding="utf-8")
+            rebuilt = write_replay_report_incremental(audit, html, markdown, "key", page_size=2)
+            self.assertTrue(rebuilt["rebuilt"])
+            self.assertEqual(rebuilt["records_replayed"], 5)
+
+    def test_incremental_report_rebuilds_after_cursor_row_edit_or_rotation(self):
+        with tempfile.TemporaryDirectory() as temp:
+            audit = Path(temp) / "audit.jsonl"
+            html = Path(temp) / "report.html"
+            markdown = Path(temp) / "report.md"
+
+            def decide(delta: float) -> None:
+                run_gate_pipeline(
+                    description="Summarize the notes.",
+                    action_class="READ_ONLY",
+                    expected_decision="PROPOSE",
+                    delta=delta,
+                    pairing_id="alpha",
+                    audit_ledger=audit,
+                    twin_state_path=Path(temp) / "twin.json",
+                    signing_key="key",
+                )
+
+            decide(0.1)
+            decide(0.2)
+            self.assertTrue(write_replay_report_incremental(audit, html, markdown, "key")["audit_chain_valid"])
+            head, _, tail = audit.read_bytes().rpartition(b'"actor": "VE_GATE_PIPELINE"')
+            audit.write_bytes(head + b'"actor": "VE_GATE_PIPELIN3"' + tail)
+            decide(0.3)
+
+            tampered = write_replay_report_incremental(audit, html, markdown, "key")
+            self.assertTrue(tampered["rebuilt"])
+            self.assertFalse(tampered["audit_chain_valid"])
+            self.assertEqual(tampered["records_replayed"], 3)
+
+            audit.unlink()
+            decide(0.1)
+            decide(0.2)
+            write_replay_report_incremental(audit, html, markdown, "key")
+            rotate_ledger(audit, check_segment=audit_segment_check("key"))
+            decide(0.4)
+            rotated = write_replay_report_incremental(audit, html, markdown, "key")
+            idle = write_replay_report_incremental(audit, html, markdown, "key")
+            full = replay_gate_audit(audit, "key")
+
+            self.assertTrue(rotated["rebuilt"])
+            self.assertFalse(idle["rebuilt"])
+            for key in ("audit_chain_valid", "records_replayed", "max_twin_delta", "sessions"):
+                self.assertEqual(idle[key], full[key], key)
+            self.assertTrue(idle["audit_chain_valid"])
+
+            # A fresh process trusts the sealed segments recorded in the signed state instead of re-hashing them.
+            ve_ledger_segments._VERIFIED_DIGESTS.clear()
+            with patch.object(ve_ledger_segments, "file_digest", wraps=ve_ledger_segments.file_digest) as digest:
+                decide(0.5)
+                again = write_replay_report_incremental(audit, html, markdown, "key")
+            self.assertEqual(digest.call_count, 0)
+            self.assertFalse(again["rebuilt"])
+            self.assertEqual(again["records_added"], 1)
+            self.assertTrue(again["audit_chain_valid"])
+
 
 if __name__ == "__main__":
     unittest.main()
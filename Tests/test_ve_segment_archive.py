@@ -0,0 +1,79 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from echo_root_receipt import append_receipt, replay_ledger, verify_chain
+from ve_audit_chain import append_audit_record, verify_audit_chain
+from ve_ledger_index import build_index
+from ve_ledger_io import index_path, read_manifest
+from ve_ledger_segments import compress_sealed_segments, rotate_ledger, sealed_segment_paths, segments_dir
+from ve_segment_archive import read_block_index, restore_segment, scan_archive, write_archive
+
+
+REQUEST = {"requested_action": "summarize", "consent_scope_present": True, "rho": 0.8, "delta": 0.1, "dry_run": True}
+
+
+class SegmentArchiveTests(unittest.TestCase):
+    def test_archive_restores_exact_bytes_block_by_block(self):
+        with tempfile.TemporaryDirectory() as temp:
+            segment = Path(temp) / "000001.jsonl"
+            for day in range(1, 6):
+                append_receipt(segment, {**REQUEST, "timestamp": f"2026-01-0{day}T00:00:00+00:00"})
+            archive = Path(temp) / "000001.jsonl.xz"
+            index = write_archive(segment, archive, block_target_bytes=1)
+            restored = Path(temp) / "restored.jsonl"
+            restore_segment(archive, restored)
+
+            self.assertEqual(restored.read_bytes(), segment.read_bytes())
+            self.assertEqual(len(index["blocks"]), 5)
+            rows = list(scan_archive(archive))
+            self.assertEqual([row["timestamp"][:10] for _, row in rows], [f"2026-01-0{day}" for day in range(1, 6)])
+            self.assertEqual([offset for offset, _ in rows], [block["raw_offset"] for block in index["blocks"]])
+
+    def test_compressed_segments_verify_and_replay(self):
+        with tempfile.TemporaryDirectory() as temp:
+            ledger = Path(temp) / "receipts.jsonl"
+            append_receipt(ledger, REQUEST)
+            append_receipt(ledger, REQUEST)
+            build_index(ledger)
+            rotate_ledger(ledger)
+            append_receipt(ledger, REQUEST)
+            rotate_ledger(ledger)
+            append_receipt(ledger, REQUEST)
+            self.assertTrue(index_path(segments_dir(ledger) / "000001.jsonl").exists())
+
+            compressed = compress_sealed_segments(ledger)
+
+            self.assertEqual([entry["name"] for entry in compressed], ["000001.jsonl", "000002.jsonl"])
+            self.assertEqual([path.name for path in sealed_segment_paths(ledger)], ["000001.jsonl.xz", "000002.jsonl.xz"])
+            self.assertFalse((segments_dir(ledger) / "000001.jsonl").exists())
+            self.assertFalse(index_path(segments_dir(ledger) / "000001.jsonl").exists())
+            self.assertEqual(read_block_index(sealed_segment_paths(ledger)[0])["blocks"][0]["lines"], 2)
+            self.assertEqual(verify_chain(ledger), (True, []))
+            self.assertEqual(verify_chain(ledger, active_only=True), (True, []))
+            self.assertEqual(len(list(replay_ledger(ledger))), 4)
+            self.assertEqual(compress_sealed_segments(ledger), [])
+            self.assertEqual(rotate_ledger(ledger)["name"], "000003.jsonl")
+
+    def test_corrupt_archive_fails_verify(self):
+        with tempfile.TemporaryDirectory() as temp:
+            ledger = Path(temp) / "audit.jsonl"
+            append_audit_record(ledger, "TEST", "unit", {"n": 1}, "key")
+            rotate_ledger(ledger)
+            compress_sealed_segments(ledger)
+            archive = sealed_segment_paths(ledger)[0]
+            data = bytearray(archive.read_bytes())
+            data[len(data) // 2] ^= 0xFF
+            archive.write_bytes(bytes(data))
+
+            self.assertFalse(verify_audit_chain(ledger, "key"))
+            self.assertFalse(verify_audit_chain(ledger, "key", active_only=True))
+            self.assertEqual(read_manifest(ledger)["segments"][0]["archive"]["blocks"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from ve_audit_chain import sha256
+from ve_contact_registry import Contact, load_contacts, most_recent, record_interaction, upsert_contact
+from ve_ledger_tail import row_check
+from ve_lessons_ledger import append_lesson, list_lessons
+from ve_pairing_recorder import append_pairing_record, export_training_candidates
+from ve_storage import JsonlLog, SqliteLog, export_jsonl, import_jsonl, open_log, verify_links
+
+
+def chained(actor: str):
+    def build(hash_prev: str) -> dict:
+        body = {"actor": actor, "tags": [actor, "shared"], "hash_prev": hash_prev}
+        return {**body, "hash_self": sha256(body)}
+
+    return build
+
+
+class StorageTests(unittest.TestCase):
+    def test_sqlite_log_chains_concurrent_writers_and_round_trips_jsonl(self):
+        with tempfile.TemporaryDirectory() as temp:
+            store = Path(temp) / "ledger.sqlite"
+            jsonl = Path(temp) / "ledger.jsonl"
+
+            def writer(actor: str) -> None:
+                log = open_log(store, ("actor", "tags"))
+                try:
+                    for _ in range(10):
+                        log.append_chained(chained(actor))
+                finally:
+                    log.close()
+
+            threads = [threading.Thread(target=writer, args=(f"w{index}",)) for index in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            log = SqliteLog(store)
+            try:
+                rows = list(log.records())
+                self.assertEqual(len(rows), 40)
+                self.assertEqual(verify_links(log), [])
+                self.assertEqual(log.index_fields, ("actor", "tags"))
+                self.assertEqual(len(list(log.records("tags", "w2"))), 10)
+                self.assertEqual(log.last_hash(), rows[-1]["hash_self"])
+            finally:
+                log.close()
+
+            self.assertEqual(export_jsonl(store, jsonl), 40)
+            self.assertEqual(list(JsonlLog(jsonl).records("actor", "w1")), [row for row in rows if row["actor"] == "w1"])
+            copy = Path(temp) / "copy.sqlite"
+            import_jsonl(jsonl, copy)
+            export_jsonl(copy, Path(temp) / "again.jsonl")
+            self.assertEqual((Path(temp) / "again.jsonl").read_bytes(), jsonl.read_bytes())
+
+            tampered = SqliteLog(copy, ("actor",))
+            try:
+                tampered.append([{"actor": "x", "hash_prev": "bad", "hash_self": "y"}])
+                self.assertEqual(len(verify_links(tampered)), 1)
+                self.assertEqual(len(list(tampered.records("actor", "w3"))), 10)
+            finally:
+                tampered.close()
+
+    def test_verify_links_checks_hash_columns_and_owning_row_hash(self):
+        with tempfile.TemporaryDirectory() as temp:
+            store = Path(temp) / "lessons.sqlite"
+            append_lesson(store, "i", "o", "f", "l", "verified", ["audit"])
+            append_lesson(store, "i", "o", "f", "l", "verified", ["other"])
+            check = row_check("lessons")
+
+            log = SqliteLog(store)
+            try:
+                self.assertEqual(verify_links(log, check_row=check), [])
+                log.conn.execute("UPDATE records SET body = replace(body, '\"other\"', '\"forged\"') WHERE seq = 2")
+                self.assertEqual(verify_links(log), [])
+                self.assertEqual(verify_links(log, check_row=check), ["line 2: hash_self does not match lesson body"])
+                log.conn.execute("UPDATE records SET hash_self = 'x' WHERE seq = 1")
+                self.assertEqual(verify_links(log)[0], "line 1: hash_prev/hash_self columns do not match the row body")
+            finally:
+                log.close()
+
+            pairing = Path(temp) / "pairing.jsonl"
+            append_pairing_record(pairing, "s", "t", "Summarize the notes.", "Done.", "summary", "assistant", "ok", True, True, "redacted")
+            self.assertEqual(verify_links(JsonlLog(pairing), check_row=row_check("pairing")), [])
+            pairing.write_text(pairing.read_text(encoding="utf-8").replace("Done.", "Forged."), encoding="utf-8")
+            self.assertEqual(verify_links(JsonlLog(pairing), check_row=row_check("pairing")), ["line 1: hash_self does not match pairing body"])
+
+    def test_registries_behave_the_same_on_jsonl_and_sqlite(self):
+        with tempfile.TemporaryDirectory() as temp:
+            results = []
+            for suffix in (".jsonl", ".sqlite"):
+                contacts = Path(temp) / f"contacts{suffix}"
+                lessons = Path(temp) / f"lessons{suffix}"
+                pairing = Path(temp) / f"pairing{suffix}"
+                upsert_contact(contacts, Contact("b", "beta", "ai", "regular"))
+                upsert_contact(contacts, Contact("a", "Alpha", "human", "regular"))
+                record_interaction(contacts, "b", "2026-02-01T00:00:00+00:00")
+                with self.assertRaises(ValueError):
+                    record_interaction(contacts, "missing")
+                append_lesson(lessons, "i", "o", "f", "l", "verified", ["audit"])
+                append_lesson(lessons, "i", "o", "f", "l", "verified", ["other"])
+                for consent in (True, False):
+                    append_pairing_record(pairing, "s", "t", "Summarize the notes.", "Done.", "summary", "assistant", "ok", True, consent, "redacted")
+                exported = export_training_candidates(pairing, Path(temp) / f"export{suffix}.jsonl")
+                results.append(
+                    (
+                        [item.contact_id for item in load_contacts(contacts)],
+                        most_recent(contacts, 1)[0].contact_id,
+                        [item.tags for item in list_lessons(lessons, "audit")],
+                        exported,
+                    )
+                )
+
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(results[0], (["a", "b"], "b", [["audit"]], 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
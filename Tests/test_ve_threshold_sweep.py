@@ -0,0 +1,111 @@
+import json
+import random
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from echo_root_receipt import GateConfig, append_receipt, gate_decision, replay_request
+from self_proposal import POLICY_THRESHOLDS, SELF_PROPOSAL_GATE_RULES, AutonomyCharter, create_self_proposal
+from ve_ledger_io import scan_records
+from ve_threshold_sweep import load_receipt_rows, load_self_proposal_rows, parse_grid, sweep
+
+
+RHO = [0.5, 0.7, 0.85]
+DELTA = [0.1, 0.3]
+ABORT = [0.3, 0.4, 0.6]
+
+
+def _decisions(decide):
+    points = {}
+    for rho in RHO:
+        for delta in DELTA:
+            for abort in ABORT:
+                counts = {"PROCEED": 0, "PAUSE": 0, "ABORT": 0, "SAFE_MODE": 0}
+                for decision in decide(rho, delta, abort):
+                    counts[decision] += 1
+                points[(rho, delta, abort)] = counts
+    return points
+
+
+class ThresholdSweepTests(unittest.TestCase):
+    def test_receipt_sweep_matches_scalar_gate_at_every_grid_point(self):
+        rng = random.Random(13)
+        with tempfile.TemporaryDirectory() as temp:
+            ledger = Path(temp) / "receipts.jsonl"
+            for _ in range(150):
+                append_receipt(
+                    ledger,
+                    {
+                        "requested_action": rng.choice(["summarize", "write report", "delete cache"]),
+                        "consent_scope_present": rng.random() < 0.8,
+                        "rho": rng.choice([0.5, 0.7, 0.85, rng.random()]),
+                        "delta": rng.choice([0.1, 0.3, 0.4, rng.random()]),
+                        "fallback_status": rng.choice(["none", "none", "unsafe"]),
+                        "dry_run": True,
+                    },
+                )
+            receipts = [record for _, record in scan_records(ledger)]
+            result = sweep(load_receipt_rows(ledger), RHO, DELTA, ABORT)
+
+        expected = _decisions(
+            lambda rho, delta, abort: [
+                gate_decision(replay_request(receipt), GateConfig(proceed_rho=rho, proceed_delta=delta, abort_delta=abort))[0]
+                for receipt in receipts
+            ]
+        )
+        self.assertEqual(result["receipts"], 150)
+        self.assertEqual(len(result["points"]), len(expected))
+        for point in result["points"]:
+            self.assertEqual(point["decisions"], expected[(point["rho"], point["delta"], point["abort_delta"])])
+            self.assertEqual(point["changed"], sum(point["shifts"].values()))
+        default = next(point for point in result["points"] if (point["rho"], point["delta"], point["abort_delta"]) == (0.7, 0.3, 0.4))
+        self.assertEqual(default["changed"], 0)
+
+    def test_self_proposal_sweep_only_moves_the_swept_tier(self):
+        rng = random.Random(17)
+        charter = AutonomyCharter(allowed_actions=("suggest", "prepare"), max_files_touched=2)
+        proposals = [
+            create_self_proposal(
+                action_lane=rng.choice(["suggest", "prepare", "delete"]),
+                policy_tier=rng.choice(["low", "standard", "high"]),
+                consent_scope_present=True,
+                rho=rng.random(),
+                delta=rng.random() * 0.7,
+                receipt_chain_valid=rng.random() < 0.95,
+                decision=rng.choice(["PROCEED", "PAUSE"]),
+            )
+            for _ in range(150)
+        ]
+        with tempfile.TemporaryDirectory() as temp:
+            ledger = Path(temp) / "proposals.jsonl"
+            ledger.write_text("".join(json.dumps(item) + "\n" for item in proposals), encoding="utf-8")
+            result = sweep(load_self_proposal_rows(ledger, "standard", charter), RHO, DELTA, ABORT)
+
+        expected = _decisions(
+            lambda rho, delta, abort: [
+                SELF_PROPOSAL_GATE_RULES.evaluate(
+                    proposal,
+                    charter=charter,
+                    chain_valid=proposal["receipt_chain_valid"],
+                    policy_thresholds={**POLICY_THRESHOLDS, "standard": {"rho": rho, "delta": delta}},
+                    abort_delta=abort,
+                ).decision
+                for proposal in proposals
+            ]
+        )
+        for point in result["points"]:
+            self.assertEqual(point["decisions"], expected[(point["rho"], point["delta"], point["abort_delta"])])
+
+    def test_grid_specs_include_the_stop_value(self):
+        self.assertEqual(parse_grid("0.6:0.8:0.05"), [0.6, 0.65, 0.7, 0.75, 0.8])
+        self.assertEqual(parse_grid("0.3,0.4"), [0.3, 0.4])
+        with self.assertRaises(ValueError):
+            sweep(load_receipt_rows(Path("missing.jsonl")), [], [0.3], [0.4])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,9 +7,23 @@ import sys
 from pathlib import Path
 from typing import Any
 
-from echo_root_receipt import append_receipt, gate_decision, replay_receipt, verify_chain
+from echo_root_receipt import (
+    append_receipt,
+    gate_decision,
+    receipt_segment_errors,
+    replay_ledger_parallel,
+    replay_receipt,
+    verify_chain,
+    verify_chain_parallel,
+)
 from repo_map import DEFAULT_EXCLUDES, build_receipt as build_repo_map_receipt
 from repo_map import build_repo_map
+from ve_columnar import RECEIPT_COLUMNS, export_receipt_columns, receipt_columns, summarize_receipts
+from ve_ledger_index import QUERY_FIELDS, build_index, query as query_index, verify_index
+from ve_ledger_io import RotationPolicy, read_manifest
+from ve_ledger_segments import compress_sealed_segments, rotate_ledger
+from ve_ledger_tail import LedgerFollower, row_check
+from ve_threshold_sweep import load_receipt_rows, parse_grid, sweep
 
 
 REPO_ROOT = Path(__file__).resolve().parent
@@ -20,6 +34,10 @@ def _print_json(data: Any) -> None:
     print(json.dumps(data, indent=2, sort_keys=True))
 
 
+def _print_ndjson(data: Any) -> None:
+    print(json.dumps(data, sort_keys=True), flush=True)
+
+
 def _bool_arg(value: str) -> bool:
     lowered = value.strip().lower()
     if lowered in {"1", "true", "yes", "y", "on"}:
@@ -123,19 +141,87 @@ def command_append_receipt(args: argparse.Namespace) -> int:
 
 
 def command_verify_chain(args: argparse.Namespace) -> int:
-    ok, errors = verify_chain(Path(args.ledger))
+    ledger = Path(args.ledger)
+    ok, errors = verify_chain_parallel(ledger, args.workers or None, args.active_only)
+    if args.ndjson:
+        for error in errors:
+            _print_ndjson({"error": error})
+        _print_ndjson({"ledger": str(ledger), "ok": ok, "error_count": len(errors)})
+        return 0 if ok else 1
     _print_json({"ledger": str(Path(args.ledger)), "ok": ok, "errors": errors})
     return 0 if ok else 1
 
 
 def command_replay(args: argparse.Namespace) -> int:
     ledger = Path(args.ledger)
-    rows = [json.loads(line) for line in ledger.read_text(encoding="utf-8").splitlines() if line.strip()]
-    replay = [replay_receipt(row) for row in rows]
+    rows = replay_ledger_parallel(ledger, args.workers or None, args.active_only, args.only_mismatches)
+    if args.ndjson:
+        all_match = True
+        count = 0
+        for row in rows:
+            all_match = all_match and row["matches"]
+            count += 1
+            _print_ndjson(row)
+        _print_ndjson({"ledger": str(ledger), "mismatches" if args.only_mismatches else "replayed": count, "all_match": all_match})
+        return 0 if all_match else 1
+    replay = list(rows)
     _print_json({"ledger": str(ledger), "replay": replay, "all_match": all(row["matches"] for row in replay)})
     return 0 if all(row["matches"] for row in replay) else 1
 
 
+def command_rotate(args: argparse.Namespace) -> int:
+    ledger = Path(args.ledger)
+    policy = None
+    if args.max_bytes is not None or args.max_age_hours is not None:
+        policy = RotationPolicy(args.max_bytes, args.max_age_hours * 3600 if args.max_age_hours is not None else None)
+    entry = rotate_ledger(ledger, policy, receipt_segment_errors)
+    if args.compress:
+        compress_sealed_segments(ledger)
+    _print_json({"ledger": str(ledger), "rotated": entry is not None, "segment": entry, "segments": len(read_manifest(ledger)["segments"])})
+    return 0
+
+
+def command_summarize(args: argparse.Namespace) -> int:
+    ledger = Path(args.ledger)
+    table = export_receipt_columns(ledger) if args.export else receipt_columns(ledger)
+    _print_json({"ledger": str(ledger), **summarize_receipts(table, args.by)})
+    return 0
+
+
+def command_sweep(args: argparse.Namespace) -> int:
+    ledger = Path(args.ledger)
+    table = load_receipt_rows(ledger, args.active_only)
+    _print_json({"ledger": str(ledger), **sweep(table, parse_grid(args.rho), parse_grid(args.delta), parse_grid(args.abort))})
+    return 0
+
+
+def command_index_build(args: argparse.Namespace) -> int:
+    ledger = Path(args.ledger)
+    summary = build_index(ledger)
+    ok, errors = verify_index(ledger)
+    _print_json({**summary, "ok": ok, "errors": errors})
+    return 0 if ok else 1
+
+
+def command_lookup(args: argparse.Namespace) -> int:
+    ledger = Path(args.ledger)
+    rows = [{"offset": offset, "record": record} for offset, record in query_index(ledger, args.field, args.value)]
+    _print_json({"ledger": str(ledger), "field": args.field, "value": args.value, "matches": rows})
+    return 0 if rows else 1
+
+
+def command_query(args: argparse.Namespace) -> int:
+    ledger = Path(args.ledger)
+    matches = query_index(ledger, args.field, args.value, args.since, args.until, args.limit)
+    if args.ndjson:
+        for offset, record in matches:
+            _print_ndjson({"offset": offset, "record": record})
+        return 0
+    rows = [{"offset": offset, "record": record} for offset, record in matches]
+    _print_json({"ledger": str(ledger), "count": len(rows), "matches": rows})
+    return 0
+
+
 def command_selftest(_: argparse.Namespace) -> int:
     proc = subprocess.run(
         [sys.executable, str(REPO_ROOT / ".codex" / "hooks" / "codex_echo_root_selftest.py")],
@@ -235,6 +321,24 @@ def command_prove(args: argparse.Namespace) -> int:
     return 0 if proof_ok else 1
 
 
+def command_follow(args: argparse.Namespace) -> int:
+    follower = LedgerFollower(
+        Path(args.ledger),
+        from_offset=0 if args.from_start else args.from_offset,
+        after_hash=args.after_hash,
+        check_row=row_check("receipt"),
+    )
+    try:
+        for event in follower.poll() if args.once else follower.follow(args.timeout):
+            _print_ndjson(event)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        follower.close()
+    _print_ndjson({"cursor": follower.cursor()})
+    return 0
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Echo Root VE CLI fallback adapter")
     parser.add_argument("--ledger", default=str(DEFAULT_LEDGER), help="Receipt ledger path for commands that write/read receipts.")
@@ -255,11 +359,62 @@ def build_parser() -> argparse.ArgumentParser:
     append.set_defaults(func=command_append_receipt)
 
     verify = sub.add_parser("verify-chain", help="Verify receipt hash-chain continuity.")
+    verify.add_argument("--workers", type=int, default=1, help="Verify across this many processes (0 = one per core).")
+    verify.add_argument("--ndjson", action="store_true", help="Stream one JSON line per error, then a summary line.")
+    verify.add_argument("--active-only", action="store_true", help="Trust sealed segments on the manifest instead of re-reading their rows.")
     verify.set_defaults(func=command_verify_chain)
 
     replay = sub.add_parser("replay", help="Replay receipt decisions from a ledger.")
+    replay.add_argument("--ndjson", action="store_true", help="Stream one JSON line per replayed receipt, then a summary line.")
+    replay.add_argument("--active-only", action="store_true", help="Replay only the active segment.")
+    replay.add_argument("--workers", type=int, default=1, help="Replay across this many processes (0 = one per core).")
+    replay.add_argument("--only-mismatches", action="store_true", help="Emit only receipts whose replayed decision differs.")
     replay.set_defaults(func=command_replay)
 
+    follow = sub.add_parser("follow", help="Stream newly appended receipts as verified NDJSON events.")
+    follow_start = follow.add_mutually_exclusive_group()
+    follow_start.add_argument("--from-start", action="store_true", help="Begin at the first row of the active segment.")
+    follow_start.add_argument("--from-offset", type=int, help="Begin at this byte offset of the active segment.")
+    follow.add_argument("--after-hash", help="Begin after the receipt with this hash_self (checked against --from-offset).")
+    follow.add_argument("--once", action="store_true", help="Print what is there now and exit instead of following.")
+    follow.add_argument("--timeout", type=float, help="Stop following after this many seconds.")
+    follow.set_defaults(func=command_follow)
+
+    rotate = sub.add_parser("rotate", help="Seal the active ledger segment and start a new one.")
+    rotate.add_argument("--max-bytes", type=int, help="Rotate only if the active segment is at least this large.")
+    rotate.add_argument("--max-age-hours", type=float, help="Rotate only if the active segment is at least this old.")
+    rotate.add_argument("--compress", action="store_true", help="Compress sealed segments into XZ block archives.")
+    rotate.set_defaults(func=command_rotate)
+
+    summarize = sub.add_parser("summarize", help="Aggregate receipts by a column from the columnar export.")
+    summarize.add_argument("--by", default="decision", choices=[name for name, kind, _ in RECEIPT_COLUMNS if kind == "str"])
+    summarize.add_argument("--export", action="store_true", help="Rebuild the columnar export before summarizing.")
+    summarize.set_defaults(func=command_summarize)
+
+    sweep_parser = sub.add_parser("sweep", help="Report how receipt decisions would shift across a grid of gate thresholds.")
+    sweep_parser.add_argument("--rho", default="0.70", help='PROCEED rho grid as "start:stop:step" or "a,b,c".')
+    sweep_parser.add_argument("--delta", default="0.30", help="PROCEED delta grid.")
+    sweep_parser.add_argument("--abort", default="0.40", help="ABORT delta grid.")
+    sweep_parser.add_argument("--active-only", action="store_true", help="Sweep only the active segment.")
+    sweep_parser.set_defaults(func=command_sweep)
+
+    index_build = sub.add_parser("index-build", help="Rebuild and verify the ledger's secondary index sidecar.")
+    index_build.set_defaults(func=command_index_build)
+
+    lookup = sub.add_parser("lookup", help="Find ledger rows by an indexed key.")
+    lookup.add_argument("field", choices=QUERY_FIELDS)
+    lookup.add_argument("value")
+    lookup.set_defaults(func=command_lookup)
+
+    query = sub.add_parser("query", help="Range-query ledger rows by indexed key and timestamp.")
+    query.add_argument("--field", choices=QUERY_FIELDS)
+    query.add_argument("--value")
+    query.add_argument("--since", help="Inclusive ISO-8601 lower timestamp bound.")
+    query.add_argument("--until", help="Exclusive ISO-8601 upper timestamp bound.")
+    query.add_argument("--limit", type=int)
+    query.add_argument("--ndjson", action="store_true", help="Stream one JSON line per matching row.")
+    query.set_defaults(func=command_query)
+
     selftest = sub.add_parser("selftest", help="Run the Codex/Echo Root hook workflow self-test.")
     selftest.set_defaults(func=command_selftest)
 
@@ -2,12 +2,36 @@ from __future__ import annotations
 
 import argparse
 import hashlib
+import io
 import json
+import os
 import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Iterator, NamedTuple, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # Optional: gate_decisions_batch falls back to a pure-Python loop.
+    np = None
+
+from ve_gate_rules import Rule, RuleSet
+from ve_ledger_io import (
+    append_records,
+    chain_origin,
+    file_identity,
+    ledger_lock,
+    ledger_writer,
+    read_manifest,
+    rotation_policy_from_env,
+    tail_hash,
+)
+from ve_ledger_segments import iter_ledger_records, rotate_if_due, stored_segment_path, verify_segments
+from ve_segment_archive import read_block_index, read_blocks
 
 
 ZERO_HASH = "0" * 64
@@ -46,6 +70,9 @@ class GateConfig:
     dry_run_required: bool = True
     destructive_actions_allowed: bool = False
     recursive_generation_allowed: bool = False
+    proceed_rho: float = 0.70
+    proceed_delta: float = 0.30
+    abort_delta: float = 0.40
 
 
 def canonicalize_receipt(receipt: dict[str, Any]) -> str:
@@ -87,71 +114,337 @@ def validate_schema(receipt: dict[str, Any]) -> list[str]:
     return errors
 
 
-def _last_hash(path: Path) -> str:
-    if not path.exists():
-        return ZERO_HASH
-    rows = [line for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
-    if not rows:
-        return ZERO_HASH
-    return json.loads(rows[-1]).get("hash_self", ZERO_HASH)
+@lru_cache(maxsize=65536)
+def _parent(item: str) -> str:
+    return str(Path(item).parent)
 
 
 def _touch_stats(files_touched: list[str]) -> tuple[int, int]:
-    folders = {str(Path(item).parent) for item in files_touched if str(Path(item).parent) not in {"", "."}}
+    folders = {parent for parent in map(_parent, files_touched) if parent not in {"", "."}}
     return len(files_touched), len(folders)
 
 
+def _request_touch(request: dict[str, Any]) -> tuple[int, int]:
+    return _touch_stats([str(item) for item in request.get("files_touched", [])])
+
+
+RECEIPT_GATE_RULES = RuleSet(
+    "receipt",
+    [
+        Rule("SAFE_MODE", "receipt chain broken", "not chain_valid"),
+        Rule("SAFE_MODE", "policy missing", "not policy_present"),
+        Rule("SAFE_MODE", "unsafe fallback", "fallback_status in {'unsafe', 'unverified'}"),
+        Rule("SAFE_MODE", "repeated failed checks", "int(source.get('failed_checks', 0)) >= 3"),
+        Rule("ABORT", "forbidden action", "bool(source.get('forbidden_action', False))"),
+        Rule(
+            "ABORT",
+            "destructive action without L3 approval",
+            "('delete' in action or 'destructive' in action_lane) and not config.destructive_actions_allowed",
+        ),
+        Rule("ABORT", "identity/scope conflict", "bool(source.get('identity_scope_conflict', False))"),
+        Rule("ABORT", "delta above abort threshold", "float(source.get('delta', 0.0)) > config.abort_delta"),
+        Rule("PAUSE", "missing scope", "not consent"),
+        Rule("PAUSE", "route fallback occurred", "fallback_status not in {'', 'none', 'ok'}"),
+        Rule("PAUSE", "context limit exceeded", "bool(source.get('context_limit_exceeded', False))"),
+        Rule("PAUSE", "confidence medium/unclear", "str(source.get('confidence', '')).lower() in {'medium', 'unclear'}"),
+        Rule(
+            "PAUSE",
+            "write budget exceeded",
+            "touch[0] > config.max_files_touched_per_run or files_created > config.max_files_created_per_run"
+            " or touch[1] > config.max_folders_touched_per_run",
+        ),
+        Rule("PAUSE", "empty folder / no evidence", "bool(source.get('empty_folder', False))"),
+        Rule("PAUSE", "dry_run_required", "config.dry_run_required and not bool(source.get('dry_run', False))"),
+        Rule(
+            "PAUSE",
+            "recursive generation blocked by default",
+            "not config.recursive_generation_allowed and bool(source.get('recursive_generation', False))",
+        ),
+        Rule(
+            "PROCEED",
+            "consent scope present, confidence threshold met, drift within threshold",
+            "consent and float(source.get('rho', 0.0)) >= config.proceed_rho and float(source.get('delta', 1.0)) <= config.proceed_delta",
+        ),
+    ],
+    default=Rule("PAUSE", "confidence below proceed threshold", "True"),
+    # counts is (file count, folder count) when the caller already has it, as batch rows do.
+    context={"config": None, "chain_valid": True, "policy_present": True, "counts": None},
+    derive={
+        "action": "str(source.get('requested_action', '')).lower()",
+        "action_lane": "str(source.get('action_lane', '')).lower()",
+        "fallback_status": "str(source.get('fallback_status', 'none')).lower()",
+        "consent": "bool(source.get('consent_scope_present', False))",
+        "files_created": "int(source.get('files_created', 0))",
+        "touch": "counts if counts is not None else _request_touch(source)",
+    },
+    names={"_request_touch": _request_touch},
+)
+
+
 def gate_decision(request: dict[str, Any], config: GateConfig | None = None, chain_valid: bool = True, policy_present: bool = True) -> tuple[str, list[str]]:
+    return RECEIPT_GATE_RULES.decide(request, config=config or GateConfig(), chain_valid=chain_valid, policy_present=policy_present)
+
+
+DECISION_CODES = ("PROCEED", "PAUSE", "ABORT", "SAFE_MODE")
+# Bit i of a batch reason mask is GATE_REASONS[i]; PAUSE reasons keep gate_decision's order.
+GATE_REASONS = (
+    "receipt chain broken",
+    "policy missing",
+    "unsafe fallback",
+    "repeated failed checks",
+    "forbidden action",
+    "destructive action without L3 approval",
+    "identity/scope conflict",
+    "delta above abort threshold",
+    "missing scope",
+    "route fallback occurred",
+    "context limit exceeded",
+    "confidence medium/unclear",
+    "write budget exceeded",
+    "empty folder / no evidence",
+    "dry_run_required",
+    "recursive generation blocked by default",
+    "consent scope present, confidence threshold met, drift within threshold",
+    "confidence below proceed threshold",
+)
+_BIT = {reason: 1 << index for index, reason in enumerate(GATE_REASONS)}
+_BATCH_COLUMNS: tuple[tuple[str, Any], ...] = (
+    ("requested_action", ""),
+    ("action_lane", ""),
+    ("fallback_status", "none"),
+    ("files_created", 0),
+    ("failed_checks", 0),
+    ("forbidden_action", False),
+    ("identity_scope_conflict", False),
+    ("delta", float("nan")),
+    ("consent_scope_present", False),
+    ("context_limit_exceeded", False),
+    ("confidence", ""),
+    ("empty_folder", False),
+    ("dry_run", False),
+    ("recursive_generation", False),
+    ("rho", 0.0),
+    ("file_count", 0),
+    ("folder_count", 0),
+)
+
+
+class Categorical(NamedTuple):
+    """Dictionary-encoded column: row i holds values[codes[i]] (the ve_columnar string layout)."""
+
+    codes: Sequence[int]
+    values: Sequence[Any]
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def decoded(self) -> list[Any]:
+        return list(map(self.values.__getitem__, self.codes))
+
+
+def request_columns(requests: Iterable[dict[str, Any]]) -> dict[str, list[Any]]:
+    """Turn request dicts into the columns gate_decisions_batch takes.
+
+    files_touched becomes file_count/folder_count. A missing delta becomes NaN,
+    which fails both delta comparisons exactly like gate_decision's 0.0 abort
+    default and 1.0 proceed default.
+    """
+    columns: dict[str, list[Any]] = {name: [] for name, _ in _BATCH_COLUMNS}
+    for request in requests:
+        file_count, folder_count = _touch_stats([str(item) for item in request.get("files_touched", [])])
+        for name, default in _BATCH_COLUMNS:
+            if name == "file_count":
+                columns[name].append(file_count)
+            elif name == "folder_count":
+                columns[name].append(folder_count)
+            else:
+                columns[name].append(request.get(name, default))
+    return columns
+
+
+def _encode(decision: str, reasons: list[str]) -> tuple[int, int]:
+    mask = 0
+    for reason in reasons:
+        mask |= _BIT[reason]
+    return DECISION_CODES.index(decision), mask
+
+
+def _batch_python(n: int, columns: list[Sequence[Any]], config: GateConfig) -> tuple[list[int], list[int]]:
+    """Evaluate each distinct input row once through the scalar rules and reuse the result."""
+    names = [name for name, _ in _BATCH_COLUMNS]
+    cache: dict[tuple[Any, ...], tuple[int, int]] = {}
+    decisions: list[int] = []
+    masks: list[int] = []
+    for row in zip(*columns):
+        result = cache.get(row)
+        if result is None:
+            request = dict(zip(names, row))
+            counts = (request["file_count"], request["folder_count"])
+            result = cache[row] = _encode(*RECEIPT_GATE_RULES.decide(request, config=config, counts=counts))
+        decisions.append(result[0])
+        masks.append(result[1])
+    return decisions, masks
+
+
+class _Derived(dict):
+    """Memo that computes derive(value) the first time each distinct value is seen."""
+
+    def __init__(self, derive: Any) -> None:
+        super().__init__()
+        self.derive = derive
+
+    def __missing__(self, value: Any) -> Any:
+        result = self[value] = self.derive(value)
+        return result
+
+
+def _per_distinct(values: Sequence[Any], derive: Any) -> Any:
+    """Apply derive once per distinct value and return the results as a NumPy int array."""
+    if isinstance(values, Categorical):
+        derived = np.fromiter(map(derive, values.values), dtype=np.int64, count=len(values.values))
+        return derived[np.asarray(values.codes, dtype=np.int64)]
+    if isinstance(values, np.ndarray):
+        values = values.tolist()
+    return np.fromiter(map(_Derived(derive).__getitem__, values), dtype=np.int64, count=len(values))
+
+
+def _fallback_kind(value: Any) -> int:
+    lowered = str(value).lower()
+    if lowered in {"unsafe", "unverified"}:
+        return 2
+    return 0 if lowered in {"", "none", "ok"} else 1
+
+
+def _batch_numpy(n: int, columns: list[Sequence[Any]], config: GateConfig) -> tuple[Any, Any]:
+    """Vectorized twin of RECEIPT_GATE_RULES: the same checks in the same tier order, as array masks."""
+    c = dict(zip((name for name, _ in _BATCH_COLUMNS), columns))
+
+    def numeric(name: str, kinds: str) -> bool:
+        return isinstance(c[name], np.ndarray) and c[name].dtype.kind in kinds
+
+    def floats(name: str) -> Any:
+        if numeric(name, "biuf"):
+            return c[name].astype(np.float64)
+        return np.fromiter(map(float, c[name]), dtype=np.float64, count=n)
+
+    def ints(name: str) -> Any:
+        if numeric(name, "biu"):
+            return c[name].astype(np.int64)
+        return np.fromiter(map(int, c[name]), dtype=np.int64, count=n)
+
+    def flags(name: str) -> Any:
+        if numeric(name, "biuf"):
+            return c[name].astype(bool)
+        return np.fromiter(map(bool, c[name]), dtype=bool, count=n)
+
+    created = ints("files_created")
+    action = _per_distinct(c["requested_action"], lambda value: "delete" in str(value).lower()).astype(bool)
+    lane = _per_distinct(c["action_lane"], lambda value: "destructive" in str(value).lower()).astype(bool)
+    fallback = _per_distinct(c["fallback_status"], _fallback_kind)
+    decisions = np.full(n, DECISION_CODES.index("PAUSE"), dtype=np.int8)
+    masks = np.zeros(n, dtype=np.int64)
+    open_rows = np.ones(n, dtype=bool)
+
+    def settle(condition: Any, decision: str, reason: str) -> None:
+        hit = open_rows & condition
+        decisions[hit] = DECISION_CODES.index(decision)
+        masks[hit] = _BIT[reason]
+        open_rows[hit] = False
+
+    delta = floats("delta")
+    settle(fallback == 2, "SAFE_MODE", "unsafe fallback")
+    settle(ints("failed_checks") >= 3, "SAFE_MODE", "repeated failed checks")
+    settle(flags("forbidden_action"), "ABORT", "forbidden action")
+    settle((action | lane) & (not config.destructive_actions_allowed), "ABORT", "destructive action without L3 approval")
+    settle(flags("identity_scope_conflict"), "ABORT", "identity/scope conflict")
+    settle(delta > config.abort_delta, "ABORT", "delta above abort threshold")
+    consent = flags("consent_scope_present")
+    checks = (
+        ("missing scope", ~consent),
+        ("route fallback occurred", fallback == 1),
+        ("context limit exceeded", flags("context_limit_exceeded")),
+        ("confidence medium/unclear", _per_distinct(c["confidence"], lambda value: str(value).lower() in {"medium", "unclear"}).astype(bool)),
+        (
+            "write budget exceeded",
+            (ints("file_count") > config.max_files_touched_per_run)
+            | (created > config.max_files_created_per_run)
+            | (ints("folder_count") > config.max_folders_touched_per_run),
+        ),
+        ("empty folder / no evidence", flags("empty_folder")),
+        ("dry_run_required", ~flags("dry_run") & config.dry_run_required),
+        ("recursive generation blocked by default", flags("recursive_generation") & (not config.recursive_generation_allowed)),
+    )
+    pause = np.zeros(n, dtype=np.int64)
+    for reason, condition in checks:
+        pause |= np.where(condition, _BIT[reason], 0)
+    paused = open_rows & (pause != 0)
+    masks[paused] = pause[paused]
+    open_rows &= ~paused
+    settle(consent & (floats("rho") >= config.proceed_rho) & (delta <= config.proceed_delta), "PROCEED", "consent scope present, confidence threshold met, drift within threshold")
+    masks[open_rows] = _BIT["confidence below proceed threshold"]
+    return decisions, masks
+
+
+def gate_decisions_batch(
+    columns: dict[str, Sequence[Any]],
+    config: GateConfig | None = None,
+    chain_valid: bool = True,
+    policy_present: bool = True,
+) -> tuple[Sequence[int], Sequence[int]]:
+    """Evaluate many gate requests at once from columnar inputs.
+
+    columns maps request keys (rho, delta, consent_scope_present, action_lane,
+    ...) plus file_count/folder_count to equal-length sequences, NumPy arrays,
+    or Categorical string columns; a missing column means the key is absent
+    from every request. Returns decision codes (indexes into DECISION_CODES)
+    and reason bitmasks over GATE_REASONS, as NumPy arrays when NumPy is
+    installed. decode_gate_batch turns them back into exactly what
+    gate_decision returns for each row.
+    """
     config = config or GateConfig()
-    reasons: list[str] = []
-    files_touched = [str(item) for item in request.get("files_touched", [])]
-    file_count, folder_count = _touch_stats(files_touched)
-    created_count = int(request.get("files_created", 0))
-    action = str(request.get("requested_action", "")).lower()
-    action_lane = str(request.get("action_lane", "")).lower()
-    fallback_status = str(request.get("fallback_status", "none")).lower()
-
-    if not chain_valid:
-        return "SAFE_MODE", ["receipt chain broken"]
-    if not policy_present:
-        return "SAFE_MODE", ["policy missing"]
-    if fallback_status in {"unsafe", "unverified"}:
-        return "SAFE_MODE", ["unsafe fallback"]
-    if int(request.get("failed_checks", 0)) >= 3:
-        return "SAFE_MODE", ["repeated failed checks"]
-
-    if bool(request.get("forbidden_action", False)):
-        return "ABORT", ["forbidden action"]
-    if ("delete" in action or "destructive" in action_lane) and not config.destructive_actions_allowed:
-        return "ABORT", ["destructive action without L3 approval"]
-    if bool(request.get("identity_scope_conflict", False)):
-        return "ABORT", ["identity/scope conflict"]
-    if float(request.get("delta", 0.0)) > 0.40:
-        return "ABORT", ["delta above abort threshold"]
-
-    if not bool(request.get("consent_scope_present", False)):
-        reasons.append("missing scope")
-    if fallback_status not in {"", "none", "ok"}:
-        reasons.append("route fallback occurred")
-    if bool(request.get("context_limit_exceeded", False)):
-        reasons.append("context limit exceeded")
-    confidence = str(request.get("confidence", "")).lower()
-    if confidence in {"medium", "unclear"}:
-        reasons.append("confidence medium/unclear")
-    if file_count > config.max_files_touched_per_run or created_count > config.max_files_created_per_run or folder_count > config.max_folders_touched_per_run:
-        reasons.append("write budget exceeded")
-    if bool(request.get("empty_folder", False)):
-        reasons.append("empty folder / no evidence")
-    if config.dry_run_required and not bool(request.get("dry_run", False)):
-        reasons.append("dry_run_required")
-    if not config.recursive_generation_allowed and bool(request.get("recursive_generation", False)):
-        reasons.append("recursive generation blocked by default")
-
-    if reasons:
-        return "PAUSE", reasons
-    if bool(request.get("consent_scope_present", False)) and float(request.get("rho", 0.0)) >= 0.70 and float(request.get("delta", 1.0)) <= 0.30:
-        return "PROCEED", ["consent scope present, confidence threshold met, drift within threshold"]
-    return "PAUSE", ["confidence below proceed threshold"]
+    lengths = {len(values) for values in columns.values()}
+    if len(lengths) > 1:
+        raise ValueError("gate_decisions_batch columns must all have the same length")
+    n = lengths.pop() if lengths else 0
+    ordered = [columns[name] if name in columns else [default] * n for name, default in _BATCH_COLUMNS]
+    if np is None or not n:
+        ordered = [values.decoded() if isinstance(values, Categorical) else values for values in ordered]
+    if not chain_valid or not policy_present:
+        decision, mask = _encode("SAFE_MODE", ["receipt chain broken" if not chain_valid else "policy missing"])
+        decisions, masks = [decision] * n, [mask] * n
+    elif np is not None and n:
+        return _batch_numpy(n, ordered, config)
+    else:
+        decisions, masks = _batch_python(n, ordered, config)
+    if np is not None:
+        return np.asarray(decisions, dtype=np.int8), np.asarray(masks, dtype=np.int64)
+    return decisions, masks
+
+
+def gate_decisions(
+    requests: Sequence[dict[str, Any]], config: GateConfig | None = None, chain_valid: bool = True, policy_present: bool = True
+) -> list[tuple[str, list[str]]]:
+    """gate_decision for each request, through the vectorized batch when NumPy is installed.
+
+    Without NumPy, building columns costs more than the pure-Python batch
+    saves, so each request goes straight through gate_decision.
+    """
+    if np is None:
+        config = config or GateConfig()
+        return [gate_decision(request, config, chain_valid, policy_present) for request in requests]
+    return decode_gate_batch(*gate_decisions_batch(request_columns(requests), config, chain_valid, policy_present))
+
+
+def decode_gate_batch(decisions: Sequence[int], masks: Sequence[int]) -> list[tuple[str, list[str]]]:
+    """Expand batch codes into the (decision, reasons) pairs gate_decision returns."""
+    decoded: dict[int, list[str]] = {}
+    out = []
+    for decision, mask in zip(decisions, masks):
+        mask = int(mask)
+        if mask not in decoded:
+            decoded[mask] = [reason for reason, bit in _BIT.items() if mask & bit]
+        out.append((DECISION_CODES[int(decision)], list(decoded[mask])))
+    return out
 
 
 def build_receipt(request: dict[str, Any], decision: str, reason: list[str], hash_prev: str) -> dict[str, Any]:
@@ -202,40 +495,262 @@ def build_receipt(request: dict[str, Any], decision: str, reason: list[str], has
 def append_receipt(path: Path, request: dict[str, Any], config: GateConfig | None = None, chain_valid: bool = True, policy_present: bool = True) -> dict[str, Any]:
     path.parent.mkdir(parents=True, exist_ok=True)
     decision, reason = gate_decision(request, config=config, chain_valid=chain_valid, policy_present=policy_present)
-    receipt = build_receipt(request, decision, reason, _last_hash(path))
-    errors = validate_schema(receipt)
-    if errors:
-        raise ValueError("; ".join(errors))
-    with path.open("a", encoding="utf-8") as handle:
-        handle.write(json.dumps(receipt, sort_keys=True) + "\n")
-    return receipt
 
+    def build(hash_prev: str) -> dict[str, Any]:
+        receipt = build_receipt(request, decision, reason, hash_prev)
+        errors = validate_schema(receipt)
+        if errors:
+            raise ValueError("; ".join(errors))
+        return receipt
 
-def verify_chain(path: Path) -> tuple[bool, list[str]]:
-    errors: list[str] = []
-    expected_prev = ZERO_HASH
-    if not path.exists():
-        return True, []
-    with path.open("r", encoding="utf-8") as handle:
-        for line_number, line in enumerate(handle, 1):
-            if not line.strip():
-                continue
-            try:
-                receipt = json.loads(line)
-            except json.JSONDecodeError as exc:
-                errors.append(f"line {line_number}: invalid JSON: {exc}")
-                continue
-            if receipt.get("hash_prev") != expected_prev:
-                errors.append(f"line {line_number}: hash_prev mismatch")
-            schema_errors = validate_schema(receipt)
-            errors.extend(f"line {line_number}: {item}" for item in schema_errors)
-            expected_prev = receipt.get("hash_self", ZERO_HASH)
-    return not errors, errors
+    return ledger_writer(path, receipt_segment_errors).append(build)
 
 
-def replay_receipt(receipt: dict[str, Any]) -> dict[str, Any]:
+def append_receipts(
+    path: Path, requests: Iterable[dict[str, Any]], config: GateConfig | None = None, chain_valid: bool = True, policy_present: bool = True
+) -> list[dict[str, Any]]:
+    """Gate many requests in one pass and append them as one contiguous chained block.
+
+    Every receipt is built and schema-checked before anything is written, so a
+    bad request appends nothing. The block is written under one ledger lock
+    with a single write and fsync.
+    """
+    requests = list(requests)
+    if not requests:
+        return []
+    path.parent.mkdir(parents=True, exist_ok=True)
+    decided = gate_decisions(requests, config, chain_valid, policy_present)
+    with ledger_lock(path):
+        rotation = rotation_policy_from_env()
+        if rotation is not None:
+            rotate_if_due(path, rotation, receipt_segment_errors)
+        hash_prev = tail_hash(path)
+        receipts = []
+        for index, (request, (decision, reason)) in enumerate(zip(requests, decided)):
+            receipt = build_receipt(request, decision, reason, hash_prev)
+            errors = validate_schema(receipt)
+            if errors:
+                raise ValueError(f"request {index}: " + "; ".join(errors))
+            receipts.append(receipt)
+            hash_prev = receipt["hash_self"]
+        append_records(path, receipts, fsync=True)
+    return receipts
+
+
+PARALLEL_VERIFY_MIN_BYTES = 8 * 1024 * 1024
+
+
+def _check_rows(rows: Iterable[str], expected_prev: str | None) -> tuple[list[tuple[int, str]], tuple[int, int, Any] | None, str | None, int]:
+    """Check hash linkage and schema row by row.
+
+    Returns (line-numbered errors, deferred link, last hash_self, line count).
+    When expected_prev is None the first receipt's hash_prev cannot be judged
+    yet, so it is returned as (error index, line number, hash_prev) for the
+    caller to stitch against the preceding chunk.
+    """
+    errors: list[tuple[int, str]] = []
+    deferred: tuple[int, int, Any] | None = None
+    line_count = 0
+    for line_number, line in enumerate(rows, 1):
+        line_count = line_number
+        if not line.strip():
+            continue
+        try:
+            receipt = json.loads(line)
+        except json.JSONDecodeError as exc:
+            errors.append((line_number, f"invalid JSON: {exc}"))
+            continue
+        if expected_prev is None and deferred is None:
+            deferred = (len(errors), line_number, receipt.get("hash_prev"))
+        elif receipt.get("hash_prev") != expected_prev:
+            errors.append((line_number, "hash_prev mismatch"))
+        errors.extend((line_number, item) for item in validate_schema(receipt))
+        expected_prev = receipt.get("hash_self", ZERO_HASH)
+    return errors, deferred, expected_prev, line_count
+
+
+def receipt_segment_errors(path: Path, origin: str) -> list[str]:
+    """Check every receipt of one segment from origin; the row verifier used before sealing."""
+    with path.open("r", encoding="utf-8") as handle:
+        errors, _, _, _ = _check_rows(handle, origin)
+    return [f"line {line_number}: {message}" for line_number, message in errors]
+
+
+def verify_chain(path: Path, active_only: bool = False) -> tuple[bool, list[str]]:
+    """Verify every receipt of every segment, then the active segment from its chain origin.
+
+    active_only re-checks only the active segment's rows; sealed segments are
+    then checked through the manifest linkage, size and sha256.
+    """
+    formatted = verify_segments(path, None if active_only else receipt_segment_errors)
+    if path.exists():
+        formatted.extend(receipt_segment_errors(path, chain_origin(path)))
+    return not formatted, formatted
+
+
+def _chunk_ranges(path: Path, chunks: int) -> list[tuple[int, int]]:
+    size = path.stat().st_size
+    step = max(1, size // chunks)
+    ranges: list[tuple[int, int]] = []
+    start = 0
+    with path.open("rb") as handle:
+        while start < size:
+            end = size
+            if start + step < size:
+                handle.seek(start + step)
+                handle.readline()
+                end = handle.tell()
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def _verify_range(path: str, start: int, end: int) -> tuple[list[tuple[int, str]], tuple[int, int, Any] | None, str | None, int]:
+    with open(path, "rb") as handle:
+        handle.seek(start)
+        text = handle.read(end - start).decode("utf-8")
+    return _check_rows(io.StringIO(text, newline=None), None)
+
+
+def verify_chain_parallel(path: Path, workers: int | None = None, active_only: bool = False) -> tuple[bool, list[str]]:
+    """Verify a receipt chain across a process pool with the same errors as verify_chain.
+
+    The ledger is split into newline-aligned byte ranges. Each worker hashes
+    and schema-checks its rows and checks linkage inside its range; only the
+    first receipt of each range is linked to the previous range here.
+    """
+    workers = workers or os.cpu_count() or 1
+    if not path.exists() or workers <= 1 or path.stat().st_size < PARALLEL_VERIFY_MIN_BYTES:
+        return verify_chain(path, active_only)
+    ranges = _chunk_ranges(path, workers * 4)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(_verify_range, [str(path)] * len(ranges), [start for start, _ in ranges], [end for _, end in ranges]))
+    formatted = verify_segments(path, None if active_only else receipt_segment_errors)
+    expected_prev = chain_origin(path)
+    line_base = 0
+    for errors, deferred, last_hash, line_count in results:
+        if deferred is not None:
+            index, line_number, hash_prev = deferred
+            if hash_prev != expected_prev:
+                errors.insert(index, (line_number, "hash_prev mismatch"))
+        formatted.extend(f"line {line_base + line_number}: {message}" for line_number, message in errors)
+        if deferred is not None:
+            expected_prev = last_hash
+        line_base += line_count
+    return not formatted, formatted
+
+
+VERIFIED_HEAD_FORMAT = "echo-root-verified-head-v1"
+
+
+def verified_head_path(path: Path) -> Path:
+    return path.with_name(path.name + ".verified.json")
+
+
+def _write_verified_head(path: Path, state: dict[str, Any]) -> None:
+    target = verified_head_path(path)
+    temp = target.with_name(target.name + ".tmp")
+    temp.write_text(json.dumps(state, sort_keys=True), encoding="utf-8")
+    os.replace(temp, target)
+
+
+def _verified_active_state(path: Path, origin: str) -> dict[str, Any]:
+    """Return the active segment's verification state, re-reading it only when the verified head no longer matches."""
+    identity = file_identity(path)
+    try:
+        recorded = json.loads(verified_head_path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        recorded = None
+    if (
+        isinstance(recorded, dict)
+        and recorded.get("format") == VERIFIED_HEAD_FORMAT
+        and recorded.get("identity") == identity
+        and recorded.get("origin") == origin
+    ):
+        return recorded
+    state = {"format": VERIFIED_HEAD_FORMAT, "identity": identity, "origin": origin, "lines": 0, "last_hash": origin, "errors": []}
+    if identity is not None:
+        with path.open("r", encoding="utf-8") as handle:
+            errors, _, last_hash, lines = _check_rows(handle, origin)
+        state.update(errors=[list(item) for item in errors], last_hash=last_hash, lines=lines)
+    return state
+
+
+def _advance_verified_state(path: Path, state: dict[str, Any], before: list[int] | None) -> None:
+    """Check only the bytes appended since state was taken and record the new verified head.
+
+    The head is dropped instead when the ledger changed under us or the
+    verified prefix did not end on a line break, since the new rows would not
+    start a line of their own.
+    """
+    identity = file_identity(path)
+    start = before[2] if before is not None else 0
+    if identity is None or before != state["identity"]:
+        verified_head_path(path).unlink(missing_ok=True)
+        return
+    with path.open("rb") as handle:
+        handle.seek(max(start - 1, 0))
+        data = handle.read(identity[2] - max(start - 1, 0))
+    if start:
+        boundary, data = data[:1], data[1:]
+        if boundary != b"\n":
+            verified_head_path(path).unlink(missing_ok=True)
+            return
+    text = data.decode("utf-8")
+    if not text.endswith("\n"):
+        verified_head_path(path).unlink(missing_ok=True)
+        return
+    errors, _, last_hash, lines = _check_rows(io.StringIO(text, newline=None), state["last_hash"])
+    _write_verified_head(
+        path,
+        dict(
+            state,
+            identity=identity,
+            lines=state["lines"] + lines,
+            last_hash=last_hash,
+            errors=state["errors"] + [[state["lines"] + line_number, message] for line_number, message in errors],
+        ),
+    )
+
+
+def append_receipt_verified(
+    path: Path, request: dict[str, Any], config: GateConfig | None = None, policy_present: bool = True
+) -> tuple[dict[str, Any], bool, list[str]]:
+    """Verify the chain and append a receipt gated on the result, under one ledger lock.
+
+    Returns (receipt, chain_valid, errors) where chain_valid and errors are
+    exactly what verify_chain(path, active_only=True) reported before the append. <ledger>.verified.json
+    records the active segment's file identity (device, inode, size, mtime and
+    ctime) after our last append together with its line count, last hash and
+    errors. While the ledger still carries that identity, only the new row is
+    read; any other writer, rotation or in-place edit changes the identity and
+    falls back to a full verify of the active segment.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with ledger_lock(path):
+        state = _verified_active_state(path, chain_origin(path))
+        formatted = verify_segments(path, None)
+        formatted.extend(f"line {line_number}: {message}" for line_number, message in state["errors"])
+        chain_valid = not formatted
+        rotation = rotation_policy_from_env()
+        # A broken chain stays in the active segment: sealing would refuse it anyway.
+        if rotation is not None and chain_valid and rotate_if_due(path, rotation, receipt_segment_errors) is not None:
+            state = _verified_active_state(path, chain_origin(path))
+        decision, reason = gate_decision(request, config=config, chain_valid=chain_valid, policy_present=policy_present)
+        receipt = build_receipt(request, decision, reason, tail_hash(path))
+        errors = validate_schema(receipt)
+        if errors:
+            raise ValueError("; ".join(errors))
+        before = file_identity(path)
+        append_records(path, [receipt], fsync=True)
+        _advance_verified_state(path, state, before)
+    return receipt, chain_valid, formatted
+
+
+def replay_request(receipt: dict[str, Any]) -> dict[str, Any]:
+    """Rebuild the gate request a receipt was decided from."""
     gate_inputs = dict(receipt.get("gate_inputs", {}))
-    replay_request = {
+    request = {
         "requested_action": receipt.get("requested_action", ""),
         "action_lane": receipt.get("action_lane", ""),
         "consent_scope_present": receipt.get("consent_scope_present", False),
@@ -245,8 +760,12 @@ def replay_receipt(receipt: dict[str, Any]) -> dict[str, Any]:
         "fallback_status": receipt.get("fallback_status", "none"),
         "dry_run": True,
     }
-    replay_request.update(gate_inputs)
-    decision, reason = gate_decision(replay_request)
+    request.update(gate_inputs)
+    return request
+
+
+def replay_receipt(receipt: dict[str, Any]) -> dict[str, Any]:
+    decision, reason = gate_decision(replay_request(receipt))
     return {
         "receipt_id": receipt.get("receipt_id", ""),
         "original_decision": receipt.get("decision", ""),
@@ -256,14 +775,132 @@ def replay_receipt(receipt: dict[str, Any]) -> dict[str, Any]:
     }
 
 
+REPLAY_FIELDS = (
+    "receipt_id",
+    "decision",
+    "requested_action",
+    "action_lane",
+    "consent_scope_present",
+    "rho",
+    "delta",
+    "files_touched",
+    "fallback_status",
+    "gate_inputs",
+)
+
+
+def replay_ledger(path: Path, active_only: bool = False) -> Iterator[dict[str, Any]]:
+    """Stream replay results in ledger order without holding the ledger in memory.
+
+    Sealed segments are replayed first, oldest first, unless active_only.
+    """
+    for receipt in iter_ledger_records(path, REPLAY_FIELDS, active_only):
+        yield replay_receipt(receipt)
+
+
+PARALLEL_REPLAY_MIN_BYTES = 4 * 1024 * 1024
+REPLAY_CHUNK_BYTES = 1024 * 1024
+
+# One replay work unit: (stored file, start, end, archive blocks or None).
+ReplayUnit = tuple[str, int, int, list[dict[str, Any]] | None]
+
+
+def _replay_units(path: Path, active_only: bool, target_bytes: int) -> list[ReplayUnit]:
+    """Cut the ledger into units of about target_bytes, oldest first.
+
+    JSONL segments split into newline-aligned byte ranges; compressed segments
+    split into runs of whole XZ blocks, so each worker decompresses its own.
+    """
+    units: list[ReplayUnit] = []
+    entries = [] if active_only else read_manifest(path)["segments"]
+    for entry in entries:
+        stored = stored_segment_path(path, entry)
+        if "archive" not in entry:
+            units.extend((str(stored), start, end, None) for start, end in _chunk_ranges(stored, max(1, stored.stat().st_size // target_bytes)))
+            continue
+        run: list[dict[str, Any]] = []
+        for block in read_block_index(stored)["blocks"]:
+            run.append(block)
+            if sum(item["raw_bytes"] for item in run) >= target_bytes:
+                units.append((str(stored), 0, 0, run))
+                run = []
+        if run:
+            units.append((str(stored), 0, 0, run))
+    if path.exists():
+        units.extend((str(path), start, end, None) for start, end in _chunk_ranges(path, max(1, path.stat().st_size // target_bytes)))
+    return units
+
+
+def _replay_unit(path: str, start: int, end: int, blocks: list[dict[str, Any]] | None, only_mismatches: bool) -> list[dict[str, Any]]:
+    if blocks is not None:
+        lines: Iterable[bytes] = (line for raw in read_blocks(Path(path), blocks) for line in io.BytesIO(raw))
+    else:
+        with open(path, "rb") as handle:
+            handle.seek(start)
+            lines = io.BytesIO(handle.read(end - start))
+    rows = []
+    for line in lines:
+        if line.strip():
+            row = replay_receipt(json.loads(line))
+            if not only_mismatches or not row["matches"]:
+                rows.append(row)
+    return rows
+
+
+def _unit_bytes(unit: ReplayUnit) -> int:
+    _, start, end, blocks = unit
+    return end - start if blocks is None else sum(block["raw_bytes"] for block in blocks)
+
+
+def replay_ledger_parallel(
+    path: Path,
+    workers: int | None = None,
+    active_only: bool = False,
+    only_mismatches: bool = False,
+) -> Iterator[dict[str, Any]]:
+    """Replay across a process pool, yielding the same rows as replay_ledger in ledger order.
+
+    Each receipt's gate inputs are self-contained, so chunks replay
+    independently. At most two chunks per worker are in flight, and each
+    chunk's rows are yielded as soon as every earlier chunk has been, so
+    mismatches stream while later chunks are still replaying. With
+    only_mismatches, matching rows are dropped inside the workers.
+    """
+    workers = workers or os.cpu_count() or 1
+    units = _replay_units(path, active_only, REPLAY_CHUNK_BYTES)
+    if workers <= 1 or sum(_unit_bytes(unit) for unit in units) < PARALLEL_REPLAY_MIN_BYTES:
+        for row in replay_ledger(path, active_only):
+            if not only_mismatches or not row["matches"]:
+                yield row
+        return
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        pending: deque[Any] = deque()
+        for unit in units:
+            pending.append(pool.submit(_replay_unit, *unit, only_mismatches))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Echo Root VE receipt gate and replay")
     parser.add_argument("--ledger", default="receipts/demo_receipts.jsonl")
     sub = parser.add_subparsers(dest="command", required=True)
     demo = sub.add_parser("demo")
     demo.add_argument("--scenario", choices=["proceed", "pause", "abort"], default="proceed")
-    sub.add_parser("verify")
-    sub.add_parser("replay")
+    verify = sub.add_parser("verify")
+    verify.add_argument("--workers", type=int, default=1, help="Verify across this many processes (0 = one per core).")
+    verify.add_argument("--ndjson", action="store_true", help="Stream one JSON line per error, then a summary line.")
+    verify.add_argument("--active-only", action="store_true", help="Trust sealed segments on the manifest instead of re-reading their rows.")
+    replay = sub.add_parser("replay")
+    replay.add_argument("--ndjson", action="store_true", help="Stream one JSON line per replayed receipt.")
+    replay.add_argument("--active-only", action="store_true", help="Replay only the active segment.")
+    replay.add_argument("--workers", type=int, default=1, help="Replay across this many processes (0 = one per core).")
+    replay.add_argument("--only-mismatches", action="store_true", help="Emit only receipts whose replayed decision differs.")
     args = parser.parse_args()
     ledger = Path(args.ledger)
 
@@ -301,11 +938,20 @@ def main() -> int:
         print(json.dumps(append_receipt(ledger, scenarios[args.scenario]), indent=2))
         return 0
     if args.command == "verify":
-        ok, errors = verify_chain(ledger)
-        print(json.dumps({"ok": ok, "errors": errors}, indent=2))
+        ok, errors = verify_chain_parallel(ledger, args.workers or None, args.active_only)
+        if args.ndjson:
+            for error in errors:
+                print(json.dumps({"error": error}))
+            print(json.dumps({"ok": ok, "error_count": len(errors)}))
+        else:
+            print(json.dumps({"ok": ok, "errors": errors}, indent=2))
         return 0 if ok else 1
-    rows = [json.loads(line) for line in ledger.read_text(encoding="utf-8").splitlines() if line.strip()]
-    print(json.dumps([replay_receipt(item) for item in rows], indent=2))
+    rows = replay_ledger_parallel(ledger, args.workers or None, args.active_only, args.only_mismatches)
+    if args.ndjson:
+        for row in rows:
+            print(json.dumps(row, sort_keys=True), flush=True)
+        return 0
+    print(json.dumps(list(rows), indent=2))
     return 0
 
 
@@ -3,10 +3,16 @@ from __future__ import annotations
 import argparse
 import hashlib
 import json
+import os
+import threading
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
+
+from ve_fs_watch import DirectoryWatcher
 
 
 DEFAULT_EXCLUDES = {
@@ -29,34 +35,149 @@ class RepoMapEntry:
     size: int
 
 
-def should_exclude(path: Path, root: Path, excludes: set[str]) -> bool:
-    relative_parts = path.relative_to(root).parts
+def _excluded_parts(relative_parts: tuple[str, ...], excludes: set[str]) -> bool:
     if any(part in excludes for part in relative_parts):
         return True
     if len(relative_parts) >= 2 and relative_parts[0] == "receipts":
         name = relative_parts[-1]
-        return name.endswith(".jsonl") or (name.startswith("repo_map_") and name.endswith(".json"))
+        return name.endswith(".jsonl") or ".jsonl." in name or (name.startswith("repo_map_") and name.endswith(".json"))
     return False
 
 
-def build_repo_map(root: Path, depth: int = 3, excludes: set[str] | None = None) -> list[RepoMapEntry]:
-    root = root.resolve()
-    excludes = set(DEFAULT_EXCLUDES if excludes is None else excludes)
-    entries: list[RepoMapEntry] = []
+def should_exclude(path: Path, root: Path, excludes: set[str]) -> bool:
+    return _excluded_parts(path.relative_to(root).parts, excludes)
+
+
+# (name, is_dir, descend): is_dir follows symlinks, descend does not, as rglob did.
+Listing = list[tuple[str, bool, bool]]
 
-    for item in sorted(root.rglob("*"), key=lambda value: value.relative_to(root).as_posix().lower()):
-        if should_exclude(item, root, excludes):
-            continue
-        relative = item.relative_to(root)
-        if len(relative.parts) > depth:
-            continue
-        kind = "dir" if item.is_dir() else "file"
-        size = 0 if item.is_dir() else item.stat().st_size
-        entries.append(RepoMapEntry(relative.as_posix(), kind, size))
 
+def _scan(directory: Path) -> Listing:
+    try:
+        with os.scandir(directory) as scanned:
+            return [(entry.name, entry.is_dir(), entry.is_dir() and not entry.is_symlink()) for entry in scanned]
+    except (PermissionError, FileNotFoundError, NotADirectoryError):
+        return []
+
+
+def _collect(root: Path, depth: int, excludes: set[str], listing: Callable[[Path], Listing]) -> list[RepoMapEntry]:
+    """Walk only what the map can contain: excluded directories and anything below depth are never listed."""
+    entries: list[RepoMapEntry] = []
+    pending: list[tuple[Path, tuple[str, ...]]] = [(root, ())] if depth > 0 else []
+    while pending:
+        directory, parts = pending.pop()
+        children = listing(directory)
+        descend = []
+        for name, is_dir, recurse in children:
+            child_parts = parts + (name,)
+            if name in excludes:
+                continue
+            if not _excluded_parts(child_parts, excludes):
+                size = 0 if is_dir else (directory / name).stat().st_size
+                entries.append(RepoMapEntry("/".join(child_parts), "dir" if is_dir else "file", size))
+            if recurse and len(child_parts) < depth:
+                descend.append((directory / name, child_parts))
+        pending.extend(reversed(descend))
+    # Stable sort over pre-order discovery, so case-only ties keep the order rglob gave them.
+    entries.sort(key=lambda entry: entry.path.lower())
     return entries
 
 
+def build_repo_map(root: Path, depth: int = 3, excludes: set[str] | None = None) -> list[RepoMapEntry]:
+    root = root.resolve()
+    excludes = set(DEFAULT_EXCLUDES if excludes is None else excludes)
+    return _collect(root, depth, excludes, _scan)
+
+
+class RepoMapCache:
+    """build_repo_map results for one root, kept between calls.
+
+    Each directory listing is reused while the directory's mtime is unchanged,
+    so a refresh costs one stat per listed directory and one per file (sizes
+    are part of the map). A listing read within RACY_SECONDS of its
+    directory's last change is re-read next time, since a coarse mtime can
+    hide a second change in the same tick. With start_watching, listed
+    directories are also watched with inotify and a map is returned as-is
+    until any event arrives. If a watch cannot be added (for example the
+    inotify watch limit is reached), watching stops and the cache carries on
+    in mtime mode. Thread-safe.
+    """
+
+    RACY_SECONDS = 2.0
+
+    def __init__(self, root: Path, max_views: int = 8) -> None:
+        self.root = root.resolve()
+        self.max_views = max_views
+        self.scans = 0
+        self.watcher: DirectoryWatcher | None = None
+        self._views: OrderedDict[tuple[int, frozenset[str]], tuple[dict[Path, tuple[int, Listing]], list[RepoMapEntry]]] = OrderedDict()
+        self._fresh: set[tuple[int, frozenset[str]]] = set()
+        self._lock = threading.Lock()
+
+    def start_watching(self) -> bool:
+        """Watch listed directories with inotify so an unchanged tree costs no filesystem calls. Returns False where unsupported."""
+        with self._lock:
+            if self.watcher is None:
+                try:
+                    self.watcher = DirectoryWatcher()
+                except OSError:
+                    return False
+                self._fresh.clear()
+            return True
+
+    def close(self) -> None:
+        with self._lock:
+            if self.watcher is not None:
+                self.watcher.close()
+                self.watcher = None
+            self._fresh.clear()
+
+    def entries(self, depth: int = 3, excludes: set[str] | None = None) -> list[RepoMapEntry]:
+        excludes = set(DEFAULT_EXCLUDES if excludes is None else excludes)
+        key = (depth, frozenset(excludes))
+        with self._lock:
+            watcher = self.watcher
+            if watcher is not None and watcher.changed():
+                self._fresh.clear()
+            previous, answer = self._views.pop(key, ({}, []))
+            if key in self._fresh:
+                self._views[key] = (previous, answer)
+                return list(answer)
+            current: dict[Path, tuple[int, Listing]] = {}
+
+            def listing(directory: Path) -> Listing:
+                nonlocal watcher
+                if watcher is not None:
+                    try:
+                        watcher.watch(directory)
+                    except OSError:
+                        watcher.close()
+                        watcher = self.watcher = None
+                        self._fresh.clear()
+                try:
+                    mtime = os.stat(directory).st_mtime_ns
+                except OSError:
+                    return _scan(directory)
+                cached = previous.get(directory)
+                if cached is not None and cached[0] == mtime:
+                    current[directory] = cached
+                    return cached[1]
+                self.scans += 1
+                scanned = _scan(directory)
+                if time.time_ns() - mtime > self.RACY_SECONDS * 1e9:
+                    current[directory] = (mtime, scanned)
+                return scanned
+
+            answer = _collect(self.root, depth, excludes, listing)
+            self._views[key] = (current, answer)
+            if watcher is not None:
+                self._fresh.add(key)
+            while len(self._views) > self.max_views:
+                evicted, _ = self._views.popitem(last=False)
+                self._fresh.discard(evicted)
+            return list(answer)
+
+
 def canonical_map(entries: list[RepoMapEntry]) -> str:
     rows = [entry.__dict__ for entry in entries]
     return json.dumps(rows, sort_keys=True, separators=(",", ":"), ensure_ascii=True)
@@ -8,6 +8,9 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+from ve_gate_rules import Rule, RuleSet
+from ve_ledger_io import ledger_writer
+
 
 ZERO_HASH = "0" * 64
 DECISIONS = {"PROCEED", "PAUSE", "ABORT", "SAFE_MODE"}
@@ -50,6 +53,7 @@ POLICY_THRESHOLDS = {
     "standard": {"rho": 0.75, "delta": 0.25},
     "elevated": {"rho": 0.82, "delta": 0.20},
 }
+ABORT_DELTA = 0.40
 
 
 @dataclass(frozen=True)
@@ -97,15 +101,6 @@ def compute_hash(receipt: dict[str, Any]) -> str:
     return hashlib.sha256(canonicalize_self_proposal(receipt).encode("utf-8")).hexdigest()
 
 
-def _last_hash(path: Path) -> str:
-    if not path.exists():
-        return ZERO_HASH
-    rows = [line for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
-    if not rows:
-        return ZERO_HASH
-    return json.loads(rows[-1]).get("hash_self", ZERO_HASH)
-
-
 def create_self_proposal(**kwargs: Any) -> dict[str, Any]:
     proposal = {
         "proposal_id": kwargs.get("proposal_id") or str(uuid.uuid4()),
@@ -167,8 +162,9 @@ def _rank(level: str) -> int:
     return LEVEL_RANK.get(level, -1)
 
 
-def _thresholds(policy_tier: str) -> dict[str, float]:
-    return POLICY_THRESHOLDS.get(policy_tier, POLICY_THRESHOLDS["standard"])
+def _thresholds(policy_tier: str, table: dict[str, dict[str, float]] | None = None) -> dict[str, float]:
+    table = POLICY_THRESHOLDS if table is None else table
+    return table.get(policy_tier, table["standard"])
 
 
 def _difference(rule_id: str, category: str, severity: str, rho_delta: float, delta_delta: float, decision: str) -> dict[str, Any]:
@@ -201,6 +197,212 @@ def classify_self_proposal(proposal: dict[str, Any], charter: AutonomyCharter |
     }
 
 
+_LANE_OUTSIDE_CHARTER = _difference("lane_outside_charter", "scope_boundary", "medium", -0.08, 0.10, "PAUSE")
+
+SELF_PROPOSAL_GATE_RULES = RuleSet(
+    "self_proposal",
+    [
+        Rule(
+            "SAFE_MODE",
+            "receipt chain broken",
+            "not chain_valid",
+            _difference("receipt_chain_broken", "governance_substrate", "high", -0.30, 0.40, "SAFE_MODE"),
+            "rho/delta unreliable because receipt chain is broken",
+        ),
+        Rule(
+            "SAFE_MODE",
+            "policy missing",
+            "not policy_ok",
+            _difference("policy_missing", "governance_substrate", "high", -0.25, 0.35, "SAFE_MODE"),
+            "rho/delta unreliable because policy is missing",
+        ),
+        Rule(
+            "SAFE_MODE",
+            "repeated proposal loop",
+            "int(source.get('repeated_proposal_count', 0)) >= 3",
+            _difference("repeated_self_proposal_loop", "loop_control", "high", -0.20, 0.35, "SAFE_MODE"),
+            "delta increased because proposal loop repeated without resolution",
+        ),
+        Rule(
+            "SAFE_MODE",
+            "unsafe fallback",
+            "bool(source.get('unsafe_fallback', False))",
+            _difference("unsafe_fallback", "route_integrity", "high", -0.20, 0.35, "SAFE_MODE"),
+            "delta increased because fallback route is unsafe",
+        ),
+        Rule(
+            "SAFE_MODE",
+            "tool sandbox compromised",
+            "bool(source.get('sandbox_compromised', False))",
+            _difference("tool_sandbox_compromised", "tool_integrity", "critical", -0.40, 0.50, "SAFE_MODE"),
+            "rho collapsed because tool sandbox integrity is compromised",
+        ),
+        Rule(
+            "SAFE_MODE",
+            "proposal attempts authority escalation repeatedly",
+            "int(source.get('authority_escalation_attempts', 0)) >= 2",
+            _difference("repeated_authority_escalation", "authority_boundary", "high", -0.20, 0.35, "SAFE_MODE"),
+            "delta increased because authority escalation repeated",
+        ),
+        Rule(
+            "ABORT",
+            "action attempts to bypass gate",
+            "bool(source.get('gate_bypass_attempt', False))",
+            _difference("gate_bypass_attempt", "gate_integrity", "critical", -0.40, 0.50, "ABORT"),
+            "rho collapsed because proposal attempted to bypass gate",
+        ),
+        Rule(
+            "ABORT",
+            "destructive action requested without approval",
+            "bool(source.get('destructive_action', False))",
+            _difference("destructive_without_explicit_approval", "authority_boundary", "high", -0.25, 0.35, "ABORT"),
+            "delta increased because destructive action lacks explicit approval",
+        ),
+        Rule(
+            "ABORT",
+            "external action requested without explicit approval",
+            "bool(source.get('external_action', False))",
+            _difference("external_action_without_explicit_approval", "external_boundary", "high", -0.25, 0.35, "ABORT"),
+            "delta increased because external action lacks explicit approval",
+        ),
+        Rule(
+            "ABORT",
+            "memory mutation requested without receipt",
+            "bool(source.get('memory_mutation', False)) and not bool(source.get('receipt_required', False))",
+            _difference("memory_mutation_without_receipt", "memory_boundary", "high", -0.25, 0.35, "ABORT"),
+            "delta increased because memory mutation lacks receipt path",
+        ),
+        Rule(
+            "ABORT",
+            "identity/scope conflict",
+            "bool(source.get('identity_scope_conflict', False))",
+            _difference("identity_scope_conflict", "identity_scope", "high", -0.25, 0.35, "ABORT"),
+            "delta increased because identity and scope conflict",
+        ),
+        Rule(
+            "ABORT",
+            "delta above abort threshold",
+            "float(source.get('delta', 0.0)) > abort_delta",
+            _difference("delta_above_abort_threshold", "risk_drift", "high", -0.15, 0.25, "ABORT"),
+            "delta above 0.40 abort threshold",
+        ),
+        Rule(
+            "ABORT",
+            "file budget exceeded",
+            "charter is not None and len(classification['expected_files']) > int(charter.max_files_touched)",
+            _difference("file_budget_exceeded", "write_budget", "high", -0.20, 0.30, "ABORT"),
+            "delta increased because bounded proposal exceeded its file budget",
+        ),
+        Rule(
+            "ABORT",
+            "forbidden tool",
+            "charter is not None and bool(set(classification['expected_tools']).intersection(charter.blocked_tools))",
+            _difference("forbidden_tool", "tool_boundary", "high", -0.25, 0.35, "ABORT"),
+            "delta increased because proposal requested a forbidden tool",
+        ),
+        Rule(
+            "PAUSE",
+            "missing charter",
+            "charter is None",
+            _difference("missing_charter", "scope_boundary", "medium", -0.10, 0.12, "PAUSE"),
+        ),
+        Rule(
+            "PAUSE",
+            "requested action outside charter",
+            "charter is not None and classification['lane'] not in charter.allowed_actions",
+            _LANE_OUTSIDE_CHARTER,
+        ),
+        Rule(
+            "PAUSE",
+            "requested tool outside charter",
+            "charter is not None and bool(classification['expected_tools']) and 'none' not in charter.allowed_tools"
+            " and bool(set(classification['expected_tools']).difference(charter.allowed_tools))",
+            _difference("tool_outside_charter", "tool_boundary", "medium", -0.08, 0.10, "PAUSE"),
+        ),
+        Rule(
+            "PAUSE",
+            "permission requested",
+            "bool(source.get('permission_requested', False))",
+            _difference("permission_implies_authority_context_changed", "authority_boundary", "medium", -0.07, 0.10, "PAUSE"),
+        ),
+        Rule(
+            "PAUSE",
+            "unclear scope",
+            "not bool(source.get('consent_scope_present', False))",
+            _difference("missing_consent_scope", "scope_boundary", "medium", -0.10, 0.12, "PAUSE"),
+        ),
+        Rule(
+            "PAUSE",
+            "autonomy level does not allow proposed lane",
+            "not classification['level_allows_lane']",
+            _difference("autonomy_level_below_lane", "autonomy_boundary", "medium", -0.10, 0.12, "PAUSE"),
+        ),
+        Rule(
+            "PAUSE",
+            "unclear stop condition",
+            "not str(source.get('stop_condition', '')).strip()",
+            _difference("missing_stop_condition", "loop_control", "medium", -0.07, 0.10, "PAUSE"),
+        ),
+        Rule(
+            "PAUSE",
+            "missing review interval",
+            "str(source.get('autonomy_level', '')) == 'L5_SUPERVISED_EPISODE' and not str(source.get('review_interval', '')).strip()",
+            _difference("missing_review_interval", "loop_control", "medium", -0.07, 0.10, "PAUSE"),
+        ),
+        Rule(
+            "PAUSE",
+            "route fallback occurred",
+            "bool(source.get('route_fallback', False))",
+            _difference("route_fallback", "route_integrity", "medium", -0.08, 0.12, "PAUSE"),
+        ),
+        Rule(
+            "PAUSE",
+            "context limit exceeded",
+            "bool(source.get('context_limit_exceeded', False))",
+            _difference("context_limit_exceeded", "context_boundary", "medium", -0.08, 0.12, "PAUSE"),
+        ),
+        Rule(
+            "PAUSE",
+            "medium confidence",
+            "bool(source.get('medium_confidence', False))",
+            _difference("medium_confidence", "confidence", "medium", -0.06, 0.08, "PAUSE"),
+        ),
+        Rule(
+            "PAUSE",
+            "requested authority increased",
+            "bool(source.get('requested_authority_increased', False))",
+            _difference("authority_increase_requested", "authority_boundary", "medium", -0.08, 0.12, "PAUSE"),
+        ),
+        Rule(
+            "PAUSE",
+            "receipt path unavailable",
+            "not bool(source.get('receipt_required', False))",
+            _difference("receipt_path_unavailable", "receipt_boundary", "medium", -0.08, 0.12, "PAUSE"),
+        ),
+        Rule(
+            "PROCEED",
+            "bounded proposal within charter and policy thresholds",
+            "float(source.get('rho', 0.0)) >= thresholds['rho'] and float(source.get('delta', 1.0)) <= thresholds['delta']",
+            _difference("scope_confidence_and_drift_within_policy", "evidence_quality", "low", 0.05, -0.05, "PROCEED"),
+        ),
+    ],
+    default=Rule(
+        "PAUSE",
+        "policy threshold not met",
+        "True",
+        _difference("policy_threshold_not_met", "evidence_quality", "medium", -0.08, 0.08, "PAUSE"),
+        "rho/delta did not meet policy tier thresholds",
+    ),
+    # policy_thresholds and abort_delta default to POLICY_THRESHOLDS and ABORT_DELTA; threshold sweeps override them.
+    context={"charter": None, "chain_valid": True, "policy_ok": True, "policy_thresholds": None, "abort_delta": ABORT_DELTA},
+    derive={
+        "classification": "classify_self_proposal(source, charter)",
+        "thresholds": "_thresholds(str(source.get('policy_tier', 'standard')), policy_thresholds)",
+    },
+    names={"classify_self_proposal": classify_self_proposal, "_thresholds": _thresholds},
+)
+
+
 def evaluate_self_proposal_gate(
     proposal: dict[str, Any],
     charter: AutonomyCharter | dict[str, Any] | None = None,
@@ -209,121 +411,25 @@ def evaluate_self_proposal_gate(
     policy_present: bool = True,
 ) -> tuple[str, list[str], list[dict[str, Any]], str]:
     resolved_charter = charter if isinstance(charter, AutonomyCharter) else AutonomyCharter.from_dict(charter)
-    classification = classify_self_proposal(proposal, resolved_charter)
-    reasons: list[str] = []
-    makers: list[dict[str, Any]] = []
-    policy_tier = str(proposal.get("policy_tier", "standard"))
-    thresholds = _thresholds(policy_tier)
-    lane = classification["lane"]
-    tools = classification["expected_tools"]
-    files = classification["expected_files"]
-
-    chain_valid = bool(proposal.get("receipt_chain_valid", receipt_chain_valid))
-    policy_ok = bool(proposal.get("policy_present", policy_present))
-    repeated_count = int(proposal.get("repeated_proposal_count", 0))
-    escalation_attempts = int(proposal.get("authority_escalation_attempts", 0))
-
-    if not chain_valid:
-        makers.append(_difference("receipt_chain_broken", "governance_substrate", "high", -0.30, 0.40, "SAFE_MODE"))
-        return "SAFE_MODE", ["receipt chain broken"], makers, "rho/delta unreliable because receipt chain is broken"
-    if not policy_ok:
-        makers.append(_difference("policy_missing", "governance_substrate", "high", -0.25, 0.35, "SAFE_MODE"))
-        return "SAFE_MODE", ["policy missing"], makers, "rho/delta unreliable because policy is missing"
-    if repeated_count >= 3:
-        makers.append(_difference("repeated_self_proposal_loop", "loop_control", "high", -0.20, 0.35, "SAFE_MODE"))
-        return "SAFE_MODE", ["repeated proposal loop"], makers, "delta increased because proposal loop repeated without resolution"
-    if bool(proposal.get("unsafe_fallback", False)):
-        makers.append(_difference("unsafe_fallback", "route_integrity", "high", -0.20, 0.35, "SAFE_MODE"))
-        return "SAFE_MODE", ["unsafe fallback"], makers, "delta increased because fallback route is unsafe"
-    if bool(proposal.get("sandbox_compromised", False)):
-        makers.append(_difference("tool_sandbox_compromised", "tool_integrity", "critical", -0.40, 0.50, "SAFE_MODE"))
-        return "SAFE_MODE", ["tool sandbox compromised"], makers, "rho collapsed because tool sandbox integrity is compromised"
-    if escalation_attempts >= 2:
-        makers.append(_difference("repeated_authority_escalation", "authority_boundary", "high", -0.20, 0.35, "SAFE_MODE"))
-        return "SAFE_MODE", ["proposal attempts authority escalation repeatedly"], makers, "delta increased because authority escalation repeated"
-
-    if bool(proposal.get("gate_bypass_attempt", False)):
-        makers.append(_difference("gate_bypass_attempt", "gate_integrity", "critical", -0.40, 0.50, "ABORT"))
-        return "ABORT", ["action attempts to bypass gate"], makers, "rho collapsed because proposal attempted to bypass gate"
-    if bool(proposal.get("destructive_action", False)):
-        makers.append(_difference("destructive_without_explicit_approval", "authority_boundary", "high", -0.25, 0.35, "ABORT"))
-        return "ABORT", ["destructive action requested without approval"], makers, "delta increased because destructive action lacks explicit approval"
-    if bool(proposal.get("external_action", False)):
-        makers.append(_difference("external_action_without_explicit_approval", "external_boundary", "high", -0.25, 0.35, "ABORT"))
-        return "ABORT", ["external action requested without explicit approval"], makers, "delta increased because external action lacks explicit approval"
-    if bool(proposal.get("memory_mutation", False)) and not bool(proposal.get("receipt_required", False)):
-        makers.append(_difference("memory_mutation_without_receipt", "memory_boundary", "high", -0.25, 0.35, "ABORT"))
-        return "ABORT", ["memory mutation requested without receipt"], makers, "delta increased because memory mutation lacks receipt path"
-    if bool(proposal.get("identity_scope_conflict", False)):
-        makers.append(_difference("identity_scope_conflict", "identity_scope", "high", -0.25, 0.35, "ABORT"))
-        return "ABORT", ["identity/scope conflict"], makers, "delta increased because identity and scope conflict"
-    if float(proposal.get("delta", 0.0)) > 0.40:
-        makers.append(_difference("delta_above_abort_threshold", "risk_drift", "high", -0.15, 0.25, "ABORT"))
-        return "ABORT", ["delta above abort threshold"], makers, "delta above 0.40 abort threshold"
-
-    if resolved_charter is None:
-        reasons.append("missing charter")
-        makers.append(_difference("missing_charter", "scope_boundary", "medium", -0.10, 0.12, "PAUSE"))
-    else:
-        if lane not in resolved_charter.allowed_actions:
-            reasons.append("requested action outside charter")
-            makers.append(_difference("lane_outside_charter", "scope_boundary", "medium", -0.08, 0.10, "PAUSE"))
-        if len(files) > int(resolved_charter.max_files_touched):
-            makers.append(_difference("file_budget_exceeded", "write_budget", "high", -0.20, 0.30, "ABORT"))
-            return "ABORT", ["file budget exceeded"], makers, "delta increased because bounded proposal exceeded its file budget"
-        forbidden_tools = sorted(set(tools).intersection(set(resolved_charter.blocked_tools)))
-        if forbidden_tools:
-            return "ABORT", ["forbidden tool"], [
-                _difference("forbidden_tool", "tool_boundary", "high", -0.25, 0.35, "ABORT")
-            ], "delta increased because proposal requested a forbidden tool"
-        if tools and "none" not in resolved_charter.allowed_tools:
-            disallowed_tools = sorted(set(tools).difference(set(resolved_charter.allowed_tools)))
-            if disallowed_tools:
-                reasons.append("requested tool outside charter")
-                makers.append(_difference("tool_outside_charter", "tool_boundary", "medium", -0.08, 0.10, "PAUSE"))
-
-    if bool(proposal.get("permission_requested", False)):
-        reasons.append("permission requested")
-        makers.append(_difference("permission_implies_authority_context_changed", "authority_boundary", "medium", -0.07, 0.10, "PAUSE"))
-    if not bool(proposal.get("consent_scope_present", False)):
-        reasons.append("unclear scope")
-        makers.append(_difference("missing_consent_scope", "scope_boundary", "medium", -0.10, 0.12, "PAUSE"))
-    if not classification["level_allows_lane"]:
-        reasons.append("autonomy level does not allow proposed lane")
-        makers.append(_difference("autonomy_level_below_lane", "autonomy_boundary", "medium", -0.10, 0.12, "PAUSE"))
-    if not str(proposal.get("stop_condition", "")).strip():
-        reasons.append("unclear stop condition")
-        makers.append(_difference("missing_stop_condition", "loop_control", "medium", -0.07, 0.10, "PAUSE"))
-    if str(proposal.get("autonomy_level", "")) == "L5_SUPERVISED_EPISODE" and not str(proposal.get("review_interval", "")).strip():
-        reasons.append("missing review interval")
-        makers.append(_difference("missing_review_interval", "loop_control", "medium", -0.07, 0.10, "PAUSE"))
-    if bool(proposal.get("route_fallback", False)):
-        reasons.append("route fallback occurred")
-        makers.append(_difference("route_fallback", "route_integrity", "medium", -0.08, 0.12, "PAUSE"))
-    if bool(proposal.get("context_limit_exceeded", False)):
-        reasons.append("context limit exceeded")
-        makers.append(_difference("context_limit_exceeded", "context_boundary", "medium", -0.08, 0.12, "PAUSE"))
-    if bool(proposal.get("medium_confidence", False)):
-        reasons.append("medium confidence")
-        makers.append(_difference("medium_confidence", "confidence", "medium", -0.06, 0.08, "PAUSE"))
-    if bool(proposal.get("requested_authority_increased", False)):
-        reasons.append("requested authority increased")
-        makers.append(_difference("authority_increase_requested", "authority_boundary", "medium", -0.08, 0.12, "PAUSE"))
-    if not bool(proposal.get("receipt_required", False)):
-        reasons.append("receipt path unavailable")
-        makers.append(_difference("receipt_path_unavailable", "receipt_boundary", "medium", -0.08, 0.12, "PAUSE"))
-
-    if reasons:
-        return "PAUSE", reasons, makers, "rho/delta downgraded because " + "; ".join(item["rule_id"] for item in makers)
-
-    if float(proposal.get("rho", 0.0)) >= thresholds["rho"] and float(proposal.get("delta", 1.0)) <= thresholds["delta"]:
-        makers.append(_difference("scope_confidence_and_drift_within_policy", "evidence_quality", "low", 0.05, -0.05, "PROCEED"))
-        return "PROCEED", ["bounded proposal within charter and policy thresholds"], makers, (
+    outcome = SELF_PROPOSAL_GATE_RULES.evaluate(
+        proposal,
+        charter=resolved_charter,
+        chain_valid=bool(proposal.get("receipt_chain_valid", receipt_chain_valid)),
+        policy_ok=bool(proposal.get("policy_present", policy_present)),
+    )
+    makers = outcome.markers
+    if makers[0]["rule_id"] == "file_budget_exceeded" and str(proposal.get("action_lane", "")).lower() not in resolved_charter.allowed_actions:
+        # The file budget is checked after the charter lane check, so its record keeps the lane marker.
+        makers.insert(0, dict(_LANE_OUTSIDE_CHARTER))
+    if outcome.decision == "PROCEED":
+        policy_tier = str(proposal.get("policy_tier", "standard"))
+        thresholds = _thresholds(policy_tier)
+        return outcome.decision, outcome.reasons, makers, (
             f"rho={proposal.get('rho')} >= {thresholds['rho']} and "
             f"delta={proposal.get('delta')} <= {thresholds['delta']} for {policy_tier} policy tier"
         )
-    makers.append(_difference("policy_threshold_not_met", "evidence_quality", "medium", -0.08, 0.08, "PAUSE"))
-    return "PAUSE", ["policy threshold not met"], makers, "rho/delta did not meet policy tier thresholds"
+    # PAUSE rules carry no note of their own; the calibration names every rule that fired.
+    return outcome.decision, outcome.reasons, makers, outcome.note or "rho/delta downgraded because " + "; ".join(item["rule_id"] for item in makers)
 
 
 def _build_receipt(
@@ -444,10 +550,12 @@ def write_self_proposal_receipt(
         receipt_chain_valid=receipt_chain_valid,
         policy_present=policy_present,
     )
-    receipt = _build_receipt(proposal, decision, reason, makers, calibration, _last_hash(path))
-    errors = validate_self_proposal_schema(receipt)
-    if errors:
-        raise ValueError("; ".join(errors))
-    with path.open("a", encoding="utf-8") as handle:
-        handle.write(json.dumps(receipt, sort_keys=True) + "\n")
-    return receipt
+
+    def build(hash_prev: str) -> dict[str, Any]:
+        receipt = _build_receipt(proposal, decision, reason, makers, calibration, hash_prev)
+        errors = validate_self_proposal_schema(receipt)
+        if errors:
+            raise ValueError("; ".join(errors))
+        return receipt
+
+    return ledger_writer(path).append(build)
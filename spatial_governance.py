@@ -9,6 +9,9 @@ from math import hypot
 from pathlib import Path
 from typing import Any
 
+from ve_gate_rules import Rule, RuleSet
+from ve_ledger_io import ledger_writer
+
 
 ZERO_HASH = "0" * 64
 DECISIONS = {"PROCEED", "PAUSE", "ABORT", "SAFE_MODE"}
@@ -60,15 +63,6 @@ def compute_hash(receipt: dict[str, Any]) -> str:
     return hashlib.sha256(canonicalize_spatial_receipt(receipt).encode("utf-8")).hexdigest()
 
 
-def _last_hash(path: Path) -> str:
-    if not path.exists():
-        return ZERO_HASH
-    rows = [line for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
-    if not rows:
-        return ZERO_HASH
-    return json.loads(rows[-1]).get("hash_self", ZERO_HASH)
-
-
 def create_spatial_event(**kwargs: Any) -> dict[str, Any]:
     return {
         "event_id": kwargs.get("event_id") or str(uuid.uuid4()),
@@ -147,6 +141,133 @@ def classify_spatial_event(event: dict[str, Any], envelope: OperationalEnvelope
     }
 
 
+SPATIAL_GATE_RULES = RuleSet(
+    "spatial",
+    [
+        Rule(
+            "SAFE_MODE",
+            "receipt chain broken",
+            "not chain_valid",
+            _difference("receipt_chain_broken", "governance_substrate", "high", -0.30, 0.40, "SAFE_MODE"),
+            "rho/delta unreliable because receipt chain is broken",
+        ),
+        Rule(
+            "SAFE_MODE",
+            "policy missing",
+            "not policy_ok",
+            _difference("policy_missing", "governance_substrate", "high", -0.25, 0.35, "SAFE_MODE"),
+            "rho/delta unreliable because policy is missing",
+        ),
+        Rule(
+            "SAFE_MODE",
+            "unsafe fallback",
+            "bool(source.get('unsafe_fallback', False))",
+            _difference("unsafe_fallback", "route_integrity", "high", -0.20, 0.35, "SAFE_MODE"),
+            "delta increased because fallback route is unsafe",
+        ),
+        Rule(
+            "ABORT",
+            "action attempts to bypass gate",
+            "bool(source.get('gate_bypass_attempt', False))",
+            _difference("gate_bypass_attempt", "gate_integrity", "critical", -0.40, 0.50, "ABORT"),
+            "rho collapsed because event attempted to bypass gate",
+        ),
+        Rule(
+            "ABORT",
+            "adapter cannot issue physical action",
+            "bool(source.get('external_action_requested', False)) or bool(source.get('actuator_command_requested', False))",
+            _difference("actuation_requested", "actuator_boundary", "critical", -0.40, 0.50, "ABORT"),
+            "delta increased because governance adapter cannot command actuators",
+        ),
+        Rule(
+            "ABORT",
+            "delta above abort threshold",
+            "float(source.get('delta', 0.0)) > 0.40",
+            _difference("delta_above_abort_threshold", "risk_drift", "high", -0.15, 0.25, "ABORT"),
+            "delta above 0.40 abort threshold",
+        ),
+        Rule(
+            "PAUSE",
+            "missing operational envelope",
+            "envelope is None",
+            _difference("missing_envelope", "scope_boundary", "medium", -0.10, 0.12, "PAUSE"),
+        ),
+        Rule(
+            "PAUSE",
+            "zone authorization missing",
+            "not bool(source.get('zone_authorized', False))",
+            _difference("zone_authorization_missing", "authority_boundary", "medium", -0.10, 0.12, "PAUSE"),
+        ),
+        Rule(
+            "PAUSE",
+            "authority mismatch",
+            "envelope is not None and str(source.get('authority_id', '')) != envelope.authority_id",
+            _difference("authority_mismatch", "authority_boundary", "high", -0.14, 0.18, "PAUSE"),
+        ),
+        Rule(
+            "PAUSE",
+            "outside operational envelope",
+            "envelope is not None and not classification['inside_envelope']",
+            _difference("outside_envelope", "spatial_boundary", "high", -0.15, 0.22, "PAUSE"),
+        ),
+        Rule(
+            "PAUSE",
+            "altitude outside envelope",
+            "envelope is not None and not classification['altitude_in_bounds']",
+            _difference("altitude_outside_envelope", "spatial_boundary", "high", -0.12, 0.18, "PAUSE"),
+        ),
+        Rule(
+            "PAUSE",
+            "speed outside envelope",
+            "envelope is not None and not classification['speed_in_bounds']",
+            _difference("speed_outside_envelope", "spatial_boundary", "medium", -0.08, 0.12, "PAUSE"),
+        ),
+        Rule(
+            "PAUSE",
+            "proximity breach",
+            "envelope is not None and not classification['proximity_in_bounds']",
+            _difference("proximity_breach", "human_safety_boundary", "high", -0.18, 0.25, "PAUSE"),
+        ),
+        Rule(
+            "PAUSE",
+            "authority transfer requires receipt",
+            "bool(source.get('authority_transfer_requested', False)) and (envelope is None or not envelope.authority_transfer_allowed"
+            " or not bool(source.get('authority_transfer_receipt_present', False)))",
+            _difference("authority_transfer_without_receipt", "authority_boundary", "high", -0.14, 0.18, "PAUSE"),
+        ),
+        Rule(
+            "PAUSE",
+            "receipt path unavailable",
+            "not bool(source.get('receipt_required', True))",
+            _difference("receipt_path_unavailable", "receipt_boundary", "medium", -0.08, 0.12, "PAUSE"),
+        ),
+        Rule(
+            "PAUSE",
+            "sensor confidence below threshold",
+            "float(source.get('sensor_confidence', 0.0)) < 0.70",
+            _difference("low_sensor_confidence", "evidence_quality", "medium", -0.08, 0.10, "PAUSE"),
+        ),
+        Rule(
+            "PROCEED",
+            "authorized envelope posture within thresholds",
+            "float(source.get('rho', 0.0)) >= 0.70 and float(source.get('delta', 1.0)) <= 0.30",
+            _difference("authorized_envelope_within_thresholds", "evidence_quality", "low", 0.05, -0.05, "PROCEED"),
+            "rho/delta within spatial governance thresholds",
+        ),
+    ],
+    default=Rule(
+        "PAUSE",
+        "spatial governance threshold not met",
+        "True",
+        _difference("spatial_threshold_not_met", "evidence_quality", "medium", -0.08, 0.08, "PAUSE"),
+        "rho/delta did not meet spatial governance thresholds",
+    ),
+    context={"envelope": None, "chain_valid": True, "policy_ok": True},
+    derive={"classification": "classify_spatial_event(source, envelope)"},
+    names={"classify_spatial_event": classify_spatial_event},
+)
+
+
 def evaluate_spatial_gate(
     event: dict[str, Any],
     envelope: OperationalEnvelope | dict[str, Any] | None,
@@ -155,73 +276,16 @@ def evaluate_spatial_gate(
     policy_present: bool = True,
 ) -> tuple[str, list[str], list[dict[str, Any]], str]:
     resolved = envelope if isinstance(envelope, OperationalEnvelope) else OperationalEnvelope.from_dict(envelope)
-    classification = classify_spatial_event(event, resolved)
-    makers: list[dict[str, Any]] = []
-    reasons: list[str] = []
-    chain_valid = bool(event.get("receipt_chain_valid", receipt_chain_valid))
-    policy_ok = bool(event.get("policy_present", policy_present))
-
-    if not chain_valid:
-        makers.append(_difference("receipt_chain_broken", "governance_substrate", "high", -0.30, 0.40, "SAFE_MODE"))
-        return "SAFE_MODE", ["receipt chain broken"], makers, "rho/delta unreliable because receipt chain is broken"
-    if not policy_ok:
-        makers.append(_difference("policy_missing", "governance_substrate", "high", -0.25, 0.35, "SAFE_MODE"))
-        return "SAFE_MODE", ["policy missing"], makers, "rho/delta unreliable because policy is missing"
-    if bool(event.get("unsafe_fallback", False)):
-        makers.append(_difference("unsafe_fallback", "route_integrity", "high", -0.20, 0.35, "SAFE_MODE"))
-        return "SAFE_MODE", ["unsafe fallback"], makers, "delta increased because fallback route is unsafe"
-
-    if bool(event.get("gate_bypass_attempt", False)):
-        makers.append(_difference("gate_bypass_attempt", "gate_integrity", "critical", -0.40, 0.50, "ABORT"))
-        return "ABORT", ["action attempts to bypass gate"], makers, "rho collapsed because event attempted to bypass gate"
-    if bool(event.get("external_action_requested", False)) or bool(event.get("actuator_command_requested", False)):
-        makers.append(_difference("actuation_requested", "actuator_boundary", "critical", -0.40, 0.50, "ABORT"))
-        return "ABORT", ["adapter cannot issue physical action"], makers, "delta increased because governance adapter cannot command actuators"
-    if float(event.get("delta", 0.0)) > 0.40:
-        makers.append(_difference("delta_above_abort_threshold", "risk_drift", "high", -0.15, 0.25, "ABORT"))
-        return "ABORT", ["delta above abort threshold"], makers, "delta above 0.40 abort threshold"
-
-    if resolved is None:
-        reasons.append("missing operational envelope")
-        makers.append(_difference("missing_envelope", "scope_boundary", "medium", -0.10, 0.12, "PAUSE"))
-    if not bool(event.get("zone_authorized", False)):
-        reasons.append("zone authorization missing")
-        makers.append(_difference("zone_authorization_missing", "authority_boundary", "medium", -0.10, 0.12, "PAUSE"))
-    if resolved is not None and str(event.get("authority_id", "")) != resolved.authority_id:
-        reasons.append("authority mismatch")
-        makers.append(_difference("authority_mismatch", "authority_boundary", "high", -0.14, 0.18, "PAUSE"))
-    if resolved is not None and not classification["inside_envelope"]:
-        reasons.append("outside operational envelope")
-        makers.append(_difference("outside_envelope", "spatial_boundary", "high", -0.15, 0.22, "PAUSE"))
-    if resolved is not None and not classification["altitude_in_bounds"]:
-        reasons.append("altitude outside envelope")
-        makers.append(_difference("altitude_outside_envelope", "spatial_boundary", "high", -0.12, 0.18, "PAUSE"))
-    if resolved is not None and not classification["speed_in_bounds"]:
-        reasons.append("speed outside envelope")
-        makers.append(_difference("speed_outside_envelope", "spatial_boundary", "medium", -0.08, 0.12, "PAUSE"))
-    if resolved is not None and not classification["proximity_in_bounds"]:
-        reasons.append("proximity breach")
-        makers.append(_difference("proximity_breach", "human_safety_boundary", "high", -0.18, 0.25, "PAUSE"))
-    if bool(event.get("authority_transfer_requested", False)):
-        if resolved is None or not resolved.authority_transfer_allowed or not bool(event.get("authority_transfer_receipt_present", False)):
-            reasons.append("authority transfer requires receipt")
-            makers.append(_difference("authority_transfer_without_receipt", "authority_boundary", "high", -0.14, 0.18, "PAUSE"))
-    if not bool(event.get("receipt_required", True)):
-        reasons.append("receipt path unavailable")
-        makers.append(_difference("receipt_path_unavailable", "receipt_boundary", "medium", -0.08, 0.12, "PAUSE"))
-    if float(event.get("sensor_confidence", 0.0)) < 0.70:
-        reasons.append("sensor confidence below threshold")
-        makers.append(_difference("low_sensor_confidence", "evidence_quality", "medium", -0.08, 0.10, "PAUSE"))
-
-    if reasons:
-        return "PAUSE", reasons, makers, "rho/delta downgraded because " + "; ".join(item["rule_id"] for item in makers)
-
-    if float(event.get("rho", 0.0)) >= 0.70 and float(event.get("delta", 1.0)) <= 0.30:
-        makers.append(_difference("authorized_envelope_within_thresholds", "evidence_quality", "low", 0.05, -0.05, "PROCEED"))
-        return "PROCEED", ["authorized envelope posture within thresholds"], makers, "rho/delta within spatial governance thresholds"
-
-    makers.append(_difference("spatial_threshold_not_met", "evidence_quality", "medium", -0.08, 0.08, "PAUSE"))
-    return "PAUSE", ["spatial governance threshold not met"], makers, "rho/delta did not meet spatial governance thresholds"
+    outcome = SPATIAL_GATE_RULES.evaluate(
+        event,
+        envelope=resolved,
+        chain_valid=bool(event.get("receipt_chain_valid", receipt_chain_valid)),
+        policy_ok=bool(event.get("policy_present", policy_present)),
+    )
+    makers = outcome.markers
+    # PAUSE rules carry no note of their own; the calibration names every rule that fired.
+    calibration = outcome.note or "rho/delta downgraded because " + "; ".join(item["rule_id"] for item in makers)
+    return outcome.decision, outcome.reasons, makers, calibration
 
 
 def _build_receipt(
@@ -307,10 +371,12 @@ def write_spatial_receipt(path: Path, event: dict[str, Any], envelope: Operation
     path.parent.mkdir(parents=True, exist_ok=True)
     resolved = envelope if isinstance(envelope, OperationalEnvelope) else OperationalEnvelope.from_dict(envelope)
     decision, reason, makers, calibration = evaluate_spatial_gate(event, resolved)
-    receipt = _build_receipt(event, resolved, decision, reason, makers, calibration, _last_hash(path))
-    errors = validate_spatial_receipt(receipt)
-    if errors:
-        raise ValueError("; ".join(errors))
-    with path.open("a", encoding="utf-8") as handle:
-        handle.write(json.dumps(receipt, sort_keys=True) + "\n")
-    return receipt
+
+    def build(hash_prev: str) -> dict[str, Any]:
+        receipt = _build_receipt(event, resolved, decision, reason, makers, calibration, hash_prev)
+        errors = validate_spatial_receipt(receipt)
+        if errors:
+            raise ValueError("; ".join(errors))
+        return receipt
+
+    return ledger_writer(path).append(build)
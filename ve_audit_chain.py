@@ -5,12 +5,13 @@ import hashlib
 import hmac
 import json
 import os
-import time
-from contextlib import contextmanager
 from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
+
+from ve_ledger_io import chain_origin, ledger_lock, ledger_writer, tail_hash
+from ve_ledger_segments import verify_segments
 
 
 @dataclass(frozen=True)
@@ -37,82 +38,148 @@ def sign(payload_hash: str, key: str) -> str:
 
 
 def last_hash(path: Path) -> str:
-    if not path.exists():
-        return "0" * 64
-    lines = [line for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
-    if not lines:
-        return "0" * 64
-    return json.loads(lines[-1])["hash_self"]
-
-
-@contextmanager
-def audit_lock(path: Path, timeout_seconds: float = 5.0):
-    lock_path = path.with_suffix(path.suffix + ".lock")
-    lock_path.parent.mkdir(parents=True, exist_ok=True)
-    deadline = time.monotonic() + timeout_seconds
-    handle = None
-    while handle is None:
-        try:
-            handle = os.open(str(lock_path), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
-        except FileExistsError:
-            if time.monotonic() >= deadline:
-                raise TimeoutError(f"timeout acquiring audit lock: {lock_path}")
-            time.sleep(0.05)
-    try:
-        os.write(handle, str(os.getpid()).encode("utf-8"))
-        yield
-    finally:
-        os.close(handle)
-        try:
-            lock_path.unlink()
-        except FileNotFoundError:
-            pass
+    return tail_hash(path)
+
+
+def audit_lock(path: Path):
+    return ledger_lock(path)
 
 
 def append_audit_record(path: Path, event_type: str, actor: str, payload: dict, signing_key: str) -> AuditRecord:
-    with audit_lock(path):
-        previous_hash = last_hash(path)
+    def build(hash_prev: str) -> dict[str, Any]:
         body = {
             "ts": datetime.now(timezone.utc).isoformat(),
             "event_type": event_type,
             "actor": actor,
             "payload": payload,
-            "hash_prev": previous_hash,
+            "hash_prev": hash_prev,
         }
         hash_self = sha256(body)
-        signature = sign(hash_self, signing_key)
-        record = AuditRecord(**body, hash_self=hash_self, signature=signature)
-        path.parent.mkdir(parents=True, exist_ok=True)
-        with path.open("a", encoding="utf-8") as handle:
-            handle.write(json.dumps(asdict(record), sort_keys=True) + "\n")
-        return record
+        return asdict(AuditRecord(**body, hash_self=hash_self, signature=sign(hash_self, signing_key)))
 
+    return AuditRecord(**ledger_writer(path, audit_segment_check(signing_key)).append(build))
 
-def verify_audit_chain(path: Path, signing_key: str) -> bool:
-    expected_prev = "0" * 64
-    if not path.exists():
-        return True
-    with path.open("r", encoding="utf-8") as handle:
+
+def checkpoint_path(path: Path) -> Path:
+    return path.with_name(path.name + ".checkpoint.json")
+
+
+def _checkpoint_body(lines: int, offset: int, line_offset: int, hash_self: str) -> dict[str, Any]:
+    return {"lines": lines, "offset": offset, "line_offset": line_offset, "hash_self": hash_self}
+
+
+def write_checkpoint(path: Path, lines: int, offset: int, line_offset: int, hash_self: str, signing_key: str) -> dict[str, Any]:
+    body = _checkpoint_body(lines, offset, line_offset, hash_self)
+    checkpoint = {**body, "hmac": sign(sha256(body), signing_key)}
+    target = checkpoint_path(path)
+    temp = target.with_name(target.name + ".tmp")
+    temp.write_text(json.dumps(checkpoint, sort_keys=True), encoding="utf-8")
+    os.replace(temp, target)
+    return checkpoint
+
+
+def read_checkpoint(path: Path, signing_key: str) -> dict[str, Any] | None:
+    """Return the checkpoint only if its HMAC verifies and it still matches the ledger."""
+    try:
+        data = json.loads(checkpoint_path(path).read_text(encoding="utf-8"))
+        body = _checkpoint_body(int(data["lines"]), int(data["offset"]), int(data["line_offset"]), str(data["hash_self"]))
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    if not hmac.compare_digest(str(data.get("hmac", "")), sign(sha256(body), signing_key)):
+        return None
+    if body["lines"] == 0:
+        return body if body["offset"] == 0 else None
+    if not path.exists() or path.stat().st_size < body["offset"]:
+        return None
+    with path.open("rb") as handle:
+        handle.seek(body["line_offset"])
+        raw = handle.read(body["offset"] - body["line_offset"])
+    try:
+        anchor = json.loads(raw.decode("utf-8"))
+    except ValueError:
+        return None
+    if not isinstance(anchor, dict) or anchor.get("hash_self") != body["hash_self"]:
+        return None
+    return body
+
+
+def audit_row_errors(item: dict[str, Any], signing_key: str) -> list[str]:
+    """Re-hash and re-sign one audit row; hash_prev linkage is the caller's job."""
+    try:
+        body = {
+            "ts": item["ts"],
+            "event_type": item["event_type"],
+            "actor": item["actor"],
+            "payload": item["payload"],
+            "hash_prev": item["hash_prev"],
+        }
+    except KeyError as exc:
+        return [f"missing field {exc.args[0]}"]
+    expected_hash = sha256(body)
+    if item.get("hash_self") != expected_hash:
+        return ["hash_self does not match canonical audit row"]
+    if item.get("signature") != sign(expected_hash, signing_key):
+        return ["signature does not verify"]
+    return []
+
+
+def _verify_rows(path: Path, signing_key: str, start: dict[str, Any]) -> tuple[bool, dict[str, Any]]:
+    position = start
+    expected_prev = start["hash_self"]
+    with path.open("rb") as handle:
+        handle.seek(start["offset"])
+        offset = start["offset"]
         for line in handle:
+            line_offset = offset
+            offset += len(line)
             if not line.strip():
                 continue
             item = json.loads(line)
-            if item["hash_prev"] != expected_prev:
-                return False
-            body = {
-                "ts": item["ts"],
-                "event_type": item["event_type"],
-                "actor": item["actor"],
-                "payload": item["payload"],
-                "hash_prev": item["hash_prev"],
-            }
-            expected_hash = sha256(body)
-            if item["hash_self"] != expected_hash:
-                return False
-            if item["signature"] != sign(expected_hash, signing_key):
-                return False
+            if item["hash_prev"] != expected_prev or audit_row_errors(item, signing_key):
+                return False, position
             expected_prev = item["hash_self"]
-    return True
+            position = _checkpoint_body(position["lines"] + 1, offset, line_offset, expected_prev)
+    return True, position
+
+
+def audit_segment_check(signing_key: str) -> Callable[[Path, str], list[str]]:
+    """Return the row verifier for one segment: every row re-hashed, re-signed and linked from origin."""
+
+    def check_segment(segment: Path, origin: str) -> list[str]:
+        ok, position = _verify_rows(segment, signing_key, _checkpoint_body(0, 0, 0, origin))
+        return [] if ok else [f"line {position['lines'] + 1}: audit row failed verification"]
+
+    return check_segment
+
+
+def verify_audit_chain(path: Path, signing_key: str, active_only: bool = False) -> bool:
+    """Forensic mode: re-hash and re-sign every row of every segment.
+
+    active_only re-checks only the active segment's rows; sealed segments are
+    then checked through the manifest linkage, size and sha256.
+    """
+    if verify_segments(path, None if active_only else audit_segment_check(signing_key)):
+        return False
+    if not path.exists():
+        return True
+    ok, _ = _verify_rows(path, signing_key, _checkpoint_body(0, 0, 0, chain_origin(path)))
+    return ok
+
+
+def verify_audit_chain_incremental(path: Path, signing_key: str) -> bool:
+    """Verify only rows appended after the last trusted checkpoint, then advance it.
+
+    A missing, unsigned, or mismatched checkpoint falls back to a full verify
+    from the start of the ledger. Rows covered by a trusted checkpoint are not
+    re-hashed; use verify_audit_chain for forensic runs.
+    """
+    if not path.exists():
+        return True
+    start = read_checkpoint(path, signing_key) or _checkpoint_body(0, 0, 0, chain_origin(path))
+    ok, position = _verify_rows(path, signing_key, start)
+    if ok and position != start:
+        write_checkpoint(path, position["lines"], position["offset"], position["line_offset"], position["hash_self"], signing_key)
+    return ok
 
 
 def main() -> int:
@@ -126,7 +193,9 @@ def main() -> int:
     append.add_argument("--actor", required=True)
     append.add_argument("--payload-json", required=True)
 
-    sub.add_parser("verify")
+    verify = sub.add_parser("verify")
+    verify.add_argument("--incremental", action="store_true", help="Verify only rows after the last signed checkpoint.")
+    verify.add_argument("--active-only", action="store_true", help="Trust sealed segments on the manifest instead of re-verifying their rows.")
 
     args = parser.parse_args()
     signing_key = os.environ.get(args.signing_key_env, "demo-local-signing-key")
@@ -135,7 +204,7 @@ def main() -> int:
         record = append_audit_record(path, args.event_type, args.actor, json.loads(args.payload_json), signing_key)
         print(json.dumps(asdict(record), indent=2))
         return 0
-    ok = verify_audit_chain(path, signing_key)
+    ok = verify_audit_chain_incremental(path, signing_key) if args.incremental else verify_audit_chain(path, signing_key, args.active_only)
     print(json.dumps({"ok": ok}))
     return 0 if ok else 1
 
@@ -0,0 +1,285 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from array import array
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+try:
+    import numpy as np
+except ImportError:  # Optional: columns stay stdlib arrays and aggregate in pure Python.
+    np = None
+
+from ve_ledger_io import read_manifest, tail_hash
+from ve_ledger_segments import iter_ledger_records
+
+
+COLUMNS_FORMAT = "ve-columns-1"
+# Fixed-width little-endian buffers; "str" columns hold int64 codes into a per-column dictionary.
+_TYPECODES = {"str": "q", "i8": "q", "f8": "d", "bool": "B"}
+_NP_DTYPES = {"str": "<i8", "i8": "<i8", "f8": "<f8", "bool": "u1"}
+
+ColumnSpec = tuple[str, str, Callable[[dict[str, Any]], Any]]
+
+
+def _field(name: str, default: Any = "") -> Callable[[dict[str, Any]], Any]:
+    return lambda record: record.get(name, default)
+
+
+RECEIPT_COLUMNS: tuple[ColumnSpec, ...] = (
+    ("receipt_id", "str", _field("receipt_id")),
+    ("timestamp", "str", _field("timestamp")),
+    ("actor_id", "str", _field("actor_id")),
+    ("agent_id", "str", _field("agent_id")),
+    ("model_id", "str", _field("model_id")),
+    ("provider_id", "str", _field("provider_id")),
+    ("route_id", "str", _field("route_id")),
+    ("action_lane", "str", _field("action_lane")),
+    ("tool_name", "str", _field("tool_name")),
+    ("decision", "str", _field("decision")),
+    ("fallback_status", "str", _field("fallback_status", "none")),
+    ("consent_scope_present", "bool", _field("consent_scope_present", False)),
+    ("dry_run", "bool", lambda record: dict(record.get("gate_inputs", {})).get("dry_run", False)),
+    ("rho", "f8", _field("rho", 0.0)),
+    ("delta", "f8", _field("delta", 0.0)),
+    ("files_touched", "i8", lambda record: len(record.get("files_touched", []))),
+)
+
+
+class ColumnTable:
+    """Append-only named columns backed by stdlib arrays.
+
+    String columns are dictionary-encoded: codes follow first appearance, so
+    group-by results come out in the order groups were first seen. When NumPy
+    is installed, columns are exposed as zero-copy NumPy views.
+    """
+
+    def __init__(self, kinds: dict[str, str]) -> None:
+        self.kinds = dict(kinds)
+        self.rows = 0
+        self._data = {name: array(_TYPECODES[kind]) for name, kind in self.kinds.items()}
+        self.dictionaries: dict[str, list[str]] = {name: [] for name, kind in self.kinds.items() if kind == "str"}
+        self._codes: dict[str, dict[str, int]] = {name: {} for name in self.dictionaries}
+
+    def append(self, row: dict[str, Any]) -> None:
+        for name, kind in self.kinds.items():
+            value = row[name]
+            if kind == "str":
+                value = str(value)
+                codes = self._codes[name]
+                code = codes.get(value)
+                if code is None:
+                    code = codes[value] = len(self.dictionaries[name])
+                    self.dictionaries[name].append(value)
+                self._data[name].append(code)
+            elif kind == "f8":
+                self._data[name].append(float(value))
+            else:
+                self._data[name].append(int(value))
+        self.rows += 1
+
+    def raw(self, name: str) -> Any:
+        """Return the column buffer: a NumPy view when available, else the stdlib array."""
+        data = self._data[name]
+        if np is not None:
+            return np.frombuffer(data, dtype=data.typecode) if len(data) else np.zeros(0, dtype=data.typecode)
+        return data
+
+    def code_of(self, name: str, value: str) -> int | None:
+        return self._codes[name].get(value)
+
+    def values(self, name: str) -> list[Any]:
+        if self.kinds[name] == "str":
+            dictionary = self.dictionaries[name]
+            return [dictionary[code] for code in self._data[name]]
+        if self.kinds[name] == "bool":
+            return [bool(item) for item in self._data[name]]
+        return list(self._data[name])
+
+    def save(self, directory: Path, meta: dict[str, Any] | None = None) -> None:
+        directory.mkdir(parents=True, exist_ok=True)
+        for name, data in self._data.items():
+            target = directory / f"{name}.bin"
+            temp = target.with_name(target.name + ".tmp")
+            buffer = array(data.typecode, data)
+            if sys.byteorder == "big":
+                buffer.byteswap()
+            with temp.open("wb") as handle:
+                buffer.tofile(handle)
+            os.replace(temp, target)
+        index = {
+            "format": COLUMNS_FORMAT,
+            "rows": self.rows,
+            "kinds": self.kinds,
+            "dictionaries": self.dictionaries,
+            "meta": meta or {},
+        }
+        target = directory / "columns.json"
+        temp = target.with_name(target.name + ".tmp")
+        temp.write_text(json.dumps(index, sort_keys=True) + "\n", encoding="utf-8")
+        os.replace(temp, target)
+
+    @classmethod
+    def load(cls, directory: Path) -> tuple[ColumnTable, dict[str, Any]]:
+        index = json.loads((directory / "columns.json").read_text(encoding="utf-8"))
+        if index.get("format") != COLUMNS_FORMAT:
+            raise ValueError(f"unsupported column format: {index.get('format')!r}")
+        table = cls(index["kinds"])
+        table.rows = int(index["rows"])
+        for name, kind in table.kinds.items():
+            data = array(_TYPECODES[kind])
+            with (directory / f"{name}.bin").open("rb") as handle:
+                data.fromfile(handle, table.rows)
+            if sys.byteorder == "big":
+                data.byteswap()
+            table._data[name] = data
+        for name, dictionary in index["dictionaries"].items():
+            table.dictionaries[name] = list(dictionary)
+            table._codes[name] = {value: code for code, value in enumerate(dictionary)}
+        return table, dict(index.get("meta", {}))
+
+
+def _mask(table: ColumnTable, column: str, value: Any) -> Any:
+    """Row mask for column == value as a NumPy bool array or a Python list."""
+    kind = table.kinds[column]
+    target = table.code_of(column, str(value)) if kind == "str" else value
+    if kind == "str" and target is None:
+        target = -1
+    data = table.raw(column)
+    if np is not None:
+        return data == target
+    return [item == target for item in data]
+
+
+def group_count(table: ColumnTable, by: str, where: tuple[str, Any] | None = None) -> dict[str, int]:
+    """Rows per group of a string column, optionally counting only rows where column == value."""
+    groups = table.dictionaries[by]
+    codes = table.raw(by)
+    if np is not None:
+        weights = None if where is None else _mask(table, *where)
+        counts = np.bincount(codes, weights=weights, minlength=len(groups))
+        return {group: int(counts[code]) for code, group in enumerate(groups)}
+    totals = [0] * len(groups)
+    mask = None if where is None else _mask(table, *where)
+    for row, code in enumerate(codes):
+        if mask is None or mask[row]:
+            totals[code] += 1
+    return {group: totals[code] for code, group in enumerate(groups)}
+
+
+def group_sum(table: ColumnTable, by: str, column: str) -> dict[str, float]:
+    groups = table.dictionaries[by]
+    codes = table.raw(by)
+    values = table.raw(column)
+    if np is not None:
+        sums = np.bincount(codes, weights=values.astype("f8"), minlength=len(groups))
+        return {group: float(sums[code]) for code, group in enumerate(groups)}
+    totals = [0.0] * len(groups)
+    for code, value in zip(codes, values):
+        totals[code] += value
+    return {group: totals[code] for code, group in enumerate(groups)}
+
+
+def group_max(table: ColumnTable, by: str, column: str, initial: float = float("-inf")) -> dict[str, float]:
+    """Largest value per group, never below initial."""
+    groups = table.dictionaries[by]
+    codes = table.raw(by)
+    values = table.raw(column)
+    if np is not None:
+        peaks = np.full(len(groups), initial, dtype="f8")
+        np.maximum.at(peaks, codes, values)
+        return {group: float(peaks[code]) for code, group in enumerate(groups)}
+    peaks = [initial] * len(groups)
+    for code, value in zip(codes, values):
+        if value > peaks[code]:
+            peaks[code] = value
+    return {group: peaks[code] for code, group in enumerate(groups)}
+
+
+def count_where(table: ColumnTable, column: str, value: Any) -> int:
+    mask = _mask(table, column, value)
+    return int(mask.sum()) if np is not None else sum(mask)
+
+
+def column_max(table: ColumnTable, column: str, default: float = 0.0) -> float:
+    if table.rows == 0:
+        return default
+    data = table.raw(column)
+    return float(data.max()) if np is not None else max(data)
+
+
+def build_table(specs: Iterable[ColumnSpec], records: Iterable[dict[str, Any]]) -> ColumnTable:
+    specs = tuple(specs)
+    table = ColumnTable({name: kind for name, kind, _ in specs})
+    for record in records:
+        table.append({name: getter(record) for name, _, getter in specs})
+    return table
+
+
+def columns_dir(path: Path) -> Path:
+    return path.with_name(path.name + ".columns")
+
+
+def _source_state(path: Path) -> dict[str, Any]:
+    return {"tail_hash": tail_hash(path), "segments": len(read_manifest(path)["segments"])}
+
+
+def export_receipt_columns(path: Path) -> ColumnTable:
+    """Export every receipt, sealed segments included, into <ledger>.columns/."""
+    state = _source_state(path)
+    table = build_table(RECEIPT_COLUMNS, iter_ledger_records(path))
+    table.save(columns_dir(path), state)
+    return table
+
+
+def receipt_columns(path: Path) -> ColumnTable:
+    """Load the columnar export, re-exporting first if the ledger has moved past it."""
+    try:
+        table, meta = ColumnTable.load(columns_dir(path))
+    except (OSError, ValueError, KeyError):
+        return export_receipt_columns(path)
+    if meta != _source_state(path):
+        return export_receipt_columns(path)
+    return table
+
+
+def summarize_receipts(table: ColumnTable, by: str = "decision") -> dict[str, Any]:
+    counts = group_count(table, by)
+    rho = group_sum(table, by, "rho")
+    delta = group_max(table, by, "delta")
+    decisions = {decision: group_count(table, by, ("decision", decision)) for decision in ("PROCEED", "PAUSE", "ABORT", "SAFE_MODE")}
+    groups = [
+        {
+            by: group,
+            "receipts": counts[group],
+            "decisions": {decision: per_group[group] for decision, per_group in decisions.items() if per_group[group]},
+            "mean_rho": rho[group] / counts[group],
+            "max_delta": delta[group],
+        }
+        for group in table.dictionaries[by]
+    ]
+    return {"receipts": table.rows, "by": by, "groups": groups}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Columnar export and summaries for receipt ledgers")
+    parser.add_argument("--ledger", default="receipts/demo_receipts.jsonl")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("export")
+    summary = sub.add_parser("summary")
+    summary.add_argument("--by", default="decision", choices=[name for name, kind, _ in RECEIPT_COLUMNS if kind == "str"])
+    args = parser.parse_args()
+    ledger = Path(args.ledger)
+    if args.command == "export":
+        table = export_receipt_columns(ledger)
+        print(json.dumps({"ledger": str(ledger), "columns": str(columns_dir(ledger)), "rows": table.rows}, indent=2))
+        return 0
+    print(json.dumps(summarize_receipts(receipt_columns(ledger), args.by), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -4,8 +4,11 @@ import argparse
 import json
 from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
+from contextlib import closing
 from pathlib import Path
 
+from ve_storage import SqliteTable, is_sqlite
+
 
 CONTACT_TYPES = {"human", "ai", "service", "group"}
 CADENCES = {"regular", "occasional", "rare", "paused"}
@@ -27,6 +30,9 @@ class Contact:
 def load_contacts(path: Path) -> list[Contact]:
     if not path.exists():
         return []
+    if is_sqlite(path):
+        with closing(SqliteTable(path)) as table:
+            return sorted((Contact(**item) for item in table.values()), key=lambda item: item.display_name.lower())
     contacts = []
     with path.open("r", encoding="utf-8") as handle:
         for line in handle:
@@ -37,12 +43,20 @@ def load_contacts(path: Path) -> list[Contact]:
 
 
 def save_contacts(path: Path, contacts: list[Contact]) -> None:
+    if is_sqlite(path):
+        with closing(SqliteTable(path)) as table:
+            table.replace({contact.contact_id: asdict(contact) for contact in contacts})
+        return
     path.parent.mkdir(parents=True, exist_ok=True)
     text = "\n".join(json.dumps(asdict(contact), sort_keys=True) for contact in contacts)
     path.write_text(text + ("\n" if text else ""), encoding="utf-8")
 
 
 def upsert_contact(path: Path, contact: Contact) -> Contact:
+    if is_sqlite(path):
+        with closing(SqliteTable(path)) as table:
+            table.put(contact.contact_id, asdict(contact))
+        return contact
     contacts = load_contacts(path)
     remaining = [item for item in contacts if item.contact_id != contact.contact_id]
     remaining.append(contact)
@@ -51,8 +65,14 @@ def upsert_contact(path: Path, contact: Contact) -> Contact:
 
 
 def record_interaction(path: Path, contact_id: str, timestamp_utc: str | None = None) -> Contact:
-    contacts = load_contacts(path)
     timestamp_utc = timestamp_utc or datetime.now(timezone.utc).isoformat()
+    if is_sqlite(path):
+        with closing(SqliteTable(path)) as table:
+            found = table.update(contact_id, lambda item: {**item, "last_interaction_utc": timestamp_utc, "status": "active"})
+        if found is None:
+            raise ValueError(f"unknown contact_id: {contact_id}")
+        return Contact(**found)
+    contacts = load_contacts(path)
     updated = None
     new_contacts = []
     for contact in contacts:
@@ -113,7 +133,7 @@ def checkin_suggestions(path: Path, now: datetime | None = None) -> list[dict]:
 
 def main() -> int:
     parser = argparse.ArgumentParser(description="VE contact registry for human/AI interaction context")
-    parser.add_argument("--contacts", default="ve_data/contacts.jsonl")
+    parser.add_argument("--contacts", default="ve_data/contacts.jsonl", help="A .sqlite path selects the SQLite store.")
     sub = parser.add_subparsers(dest="command", required=True)
 
     add = sub.add_parser("add")
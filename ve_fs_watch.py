@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+from pathlib import Path
+
+
+class DirectoryWatcher:
+    """Linux inotify watch over individual directories (not recursive).
+
+    Callers only need to know whether anything changed, so events are
+    drained as (directory, mask, name) and otherwise left uninterpreted.
+    Construction raises OSError where inotify is unavailable.
+    """
+
+    IN_ISDIR = 0x40000000
+    IN_CREATE = 0x100
+    IN_MOVED_TO = 0x80
+    _IN_NONBLOCK = 0o4000
+    _IN_CLOEXEC = 0o2000000
+    _MASK = 0x2 | 0x4 | 0x8 | 0x40 | 0x80 | 0x100 | 0x200 | 0x400 | 0x800  # modify, attrib, close_write, moves, create, deletes
+    _EVENT = struct.Struct("iIII")
+
+    def __init__(self) -> None:
+        if not sys.platform.startswith("linux"):
+            raise OSError(errno.ENOSYS, "inotify is only available on Linux")
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = self._libc.inotify_init1(self._IN_NONBLOCK | self._IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.paths: dict[int, Path] = {}
+        self._watched: set[Path] = set()
+
+    def watch(self, directory: Path) -> None:
+        """Watch directory's direct entries; repeated calls are free. A directory that vanished is skipped."""
+        if directory in self._watched:
+            return
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), self._MASK)
+        if wd < 0:
+            code = ctypes.get_errno()
+            if code in (errno.ENOENT, errno.ENOTDIR, errno.EACCES):
+                return
+            raise OSError(code, f"inotify_add_watch failed for {directory}")
+        self.paths[wd] = directory
+        self._watched.add(directory)
+
+    def events(self) -> list[tuple[Path, int, str]]:
+        """Drain pending events without blocking."""
+        drained: list[tuple[Path, int, str]] = []
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                return drained
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = self._EVENT.unpack_from(data, offset)
+                name = data[offset + self._EVENT.size : offset + self._EVENT.size + length].rstrip(b"\0")
+                offset += self._EVENT.size + length
+                directory = self.paths.get(wd)
+                if directory is not None:
+                    drained.append((directory, mask, os.fsdecode(name)))
+                    if mask & 0x8000:  # IN_IGNORED: the watch is gone, so a recreated directory needs a new one.
+                        del self.paths[wd]
+                        self._watched.discard(directory)
+
+    def changed(self) -> bool:
+        """Drain pending events; True if any arrived since the last call."""
+        return bool(self.events())
+
+    def wait(self, timeout: float | None) -> bool:
+        """Block until an event is pending or timeout seconds pass, then drain; True if events arrived."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        return bool(ready) and self.changed()
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
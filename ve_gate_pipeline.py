@@ -4,13 +4,12 @@ import argparse
 import json
 import os
 import uuid
-from dataclasses import asdict
 from pathlib import Path
 
-from ve_audit_chain import append_audit_record, verify_audit_chain
+from ve_audit_chain import append_audit_record, verify_audit_chain_incremental
 from ve_deviation_classifier import classify_deviation
 from ve_pairing_gate_context import build_pairing_gate_payload
-from ve_twin_state import load_twin, predicted_delta, update_twin
+from ve_twin_state import load_twin, predicted_delta, twin_drift, twin_record, update_twin
 
 
 def run_gate_pipeline(
@@ -31,7 +30,7 @@ def run_gate_pipeline(
     delta: float = 0.30,
     pairing_id: str = "default-pairing",
     audit_ledger: Path = Path("ve_data/gate_pipeline_audit.jsonl"),
-    twin_state_path: Path = Path("ve_data/twin_state.json"),
+    twin_state_path: Path = Path("ve_data/twin_state.sqlite"),
     signing_key: str = "demo-local-signing-key",
 ) -> dict:
     gate_payload = build_pairing_gate_payload(
@@ -69,7 +68,8 @@ def run_gate_pipeline(
         "gamma": gamma,
         "delta": delta,
         "twin_delta": twin_gap,
-        "twin_baseline": asdict(twin_before),
+        "twin_drift": twin_drift(twin_before, delta),
+        "twin_baseline": twin_record(twin_before),
         "clarification_required": pairing.get("clarification_required", False),
         "clarification_resolved": pairing.get("clarification_resolved", False),
         "clarification_resolved_by": pairing.get("clarification_resolved_by", ""),
@@ -86,7 +86,7 @@ def run_gate_pipeline(
             payload=response,
             signing_key=signing_key,
         )
-        chain_valid = verify_audit_chain(audit_ledger, signing_key)
+        chain_valid = verify_audit_chain_incremental(audit_ledger, signing_key)
     except Exception as exc:
         return {
             **response,
@@ -117,7 +117,7 @@ def run_gate_pipeline(
         "audit_record_id": audit_record.hash_self,
         "audit_chain_valid": True,
         "audit_fail_closed": False,
-        "twin_state_updated": asdict(twin_after),
+        "twin_state_updated": twin_record(twin_after),
     }
 
 
@@ -140,7 +140,7 @@ def main() -> int:
     parser.add_argument("--delta", type=float, default=0.30)
     parser.add_argument("--pairing-id", default="default-pairing")
     parser.add_argument("--audit-ledger", default="ve_data/gate_pipeline_audit.jsonl")
-    parser.add_argument("--twin-state", default="ve_data/twin_state.json")
+    parser.add_argument("--twin-state", default="ve_data/twin_state.sqlite")
     parser.add_argument("--signing-key-env", default="VE_AUDIT_SIGNING_KEY")
     args = parser.parse_args()
 
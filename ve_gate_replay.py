@@ -1,13 +1,20 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
 import os
 from dataclasses import asdict, dataclass
+from functools import lru_cache
 from pathlib import Path
+from typing import Any, Iterator
 
+import ve_deviation_classifier
 from ve_audit_chain import verify_audit_chain
+from ve_columnar import ColumnTable, column_max, group_count, group_max
 from ve_deviation_classifier import classify_deviation
+from ve_ledger_io import ZERO_HASH, chain_origin, iter_records, record_before
+from ve_ledger_segments import iter_ledger_records, iter_sealed_records
 
 
 @dataclass(frozen=True)
@@ -28,91 +35,203 @@ class ReplayRecord:
     classifier_changed: bool
 
 
+REPLAY_COLUMN_KINDS = {"pairing_id": "str", "replay_deviation_class": "str", "classifier_changed": "bool", "twin_delta": "f8"}
+AUDIT_REPLAY_FIELDS = ("event_type", "payload", "hash_self")
+
+
+def iter_audit_records(path: Path, fields: tuple[str, ...] | None = None) -> Iterator[dict]:
+    return iter_records(path, fields)
+
+
 def load_audit_records(path: Path) -> list[dict]:
-    if not path.exists():
-        return []
-    rows = []
-    with path.open("r", encoding="utf-8") as handle:
-        for line in handle:
-            if not line.strip():
-                continue
-            rows.append(json.loads(line))
-    return rows
-
-
-def replay_gate_audit(path: Path, signing_key: str) -> dict:
-    chain_valid = verify_audit_chain(path, signing_key)
-    records = []
-    for item in load_audit_records(path):
-        payload = item.get("payload", {})
-        if item.get("event_type") != "GATE_PIPELINE_DECISION":
-            continue
-        replay = classify_deviation(
-            payload.get("expected_decision", "PROPOSE"),
-            payload.get("actual_decision", "ABORT"),
-            ttl_expired=False,
-            delta=float(payload.get("delta", 0.0)),
-        )
-        records.append(
-            ReplayRecord(
-                trace_id=payload.get("trace_id", ""),
-                pairing_id=payload.get("pairing_id", "default-pairing"),
-                event_type=item.get("event_type", ""),
-                action_class=payload.get("action_class", ""),
-                expected_decision=payload.get("expected_decision", ""),
-                actual_decision=payload.get("actual_decision", ""),
-                original_deviation_class=payload.get("deviation_class", ""),
-                replay_deviation_class=replay.classification,
-                replay_severity=replay.severity,
-                ttl_policy=payload.get("proposal_ttl_policy", ""),
-                clarification_required=bool(payload.get("clarification_required", False)),
-                twin_delta=float(payload.get("twin_delta", 0.0)),
-                audit_hash=item.get("hash_self", ""),
-                classifier_changed=payload.get("deviation_class", "") != replay.classification,
-            )
-        )
+    return list(iter_audit_records(path))
+
+
+def replay_record(item: dict) -> ReplayRecord | None:
+    """Re-classify one audit row, or None when it is not a gate pipeline decision."""
+    payload = item.get("payload", {})
+    if item.get("event_type") != "GATE_PIPELINE_DECISION":
+        return None
+    replay = classify_deviation(
+        payload.get("expected_decision", "PROPOSE"),
+        payload.get("actual_decision", "ABORT"),
+        ttl_expired=False,
+        delta=float(payload.get("delta", 0.0)),
+    )
+    return ReplayRecord(
+        trace_id=payload.get("trace_id", ""),
+        pairing_id=payload.get("pairing_id", "default-pairing"),
+        event_type=item.get("event_type", ""),
+        action_class=payload.get("action_class", ""),
+        expected_decision=payload.get("expected_decision", ""),
+        actual_decision=payload.get("actual_decision", ""),
+        original_deviation_class=payload.get("deviation_class", ""),
+        replay_deviation_class=replay.classification,
+        replay_severity=replay.severity,
+        ttl_policy=payload.get("proposal_ttl_policy", ""),
+        clarification_required=bool(payload.get("clarification_required", False)),
+        twin_delta=float(payload.get("twin_delta", 0.0)),
+        audit_hash=item.get("hash_self", ""),
+        classifier_changed=payload.get("deviation_class", "") != replay.classification,
+    )
 
-    sessions: dict[str, dict] = {}
-    for record in records:
-        session = sessions.setdefault(
-            record.pairing_id,
+
+def iter_replay_records(path: Path, active_only: bool = False) -> Iterator[ReplayRecord]:
+    """Replay every gate decision of the ledger in order, one row at a time."""
+    for item in iter_ledger_records(path, AUDIT_REPLAY_FIELDS, active_only):
+        record = replay_record(item)
+        if record is not None:
+            yield record
+
+
+def _fold(table: ColumnTable, item: dict) -> None:
+    record = replay_record(item)
+    if record is not None:
+        table.append(
             {
                 "pairing_id": record.pairing_id,
-                "records": 0,
-                "adverse_events": 0,
-                "advisory_events": 0,
-                "max_twin_delta": 0.0,
-                "classifier_changes": 0,
-            },
+                "replay_deviation_class": record.replay_deviation_class,
+                "classifier_changed": record.classifier_changed,
+                "twin_delta": record.twin_delta,
+            }
         )
-        session["records"] += 1
-        if record.replay_deviation_class == "adverse_event":
-            session["adverse_events"] += 1
-        if record.replay_deviation_class == "advisory":
-            session["advisory_events"] += 1
-        if record.classifier_changed:
-            session["classifier_changes"] += 1
-        session["max_twin_delta"] = max(session["max_twin_delta"], record.twin_delta)
-
-    summary = {
+
+
+def replay_columns_dir(path: Path) -> Path:
+    return path.with_name(path.name + ".replay.columns")
+
+
+@lru_cache(maxsize=None)
+def _replay_logic() -> str:
+    """Fingerprint of the replay and classifier code; saved columns from other logic are rebuilt."""
+    digest = hashlib.sha256()
+    for source in (Path(__file__), Path(ve_deviation_classifier.__file__)):
+        digest.update(source.read_bytes())
+    return digest.hexdigest()
+
+
+def _cursor_holds(path: Path, cursor: Any) -> bool:
+    """O(1) check that the saved cursor still ends at the same row of the active segment."""
+    if not isinstance(cursor, dict):
+        return False
+    offset = int(cursor.get("offset", -1))
+    if offset == 0:
+        return cursor.get("hash") == chain_origin(path)
+    try:
+        found = record_before(path, offset)
+    except (OSError, ValueError):
+        return False
+    return found is not None and found[1].get("hash_self") == cursor.get("hash")
+
+
+def _fold_active(table: ColumnTable, path: Path, cursor: dict[str, Any]) -> dict[str, Any]:
+    """Fold complete active-segment rows after cursor into table and return the new cursor."""
+    offset, last_hash = int(cursor["offset"]), cursor["hash"]
+    try:
+        handle = path.open("rb")
+    except FileNotFoundError:
+        return cursor
+    with handle:
+        handle.seek(offset)
+        for line in handle:
+            if not line.endswith(b"\n"):
+                break
+            offset += len(line)
+            if line.strip():
+                item = json.loads(line)
+                last_hash = item.get("hash_self", ZERO_HASH)
+                _fold(table, {key: item[key] for key in AUDIT_REPLAY_FIELDS if key in item})
+    return {"offset": offset, "hash": last_hash}
+
+
+def replay_columns(path: Path) -> ColumnTable:
+    """Replay columns for the whole ledger, kept in <ledger>.replay.columns/ between runs.
+
+    Saved columns are reused while the replay logic and the chain origin are
+    unchanged and the row before the saved cursor still carries the saved
+    hash; only rows appended after the cursor are parsed and replayed.
+    Anything else rebuilds from the first sealed segment. The columns are a
+    cache: chain validity is still checked against the ledger itself.
+    """
+    directory = replay_columns_dir(path)
+    source = {"logic": _replay_logic(), "origin": chain_origin(path)}
+    try:
+        table, meta = ColumnTable.load(directory)
+    except (OSError, ValueError, KeyError, EOFError):
+        table, meta = None, {}
+    cursor = meta.get("cursor")
+    if table is None or table.kinds != REPLAY_COLUMN_KINDS or any(meta.get(key) != value for key, value in source.items()) or not _cursor_holds(path, cursor):
+        table = ColumnTable(REPLAY_COLUMN_KINDS)
+        for item in iter_sealed_records(path, AUDIT_REPLAY_FIELDS):
+            _fold(table, item)
+        cursor, meta = {"offset": 0, "hash": source["origin"]}, {}
+    moved = _fold_active(table, path, cursor)
+    if meta.get("cursor") != moved:
+        try:
+            table.save(directory, {**source, "cursor": moved})
+        except OSError:
+            pass
+    return table
+
+
+def _active_columns(path: Path) -> ColumnTable:
+    table = ColumnTable(REPLAY_COLUMN_KINDS)
+    for item in iter_ledger_records(path, AUDIT_REPLAY_FIELDS, active_only=True):
+        _fold(table, item)
+    return table
+
+
+def replay_gate_audit(path: Path, signing_key: str, active_only: bool = False, include_records: bool = False) -> dict:
+    """Verify the chain and summarize the replay from columns.
+
+    The full-history summary comes from the persisted replay columns, so a
+    run parses only rows appended since the last one. include_records adds
+    the per-row replay list, which does read every row.
+    """
+    chain_valid = verify_audit_chain(path, signing_key, active_only)
+    table = _active_columns(path) if active_only else replay_columns(path)
+    summary = summarize_replay(table, chain_valid)
+    if include_records:
+        summary["records"] = [asdict(item) for item in iter_replay_records(path, active_only)]
+    return summary
+
+
+def summarize_replay(table: ColumnTable, chain_valid: bool) -> dict:
+    counts = group_count(table, "pairing_id")
+    adverse = group_count(table, "pairing_id", ("replay_deviation_class", "adverse_event"))
+    advisory = group_count(table, "pairing_id", ("replay_deviation_class", "advisory"))
+    changes = group_count(table, "pairing_id", ("classifier_changed", True))
+    peaks = group_max(table, "pairing_id", "twin_delta", initial=0.0)
+    sessions = [
+        {
+            "pairing_id": pairing_id,
+            "records": counts[pairing_id],
+            "adverse_events": adverse[pairing_id],
+            "advisory_events": advisory[pairing_id],
+            "max_twin_delta": peaks[pairing_id],
+            "classifier_changes": changes[pairing_id],
+        }
+        for pairing_id in table.dictionaries["pairing_id"]
+    ]
+
+    return {
         "audit_chain_valid": chain_valid,
-        "records_replayed": len(records),
-        "adverse_events": sum(1 for item in records if item.replay_deviation_class == "adverse_event"),
-        "advisory_events": sum(1 for item in records if item.replay_deviation_class == "advisory"),
-        "max_twin_delta": max((item.twin_delta for item in records), default=0.0),
-        "classifier_changes": sum(1 for item in records if item.classifier_changed),
-        "sessions": list(sessions.values()),
-        "records": [asdict(item) for item in records],
+        "records_replayed": table.rows,
+        "adverse_events": sum(adverse.values()),
+        "advisory_events": sum(advisory.values()),
+        "max_twin_delta": column_max(table, "twin_delta", default=0.0),
+        "classifier_changes": sum(changes.values()),
+        "sessions": sessions,
     }
-    return summary
 
 
 def main() -> int:
     parser = argparse.ArgumentParser(description="Replay VE gate pipeline audit records")
     parser.add_argument("--ledger", default="ve_data/gate_pipeline_audit.jsonl")
     parser.add_argument("--signing-key-env", default="VE_AUDIT_SIGNING_KEY")
+    parser.add_argument("--active-only", action="store_true", help="Verify and replay only the active segment's rows.")
     args = parser.parse_args()
-    summary = replay_gate_audit(Path(args.ledger), os.environ.get(args.signing_key_env, "demo-local-signing-key"))
+    summary = replay_gate_audit(Path(args.ledger), os.environ.get(args.signing_key_env, "demo-local-signing-key"), args.active_only, include_records=True)
     print(json.dumps(summary, indent=2))
     return 0 if summary["audit_chain_valid"] else 1
 
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import ast
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Mapping, NamedTuple
+
+
+# Precedence, highest first. A SAFE_MODE rule beats any ABORT rule, and so on.
+TIERS = ("SAFE_MODE", "ABORT", "PAUSE", "PROCEED")
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+@dataclass(frozen=True)
+class Rule:
+    """One gate rule: when the expression `when` holds, the gate moves to `decision` for `reason`.
+
+    `when` is a Python expression over `source` (the request mapping), the
+    rule set's context names, its derived names, and its helper names. marker
+    and note are carried through untouched for the calling gate, for
+    difference-maker records and calibration text.
+    """
+
+    decision: str
+    reason: str
+    when: str
+    marker: Mapping[str, Any] | None = None
+    note: str = ""
+
+
+class Outcome(NamedTuple):
+    decision: str
+    rules: tuple[Rule, ...]
+
+    @property
+    def reasons(self) -> list[str]:
+        return [rule.reason for rule in self.rules]
+
+    @property
+    def markers(self) -> list[dict[str, Any]]:
+        return [dict(rule.marker) for rule in self.rules if rule.marker is not None]
+
+    @property
+    def note(self) -> str:
+        return self.rules[0].note
+
+
+def _referenced(expression: str) -> list[str]:
+    return list(dict.fromkeys(node.id for node in ast.walk(ast.parse(expression, mode="eval")) if isinstance(node, ast.Name)))
+
+
+class RuleSet:
+    """Gate rules compiled once into a single straight-line evaluator.
+
+    Rules may be declared in any order; compilation groups them into
+    SAFE_MODE > ABORT > PAUSE > PROCEED and keeps declaration order inside each
+    tier. SAFE_MODE and ABORT rules run first and the first match returns, so
+    PAUSE checks never run for a decided request. Every matching PAUSE rule is
+    reported. PROCEED rules are tried only when no PAUSE rule matched, and
+    default decides when nothing matched at all.
+
+    Each derived value is computed once, right before the first rule that
+    reads it, so costly derivations (path parsing, envelope geometry, charter
+    lookups) are skipped whenever an earlier rule already decided. The
+    generated code is kept on .source for review.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rules: Iterable[Rule],
+        default: Rule,
+        context: Mapping[str, Any] | None = None,
+        derive: Mapping[str, str] | None = None,
+        names: Mapping[str, Any] | None = None,
+    ) -> None:
+        self.name = name
+        self.rules = tuple(rules)
+        self.default = default
+        self.context = dict(context or {})
+        self.derive = dict(derive or {})
+        for rule in (*self.rules, default):
+            if rule.decision not in TIERS:
+                raise ValueError(f"rule {rule.reason!r} has unknown decision {rule.decision!r}")
+        for key in (*self.context, *self.derive):
+            if not _IDENTIFIER.match(key) or key == "source" or key.startswith("_"):
+                raise ValueError(f"invalid rule set name {key!r}")
+        self.source = self._generate("_evaluate", False) + "\n\n" + self._generate("_decide", True)
+        namespace: dict[str, Any] = dict(names or {})
+        namespace.update(_RULES=self.rules, _DEFAULT=Outcome(default.decision, (default,)), _CONTEXT=self.context, _Outcome=Outcome)
+        namespace.update({f"_HIT{index}": Outcome(rule.decision, (rule,)) for index, rule in enumerate(self.rules)})
+        exec(compile(self.source, f"<gate rules {name}>", "exec"), namespace)
+        # evaluate(source, **context) -> Outcome; decide(source, **context) -> (decision, reasons)
+        # is the fast path for gates that need no markers.
+        self.evaluate: Callable[..., Outcome] = namespace["_evaluate"]
+        self.decide: Callable[..., tuple[str, list[str]]] = namespace["_decide"]
+
+    def _generate(self, function: str, reasons_only: bool) -> str:
+        """Emit one evaluator; reasons_only returns (decision, [reason, ...]) instead of an Outcome."""
+        params = "".join(f", {key}=_CONTEXT[{key!r}]" for key in self.context)
+        lines = [f"def {function}(source, *{params}):"]
+        ready = set(self.context)
+
+        def need(expression: str, stack: tuple[str, ...] = ()) -> None:
+            for key in _referenced(expression):
+                if key in self.derive and key not in ready:
+                    if key in stack:
+                        raise ValueError(f"derived value {key!r} depends on itself")
+                    need(self.derive[key], stack + (key,))
+                    lines.append(f"    {key} = {self.derive[key]}")
+                    ready.add(key)
+
+        def decided(index: int, rule: Rule) -> str:
+            return f"        return {rule.decision!r}, [{rule.reason!r}]" if reasons_only else f"        return _HIT{index}"
+
+        order = {tier: [(index, rule) for index, rule in enumerate(self.rules) if rule.decision == tier] for tier in TIERS}
+        for index, rule in order["SAFE_MODE"] + order["ABORT"]:
+            need(rule.when)
+            lines += [f"    if {rule.when}:", decided(index, rule)]
+        if order["PAUSE"]:
+            lines.append("    _paused = []")
+            for index, rule in order["PAUSE"]:
+                need(rule.when)
+                lines += [f"    if {rule.when}:", f"        _paused.append({rule.reason!r})" if reasons_only else f"        _paused.append(_RULES[{index}])"]
+            lines += ["    if _paused:", "        return 'PAUSE', _paused" if reasons_only else "        return _Outcome('PAUSE', tuple(_paused))"]
+        for index, rule in order["PROCEED"]:
+            need(rule.when)
+            lines += [f"    if {rule.when}:", decided(index, rule)]
+        lines.append(f"    return {self.default.decision!r}, [{self.default.reason!r}]" if reasons_only else "    return _DEFAULT")
+        return "\n".join(lines) + "\n"
@@ -1,15 +1,23 @@
 # ve_gatecheck.py
 import random, json
 
+from ve_gate_rules import Rule, RuleSet
+
 GATE_RULE = "PROCEED iff rho>=0.70 and gamma>=0.70 and delta<=0.30; ABORT if delta>0.40 or gamma<0.65; else PAUSE"
 
+# The PROCEED and ABORT conditions never overlap, so tier order gives GATE_RULE's results.
+GATE_RULES = RuleSet(
+    "gatecheck",
+    [
+        Rule("ABORT", "delta above 0.40 or gamma below 0.65", "delta > 0.40 or gamma < 0.65"),
+        Rule("PROCEED", "rho, gamma and delta within thresholds", "rho >= 0.70 and gamma >= 0.70 and delta <= 0.30"),
+    ],
+    default=Rule("PAUSE", "thresholds not met", "True"),
+    context={"rho": 0.0, "gamma": 0.0, "delta": 1.0},
+)
+
 def gate(rho, gamma, delta):
-    if rho >= 0.70 and gamma >= 0.70 and delta <= 0.30:
-        return "PROCEED"
-    elif delta > 0.40 or gamma < 0.65:
-        return "ABORT"
-    else:
-        return "PAUSE"
+    return GATE_RULES.decide({}, rho=rho, gamma=gamma, delta=delta)[0]
 
 def main(n=5, seed=None):
     if seed is not None:
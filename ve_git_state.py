@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from ve_fs_watch import DirectoryWatcher
+
+
+class GitState(NamedTuple):
+    branch: str
+    dirty: bool
+
+
+def find_git_dir(root: Path) -> Path | None:
+    """Return the git directory for root, following `gitdir:` files used by worktrees and submodules."""
+    for candidate in (root, *root.parents):
+        marker = candidate / ".git"
+        if marker.is_dir():
+            return marker
+        if marker.is_file():
+            text = marker.read_text(encoding="utf-8", errors="replace").strip()
+            if text.startswith("gitdir:"):
+                target = Path(text[len("gitdir:") :].strip())
+                return target if target.is_absolute() else (candidate / target).resolve()
+    return None
+
+
+def _stamp(path: Path) -> tuple[int, int, int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+def _run_git(root: Path, args: list[str]) -> str:
+    try:
+        return subprocess.check_output(["git", *args], cwd=root, text=True, stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return ""
+
+
+class _WorktreeWatcher(DirectoryWatcher):
+    """Inotify watch over the non-ignored directories of a worktree, following newly created directories."""
+
+    def __init__(self, root: Path, ignored: set[Path]) -> None:
+        super().__init__()
+        self.root = root
+        self.ignored = ignored
+        try:
+            self._watch_tree(root)
+        except OSError:
+            self.close()
+            raise
+
+    def _watch_tree(self, top: Path) -> None:
+        for directory, subdirs, _ in os.walk(top):
+            current = Path(directory)
+            subdirs[:] = [name for name in subdirs if name != ".git" and (current / name) not in self.ignored]
+            self.watch(current)
+
+    def changed(self) -> bool:
+        events = self.events()
+        for directory, mask, name in events:
+            if mask & self.IN_ISDIR and mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                created = directory / name
+                if created.name != ".git" and not _run_git(self.root, ["check-ignore", "--", str(created)]):
+                    self._watch_tree(created)
+        return bool(events)
+
+
+class GitStateCache:
+    """Branch and dirty state for a worktree without running git on the hot path.
+
+    The branch is read straight from HEAD. With the worktree watcher running,
+    `git status --porcelain` runs only when HEAD, the current branch ref, or
+    the index has changed since the last answer, or when the watcher saw a
+    change. Without a watcher (start_watching not called, not on Linux, or
+    root is not the worktree top, or a new directory could not be watched),
+    every answer is re-checked: an unstaged edit, or reverting one, touches
+    none of those files.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.git_dir = find_git_dir(root)
+        self.watcher: _WorktreeWatcher | None = None
+        self.refreshes = 0
+        self._key: Any = None
+        self._state: GitState | None = None
+
+    def start_watching(self, exclude: tuple[Path, ...] = ()) -> bool:
+        """Watch the worktree with inotify so answers can be reused. Returns False where unsupported.
+
+        Ignored directories and exclude are not watched; changes there never
+        invalidate the cached answer.
+        """
+        if self.watcher is not None:
+            return True
+        if not sys.platform.startswith("linux") or not (self.root / ".git").exists():
+            return False
+        listing = _run_git(self.root, ["ls-files", "-z", "--others", "--ignored", "--exclude-standard", "--directory"])
+        ignored = {self.root / item.rstrip("/") for item in listing.split("\0") if item.endswith("/")}
+        ignored.update(Path(item) for item in exclude)
+        try:
+            self.watcher = _WorktreeWatcher(self.root, ignored)
+        except OSError:
+            return False
+        self._key = None
+        return True
+
+    def close(self) -> None:
+        if self.watcher is not None:
+            self.watcher.close()
+            self.watcher = None
+
+    def branch(self) -> str:
+        """Current branch name, or "" when HEAD is detached (as `git branch --show-current`)."""
+        if self.git_dir is None:
+            return _run_git(self.root, ["branch", "--show-current"])
+        try:
+            head = (self.git_dir / "HEAD").read_text(encoding="utf-8").strip()
+        except OSError:
+            return ""
+        return head[len("ref: refs/heads/") :] if head.startswith("ref: refs/heads/") else ""
+
+    def _common_dir(self) -> Path:
+        assert self.git_dir is not None
+        try:
+            common = (self.git_dir / "commondir").read_text(encoding="utf-8").strip()
+        except OSError:
+            return self.git_dir
+        return (self.git_dir / common).resolve()
+
+    def _invalidation_key(self, branch: str) -> Any:
+        assert self.git_dir is not None
+        common = self._common_dir()
+        ref = common / "refs" / "heads" / branch if branch else common / "packed-refs"
+        return (
+            branch,
+            _stamp(self.git_dir / "HEAD"),
+            _stamp(self.git_dir / "index"),
+            _stamp(ref),
+            _stamp(common / "packed-refs"),
+        )
+
+    def state(self) -> GitState:
+        branch = self.branch()
+        if self.git_dir is None:
+            self.refreshes += 1
+            return GitState(branch, bool(_run_git(self.root, ["status", "--porcelain"])))
+        key = self._invalidation_key(branch)
+        touched = False
+        if self.watcher is not None:
+            try:
+                touched = self.watcher.changed()
+            except OSError:
+                # A new directory could not be watched (e.g. out of inotify watches): re-check every answer from now on.
+                self.close()
+        if self.watcher is not None and self._state is not None and key == self._key and not touched:
+            return GitState(branch, self._state.dirty)
+        dirty = bool(_run_git(self.root, ["status", "--porcelain"]))
+        self.refreshes += 1
+        # git status may refresh the index stat cache, so key the answer on the state it leaves behind.
+        self._key = self._invalidation_key(branch)
+        self._state = GitState(branch, dirty)
+        return self._state
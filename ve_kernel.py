@@ -10,6 +10,8 @@ from datetime import datetime
 from typing import List
 from contextlib import redirect_stdout
 
+from ve_gate_rules import Rule, RuleSet
+
 EXIT_OK = 0
 EXIT_FAIL = 1
 
@@ -136,32 +138,34 @@ def sanitize_payload(payload: str) -> str:
 # ------------------------------------------------
 # POLICY NORMALIZATION
 # ------------------------------------------------
+POLICY_RULES = RuleSet(
+    "kernel_policy",
+    [
+        Rule("ABORT", "unknown_route_hint", "route_hint not in ALLOWED_ROUTE_HINTS"),
+        Rule("ABORT", "unknown_decision", "decision not in {'PROCEED', 'PAUSE', 'ABORT'}"),
+        Rule("ABORT", "decision_abort", "decision == 'ABORT'"),
+        Rule("ABORT", "route_hint_blocked", "route_hint == 'blocked'"),
+        Rule("PAUSE", "decision_pause", "decision == 'PAUSE'"),
+        Rule("PAUSE", "route_hint_safe_only", "decision == 'PROCEED' and route_hint == 'safe_only'"),
+        Rule("PROCEED", "decision_proceed", "decision == 'PROCEED' and route_hint == 'normal'"),
+    ],
+    default=Rule("ABORT", "fallback_fail_closed", "True"),
+    context={"decision": "ABORT", "route_hint": "blocked"},
+    names={"ALLOWED_ROUTE_HINTS": ALLOWED_ROUTE_HINTS},
+)
+POLICY_ROUTES = {"PROCEED": "proceed", "PAUSE": "safe_mode", "ABORT": "blocked"}
+
+
 def normalize_policy(decision: str, route_hint: str):
     decision = (decision or "ABORT").upper()
     route_hint = (route_hint or "blocked").lower()
-
-    if route_hint not in ALLOWED_ROUTE_HINTS:
-        return "ABORT", "blocked", f"unknown_route_hint:{route_hint}"
-
-    if decision not in {"PROCEED", "PAUSE", "ABORT"}:
-        return "ABORT", "blocked", f"unknown_decision:{decision}"
-
-    if decision == "ABORT":
-        return "ABORT", "blocked", "decision_abort"
-
-    if route_hint == "blocked":
-        return "ABORT", "blocked", "route_hint_blocked"
-
-    if decision == "PAUSE":
-        return "PAUSE", "safe_mode", "decision_pause"
-
-    if decision == "PROCEED" and route_hint == "safe_only":
-        return "PAUSE", "safe_mode", "route_hint_safe_only"
-
-    if decision == "PROCEED" and route_hint == "normal":
-        return "PROCEED", "proceed", "decision_proceed"
-
-    return "ABORT", "blocked", "fallback_fail_closed"
+    verdict, reasons = POLICY_RULES.decide({}, decision=decision, route_hint=route_hint)
+    reason = reasons[0]
+    if reason == "unknown_route_hint":
+        reason = f"unknown_route_hint:{route_hint}"
+    elif reason == "unknown_decision":
+        reason = f"unknown_decision:{decision}"
+    return verdict, POLICY_ROUTES[verdict], reason
 
 # ------------------------------------------------
 # SAFE MODE TIERING (fallback keyword logic)
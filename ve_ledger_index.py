@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+from contextlib import closing
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterator
+
+from ve_ledger_io import index_path, ledger_lock, read_record_at, scan_records
+
+
+INDEX_FIELDS = (
+    "receipt_id",
+    "event_id",
+    "proposal_id",
+    "trace_id",
+    "pairing_id",
+    "decision",
+    "actor_id",
+    "timestamp",
+)
+# Audit chain rows use short names at the top level and keep gate fields in payload.
+_RECORD_ALIASES = {"ts": "timestamp", "actor": "actor_id"}
+_PAYLOAD_ALIASES = {"trace_id": "trace_id", "pairing_id": "pairing_id", "actual_decision": "decision"}
+HOUR_BUCKET_CHARS = len("2026-01-01T00")
+QUERY_FIELDS = INDEX_FIELDS + ("hour",)
+# Bumped whenever the stored key values change shape, so older indexes are rebuilt.
+KEY_FORMAT = "utc-v1"
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS rows (offset INTEGER PRIMARY KEY, line INTEGER NOT NULL, hash_prev TEXT NOT NULL, hash_self TEXT NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS keys (field TEXT NOT NULL, value TEXT NOT NULL, offset INTEGER NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS keys_lookup ON keys (field, value, offset)",
+)
+
+
+def utc_timestamp(value: str) -> str:
+    """Return value as a fixed-width UTC ISO-8601 string so keys order by instant.
+
+    Naive timestamps and date-only bounds are taken as UTC. A value that is not
+    ISO-8601 is kept as written.
+    """
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return value
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).isoformat(timespec="microseconds")
+
+
+def index_keys(record: dict[str, Any]) -> list[tuple[str, str]]:
+    """Return the (field, value) pairs a ledger row is indexed under."""
+    found: dict[str, str] = {}
+    for key, value in record.items():
+        field = _RECORD_ALIASES.get(key, key)
+        if field in INDEX_FIELDS and isinstance(value, (str, int, float)) and not isinstance(value, bool):
+            found.setdefault(field, str(value))
+    payload = record.get("payload")
+    if isinstance(payload, dict):
+        for key, field in _PAYLOAD_ALIASES.items():
+            value = payload.get(key)
+            if isinstance(value, str):
+                found.setdefault(field, value)
+    if "timestamp" in found:
+        found["timestamp"] = utc_timestamp(found["timestamp"])
+    if len(found.get("timestamp", "")) >= HOUR_BUCKET_CHARS:
+        found["hour"] = found["timestamp"][:HOUR_BUCKET_CHARS]
+    return sorted(found.items())
+
+
+def _connect(path: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(index_path(path))
+    for statement in _SCHEMA:
+        conn.execute(statement)
+    return conn
+
+
+def _meta(conn: sqlite3.Connection) -> dict[str, str]:
+    return dict(conn.execute("SELECT name, value FROM meta").fetchall())
+
+
+def _tail_matches(path: Path, meta: dict[str, str]) -> bool:
+    if meta and meta.get("key_format") != KEY_FORMAT:
+        return False
+    size = int(meta.get("size", "0"))
+    if size == 0:
+        return True
+    if not path.exists() or path.stat().st_size < size:
+        return False
+    try:
+        record = read_record_at(path, int(meta["line_offset"]))
+    except (OSError, ValueError, KeyError):
+        return False
+    return isinstance(record, dict) and record.get("hash_self") == meta.get("hash_self")
+
+
+def _index_from(conn: sqlite3.Connection, path: Path, meta: dict[str, str]) -> int:
+    size = path.stat().st_size if path.exists() else 0
+    start = int(meta.get("size", "0"))
+    line = int(meta.get("lines", "0"))
+    line_offset = meta.get("line_offset", "0")
+    hash_self = meta.get("hash_self", "")
+    added = 0
+    for offset, record in scan_records(path, start):
+        if offset >= size:
+            break
+        line += 1
+        added += 1
+        line_offset = str(offset)
+        hash_self = str(record.get("hash_self", ""))
+        conn.execute(
+            "INSERT INTO rows (offset, line, hash_prev, hash_self) VALUES (?, ?, ?, ?)",
+            (offset, line, str(record.get("hash_prev", "")), hash_self),
+        )
+        conn.executemany(
+            "INSERT INTO keys (field, value, offset) VALUES (?, ?, ?)",
+            [(field, value, offset) for field, value in index_keys(record)],
+        )
+    state = {"size": str(max(size, start)), "lines": str(line), "line_offset": line_offset, "hash_self": hash_self, "key_format": KEY_FORMAT}
+    conn.executemany("INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)", sorted(state.items()))
+    return added
+
+
+def sync_index(path: Path) -> int:
+    """Index rows appended since the last sync and return how many were added.
+
+    The caller holds the ledger lock. If the indexed tail row no longer carries
+    the recorded hash_self, the index is rebuilt from the first row. An index
+    that cannot be updated is removed; the ledger stays the evidence source.
+    """
+    try:
+        with closing(_connect(path)) as conn, conn:
+            meta = _meta(conn)
+            if not _tail_matches(path, meta):
+                conn.execute("DELETE FROM rows")
+                conn.execute("DELETE FROM keys")
+                conn.execute("DELETE FROM meta")
+                meta = {}
+            return _index_from(conn, path, meta)
+    except (sqlite3.Error, ValueError):
+        index_path(path).unlink(missing_ok=True)
+        return 0
+
+
+def refresh_index(path: Path) -> int:
+    with ledger_lock(path):
+        return sync_index(path)
+
+
+def build_index(path: Path) -> dict[str, Any]:
+    with ledger_lock(path):
+        index_path(path).unlink(missing_ok=True)
+        sync_index(path)
+    with closing(sqlite3.connect(index_path(path))) as conn:
+        meta = _meta(conn)
+        keys = conn.execute("SELECT COUNT(*) FROM keys").fetchone()[0]
+    return {"ledger": str(path), "index": str(index_path(path)), "lines": int(meta.get("lines", "0")), "keys": keys}
+
+
+def verify_index(path: Path) -> tuple[bool, list[str]]:
+    """Check indexed rows and keys against the ledger and its hash_prev links."""
+    if not index_path(path).exists():
+        return False, ["index missing"]
+    errors: list[str] = []
+    with closing(sqlite3.connect(index_path(path))) as conn:
+        meta = _meta(conn)
+        indexed_size = int(meta.get("size", "0"))
+        rows = {offset: (line, prev, current) for offset, line, prev, current in conn.execute("SELECT * FROM rows")}
+        keys = sorted(conn.execute("SELECT field, value, offset FROM keys").fetchall())
+    expected_keys: list[tuple[str, str, int]] = []
+    seen: set[int] = set()
+    previous = None
+    line = 0
+    for offset, record in scan_records(path):
+        if offset >= indexed_size:
+            break
+        line += 1
+        prev, current = str(record.get("hash_prev", "")), str(record.get("hash_self", ""))
+        if previous is not None and prev != previous:
+            errors.append(f"line {line}: hash_prev does not link to previous row")
+        previous = current
+        if rows.get(offset) != (line, prev, current):
+            errors.append(f"line {line}: index row does not match ledger row at offset {offset}")
+        seen.add(offset)
+        expected_keys.extend((field, value, offset) for field, value in index_keys(record))
+    for offset in sorted(set(rows) - seen):
+        errors.append(f"index row at offset {offset} is not a ledger row")
+    if keys != sorted(expected_keys):
+        errors.append("index keys do not match ledger rows")
+    return not errors, errors
+
+
+def _matching_offsets(
+    path: Path,
+    field: str | None,
+    value: str | None,
+    since: str | None,
+    until: str | None,
+    limit: int | None,
+) -> list[int]:
+    clauses: list[str] = []
+    params: list[Any] = []
+    if field is not None:
+        clauses.append("offset IN (SELECT offset FROM keys WHERE field = ? AND value = ?)")
+        params.extend([field, value or ""])
+    if since is not None:
+        clauses.append("offset IN (SELECT offset FROM keys WHERE field = 'timestamp' AND value >= ?)")
+        params.append(utc_timestamp(since))
+    if until is not None:
+        clauses.append("offset IN (SELECT offset FROM keys WHERE field = 'timestamp' AND value < ?)")
+        params.append(utc_timestamp(until))
+    sql = "SELECT offset FROM rows"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += " ORDER BY offset"
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(limit)
+    with closing(sqlite3.connect(index_path(path))) as conn:
+        return [offset for (offset,) in conn.execute(sql, params)]
+
+
+def query(
+    path: Path,
+    field: str | None = None,
+    value: str | None = None,
+    since: str | None = None,
+    until: str | None = None,
+    limit: int | None = None,
+) -> Iterator[tuple[int, dict[str, Any]]]:
+    """Yield (offset, record) for rows matching field=value and since <= timestamp < until.
+
+    Timestamps and bounds are compared as UTC instants, whatever offset they
+    were written with; the hour bucket is the UTC hour. The index is brought up to date
+    (or built) before the query runs.
+    """
+    if not path.exists():
+        return
+    refresh_index(path)
+    for offset in _matching_offsets(path, field, value, since, until, limit):
+        record = read_record_at(path, offset)
+        if record is not None:
+            yield offset, record
+
+
+def lookup(path: Path, field: str, value: str) -> list[dict[str, Any]]:
+    return [record for _, record in query(path, field, value)]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="VE ledger secondary index")
+    parser.add_argument("--ledger", required=True)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("build")
+    sub.add_parser("verify")
+    lookup_parser = sub.add_parser("lookup")
+    lookup_parser.add_argument("field", choices=QUERY_FIELDS)
+    lookup_parser.add_argument("value")
+    query_parser = sub.add_parser("query")
+    query_parser.add_argument("--field", choices=QUERY_FIELDS)
+    query_parser.add_argument("--value")
+    query_parser.add_argument("--since")
+    query_parser.add_argument("--until")
+    query_parser.add_argument("--limit", type=int)
+    args = parser.parse_args()
+    ledger = Path(args.ledger)
+    if args.command == "build":
+        print(json.dumps(build_index(ledger), indent=2))
+        return 0
+    if args.command == "verify":
+        ok, errors = verify_index(ledger)
+        print(json.dumps({"ok": ok, "errors": errors}, indent=2))
+        return 0 if ok else 1
+    if args.command == "lookup":
+        print(json.dumps(lookup(ledger, args.field, args.value), indent=2))
+        return 0
+    rows = [record for _, record in query(ledger, args.field, args.value, args.since, args.until, args.limit)]
+    print(json.dumps(rows, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
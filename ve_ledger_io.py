@@ -0,0 +1,594 @@
+from __future__ import annotations
+
+import errno
+import json
+import mmap
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to msvcrt byte-range locks.
+    fcntl = None
+    import msvcrt
+
+
+ZERO_HASH = "0" * 64
+TAIL_BLOCK_BYTES = 8192
+
+
+def head_path(path: Path) -> Path:
+    return path.with_name(path.name + ".head.json")
+
+
+def index_path(path: Path) -> Path:
+    return path.with_name(path.name + ".index.sqlite")
+
+
+def manifest_path(path: Path) -> Path:
+    return path.with_name(path.name + ".manifest.json")
+
+
+def read_manifest(path: Path) -> dict[str, Any]:
+    """Return the segment manifest, or an empty one for a ledger that was never rotated."""
+    try:
+        data = json.loads(manifest_path(path).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return {"segments": []}
+    if not isinstance(data, dict) or not isinstance(data.get("segments"), list):
+        raise ValueError(f"invalid segment manifest: {manifest_path(path)}")
+    return data
+
+
+def chain_origin(path: Path) -> str:
+    """Return the hash_prev the first row of the active segment must carry."""
+    segments = read_manifest(path)["segments"]
+    return str(segments[-1]["hash_tail"]) if segments else ZERO_HASH
+
+
+def encode_line(record: dict[str, Any]) -> bytes:
+    return (json.dumps(record, sort_keys=True) + "\n").encode("utf-8")
+
+
+def _parse_line(raw: bytes) -> dict[str, Any] | None:
+    text = raw.decode("utf-8").strip()
+    if not text:
+        return None
+    return json.loads(text)
+
+
+def _scan_last_line(handle: Any, size: int) -> tuple[int, bytes]:
+    """Seek backward from EOF and return (offset, bytes) of the last non-blank line."""
+    end = size
+    tail = b""
+    position = size
+    while position > 0:
+        step = min(TAIL_BLOCK_BYTES, position)
+        position -= step
+        handle.seek(position)
+        tail = handle.read(step) + tail
+        stripped = tail[: end - position].rstrip(b"\r\n \t")
+        if not stripped:
+            end = position
+            tail = b""
+            continue
+        newline = stripped.rfind(b"\n")
+        if newline >= 0:
+            return position + newline + 1, stripped[newline + 1 :]
+    stripped = tail.rstrip(b"\r\n \t")
+    return 0, stripped
+
+
+def read_head(path: Path) -> dict[str, Any] | None:
+    try:
+        data = json.loads(head_path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or not {"size", "line_offset", "hash_self"} <= set(data):
+        return None
+    return data
+
+
+def write_head(path: Path, line_offset: int, size: int, hash_self: str) -> None:
+    target = head_path(path)
+    # Per-writer temp name: a lock-free tail_record refresh can race a committing writer.
+    temp = target.with_name(f"{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        temp.write_text(
+            json.dumps({"line_offset": line_offset, "size": size, "hash_self": hash_self}, sort_keys=True),
+            encoding="utf-8",
+        )
+        os.replace(temp, target)
+    except OSError:
+        temp.unlink(missing_ok=True)
+        raise
+
+
+def file_identity(path: Path) -> list[int] | None:
+    """[device, inode, size, mtime_ns, ctime_ns]; any append, rewrite or replacement changes it."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return [stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns, stat.st_ctime_ns]
+
+
+def tail_record(path: Path) -> tuple[int, dict[str, Any]] | None:
+    """Return (offset, record) for the last ledger row without reading the whole file.
+
+    The sidecar head pointer is trusted only when the ledger size still matches
+    and the row at its offset still carries the recorded hash_self. Any mismatch
+    falls back to a backward scan from EOF and refreshes the pointer.
+    """
+    if not path.exists():
+        return None
+    with path.open("rb") as handle:
+        size = handle.seek(0, os.SEEK_END)
+        if size == 0:
+            return None
+        head = read_head(path)
+        if head is not None and int(head["size"]) == size and 0 <= int(head["line_offset"]) < size:
+            handle.seek(int(head["line_offset"]))
+            try:
+                record = _parse_line(handle.read(size - int(head["line_offset"])))
+            except ValueError:
+                record = None
+            if isinstance(record, dict) and record.get("hash_self") == head["hash_self"]:
+                return int(head["line_offset"]), record
+        offset, raw = _scan_last_line(handle, size)
+    record = _parse_line(raw)
+    if record is None:
+        return None
+    try:
+        write_head(path, offset, size, str(record.get("hash_self", ZERO_HASH)))
+    except OSError:
+        pass
+    return offset, record
+
+
+def record_before(path: Path, offset: int) -> tuple[int, dict[str, Any]] | None:
+    """Return (offset, record) for the last row ending at or before offset, or None if there is none.
+
+    offset must be 0, the ledger size, or just past a newline.
+    """
+    with path.open("rb") as handle:
+        size = handle.seek(0, os.SEEK_END)
+        if not 0 <= offset <= size:
+            raise ValueError(f"offset {offset} is outside the ledger ({size} bytes)")
+        if offset == 0:
+            return None
+        handle.seek(offset - 1)
+        if offset < size and handle.read(1) != b"\n":
+            raise ValueError(f"offset {offset} is not at the start of a line")
+        line_offset, raw = _scan_last_line(handle, offset)
+        record = _parse_line(raw)
+    return None if record is None else (line_offset, record)
+
+
+def tail_hash(path: Path) -> str:
+    found = tail_record(path)
+    if found is None:
+        return chain_origin(path)
+    return found[1].get("hash_self", ZERO_HASH)
+
+
+def _project(record: dict[str, Any], fields: tuple[str, ...] | None) -> dict[str, Any]:
+    if fields is None:
+        return record
+    return {key: record[key] for key in fields if key in record}
+
+
+def scan_records(path: Path, start: int = 0, fields: Iterable[str] | None = None) -> Iterator[tuple[int, dict[str, Any]]]:
+    """Lazily yield (offset, record) for each non-blank row at or after start.
+
+    The ledger is memory-mapped, so only the row being parsed is copied into
+    Python memory. fields keeps only the named keys of each record.
+    """
+    if not path.exists():
+        return
+    wanted = tuple(fields) if fields is not None else None
+    with path.open("rb") as handle:
+        size = handle.seek(0, os.SEEK_END)
+        if size <= start:
+            return
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            position = start
+            while position < size:
+                newline = view.find(b"\n", position)
+                end = size if newline < 0 else newline + 1
+                raw = view[position:end]
+                if raw.strip():
+                    yield position, _project(json.loads(raw), wanted)
+                position = end
+
+
+def iter_records(path: Path, fields: Iterable[str] | None = None) -> Iterator[dict[str, Any]]:
+    for _, record in scan_records(path, fields=fields):
+        yield record
+
+
+def read_record_at(path: Path, offset: int) -> dict[str, Any] | None:
+    """Parse the single row that starts at offset."""
+    with path.open("rb") as handle:
+        handle.seek(offset)
+        return _parse_line(handle.readline())
+
+
+def lock_path(path: Path) -> Path:
+    return path.with_name(path.name + ".lock")
+
+
+@dataclass
+class LockMetrics:
+    acquisitions: int = 0
+    contended: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    stale_recoveries: int = 0
+
+
+_LOCK_METRICS = LockMetrics()
+_LOCK_METRICS_GUARD = threading.Lock()
+FALLBACK_LOCK_TIMEOUT_SECONDS = 30.0
+# msvcrt.LK_LOCK gives up after about ten one-second retries and raises EDEADLOCK.
+_LOCK_RETRY_ERRNO = getattr(errno, "EDEADLOCK", errno.EDEADLK)
+_NO_ADVISORY_LOCK_ERRNOS = {getattr(errno, name) for name in ("ENOLCK", "EOPNOTSUPP", "EINVAL") if hasattr(errno, name)}
+
+
+def lock_metrics() -> dict[str, Any]:
+    with _LOCK_METRICS_GUARD:
+        return asdict(_LOCK_METRICS)
+
+
+def reset_lock_metrics() -> None:
+    global _LOCK_METRICS
+    with _LOCK_METRICS_GUARD:
+        _LOCK_METRICS = LockMetrics()
+
+
+def _record_wait(waited: float, contended: bool, stale: int = 0) -> None:
+    with _LOCK_METRICS_GUARD:
+        _LOCK_METRICS.acquisitions += 1
+        _LOCK_METRICS.contended += int(contended)
+        _LOCK_METRICS.total_wait_seconds += waited
+        _LOCK_METRICS.max_wait_seconds = max(_LOCK_METRICS.max_wait_seconds, waited)
+        _LOCK_METRICS.stale_recoveries += stale
+
+
+def pid_alive(pid: int) -> bool:
+    if pid <= 0:
+        return False
+    if os.name == "nt":
+        import ctypes
+
+        handle = ctypes.windll.kernel32.OpenProcess(0x1000, False, pid)
+        if not handle:
+            return False
+        ctypes.windll.kernel32.CloseHandle(handle)
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _lock_holder(target: Path) -> int:
+    try:
+        return int(target.read_text(encoding="utf-8").strip() or "0")
+    except (OSError, ValueError):
+        return 0
+
+
+def _kernel_lock(handle: int, blocking: bool) -> bool:
+    if fcntl is not None:
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+        except BlockingIOError:
+            return False
+        return True
+    while True:
+        os.lseek(handle, 0, os.SEEK_SET)
+        try:
+            msvcrt.locking(handle, msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+        except OSError as exc:
+            if blocking and exc.errno == _LOCK_RETRY_ERRNO:
+                continue
+            if blocking:
+                raise
+            return False
+        return True
+
+
+def _kernel_unlock(handle: int) -> None:
+    if fcntl is not None:
+        fcntl.flock(handle, fcntl.LOCK_UN)
+        return
+    os.lseek(handle, 0, os.SEEK_SET)
+    msvcrt.locking(handle, msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def _exclusive_file_lock(target: Path):
+    """Fallback for filesystems without advisory locks: O_EXCL lock file stamped with the holder PID."""
+    started = time.monotonic()
+    stale = 0
+    contended = False
+    while True:
+        try:
+            handle = os.open(str(target), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            contended = True
+            holder = _lock_holder(target)
+            if holder and not pid_alive(holder):
+                try:
+                    target.unlink()
+                    stale += 1
+                except FileNotFoundError:
+                    pass
+                continue
+            if time.monotonic() - started >= FALLBACK_LOCK_TIMEOUT_SECONDS:
+                raise TimeoutError(f"timeout acquiring ledger lock: {target} held by pid {holder}")
+            time.sleep(0.05)
+    _record_wait(time.monotonic() - started, contended, stale)
+    try:
+        os.write(handle, str(os.getpid()).encode("utf-8"))
+        yield
+    finally:
+        os.close(handle)
+        try:
+            target.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _same_file(handle: int, target: Path) -> bool:
+    try:
+        on_disk = target.stat()
+    except FileNotFoundError:
+        return False
+    held = os.fstat(handle)
+    return (held.st_dev, held.st_ino) == (on_disk.st_dev, on_disk.st_ino)
+
+
+@contextmanager
+def ledger_lock(path: Path):
+    """Hold an exclusive kernel advisory lock on <ledger>.lock.
+
+    The wait blocks in the kernel instead of polling, and the kernel drops the
+    lock when its holder exits, so a crashed writer cannot strand the ledger.
+    The holder stamps its PID into the lock file and unlinks it before
+    releasing; a waiter that wakes up holding an unlinked file retries on the
+    fresh one. Filesystems that refuse advisory locks fall back to an
+    exclusive-create lock file whose holder is removed when its PID is no
+    longer alive.
+    """
+    target = lock_path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    started = time.monotonic()
+    contended = False
+    while True:
+        handle = os.open(str(target), os.O_CREAT | os.O_RDWR)
+        try:
+            if not _kernel_lock(handle, blocking=False):
+                contended = True
+                _kernel_lock(handle, blocking=True)
+        except OSError as exc:
+            os.close(handle)
+            if exc.errno not in _NO_ADVISORY_LOCK_ERRNOS:
+                raise
+            handle = -1
+            break
+        if _same_file(handle, target):
+            break
+        _kernel_unlock(handle)
+        os.close(handle)
+    if handle < 0:
+        with _exclusive_file_lock(target.with_name(target.name + ".excl")):
+            yield
+        return
+    _record_wait(time.monotonic() - started, contended)
+    try:
+        os.ftruncate(handle, 0)
+        os.lseek(handle, 0, os.SEEK_SET)
+        os.write(handle, str(os.getpid()).encode("utf-8"))
+        yield
+    finally:
+        try:
+            target.unlink()
+        except OSError:
+            pass
+        _kernel_unlock(handle)
+        os.close(handle)
+
+
+def append_records(path: Path, records: list[dict[str, Any]], fsync: bool = False) -> list[int]:
+    """Append rows in one write, advance the head pointer, and return each row's byte offset."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lines = [encode_line(record) for record in records]
+    offsets: list[int] = []
+    with path.open("ab") as handle:
+        offset = handle.seek(0, os.SEEK_END)
+        for line in lines:
+            offsets.append(offset)
+            offset += len(line)
+        handle.write(b"".join(lines))
+        if fsync:
+            handle.flush()
+            os.fsync(handle.fileno())
+    # The rows are durable now, so sidecar failures must not fail the append.
+    if records and "hash_prev" in records[-1]:
+        try:
+            write_head(path, offsets[-1], offset, str(records[-1]["hash_self"]))
+        except OSError:
+            # A stale head is caught by tail_record anyway; dropping it just forces the scan.
+            try:
+                head_path(path).unlink(missing_ok=True)
+            except OSError:
+                pass
+    if records and index_path(path).exists():
+        from ve_ledger_index import sync_index
+
+        try:
+            sync_index(path)
+        except OSError:
+            pass
+    return offsets
+
+
+def append_record(path: Path, record: dict[str, Any]) -> int:
+    """Append one sorted-key JSON row, advance the head pointer, and return its byte offset."""
+    return append_records(path, [record])[0]
+
+
+RecordBuilder = Callable[[str], dict[str, Any]]
+
+
+@dataclass
+class RotationPolicy:
+    """Seal the active segment once it reaches max_bytes or is max_age_seconds old."""
+
+    max_bytes: int | None = None
+    max_age_seconds: float | None = None
+
+
+def rotation_policy_from_env() -> RotationPolicy | None:
+    max_bytes = os.environ.get("VE_LEDGER_SEGMENT_MAX_BYTES", "").strip()
+    max_age_hours = os.environ.get("VE_LEDGER_SEGMENT_MAX_AGE_HOURS", "").strip()
+    if not max_bytes and not max_age_hours:
+        return None
+    return RotationPolicy(
+        max_bytes=int(max_bytes) if max_bytes else None,
+        max_age_seconds=float(max_age_hours) * 3600 if max_age_hours else None,
+    )
+
+
+class LedgerWriter:
+    """Long-lived appender that group-commits concurrent requests to one ledger.
+
+    Callers hand in a builder that turns hash_prev into a finished record. The
+    writer thread drains every queued builder, chains them in submission order
+    under one ledger lock, writes them with a single fsync, and resolves each
+    caller's future with its own record. A builder that raises fails only its
+    own future and does not advance the chain. With a rotation policy the
+    active segment is sealed before a batch once the policy is due, after its
+    rows pass check_segment (hash_prev linkage alone when None).
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        max_batch: int = 512,
+        rotation: RotationPolicy | None = None,
+        check_segment: Callable[[Path, str], list[str]] | None = None,
+    ) -> None:
+        self.path = path
+        self.max_batch = max_batch
+        self.rotation = rotation
+        self.check_segment = check_segment
+        self.batches = 0
+        self._queue: queue.SimpleQueue[tuple[RecordBuilder, Future] | None] = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+
+    def submit(self, build: RecordBuilder) -> Future:
+        future: Future = Future()
+        self._ensure_thread()
+        self._queue.put((build, future))
+        return future
+
+    def append(self, build: RecordBuilder) -> dict[str, Any]:
+        return self.submit(build).result()
+
+    def close(self) -> None:
+        with self._start_lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+
+    def _ensure_thread(self) -> None:
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=f"ledger-writer:{self.path.name}", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            stop = False
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            self._commit(batch)
+            if stop:
+                return
+
+    def _commit(self, batch: list[tuple[RecordBuilder, Future]]) -> None:
+        done: list[tuple[Future, dict[str, Any]]] = []
+        try:
+            with ledger_lock(self.path):
+                if self.rotation is not None:
+                    from ve_ledger_segments import rotate_if_due
+
+                    rotate_if_due(self.path, self.rotation, self.check_segment)
+                hash_prev = tail_hash(self.path)
+                for build, future in batch:
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    try:
+                        record = build(hash_prev)
+                    except BaseException as exc:
+                        future.set_exception(exc)
+                        continue
+                    done.append((future, record))
+                    hash_prev = str(record["hash_self"])
+                if done:
+                    append_records(self.path, [record for _, record in done], fsync=True)
+                    self.batches += 1
+        except BaseException as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for future, record in done:
+            future.set_result(record)
+
+
+_WRITERS: dict[Path, LedgerWriter] = {}
+_WRITERS_LOCK = threading.Lock()
+
+
+def ledger_writer(path: Path, check_segment: Callable[[Path, str], list[str]] | None = None) -> LedgerWriter:
+    """Return the process-wide writer for a ledger so all in-process callers share one commit queue.
+
+    check_segment is the ledger's row verifier, run before a rotation seals
+    the active segment; the latest one given is kept.
+    """
+    key = Path(os.path.abspath(path))
+    with _WRITERS_LOCK:
+        writer = _WRITERS.get(key)
+        if writer is None:
+            writer = _WRITERS[key] = LedgerWriter(key, rotation=rotation_policy_from_env())
+        if check_segment is not None:
+            writer.check_segment = check_segment
+        return writer
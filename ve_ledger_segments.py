@@ -0,0 +1,381 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator
+
+from ve_ledger_io import (
+    ZERO_HASH,
+    RotationPolicy,
+    chain_origin,
+    file_identity,
+    head_path,
+    index_path,
+    ledger_lock,
+    manifest_path,
+    read_manifest,
+    scan_records,
+)
+from ve_segment_archive import archive_digest, archive_path, restore_segment, scan_archive, write_archive
+
+
+SegmentCheck = Callable[[Path, str], list[str]]
+
+
+def segments_dir(path: Path) -> Path:
+    return path.with_name(path.name + ".segments")
+
+
+def stored_segment_path(path: Path, entry: dict[str, Any]) -> Path:
+    """Return the file that holds a sealed segment: its JSONL, or its XZ archive once compressed."""
+    if "archive" in entry:
+        return segments_dir(path) / str(entry["archive"]["name"])
+    return segments_dir(path) / str(entry["name"])
+
+
+def sealed_segment_paths(path: Path) -> list[Path]:
+    return [stored_segment_path(path, entry) for entry in read_manifest(path)["segments"]]
+
+
+def _write_manifest(path: Path, manifest: dict[str, Any]) -> None:
+    target = manifest_path(path)
+    temp = target.with_name(target.name + ".tmp")
+    temp.write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    os.replace(temp, target)
+
+
+def file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for block in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _row_time(record: dict[str, Any]) -> str:
+    return str(record.get("timestamp") or record.get("ts") or "")
+
+
+def check_linkage(path: Path, origin: str) -> list[str]:
+    """Check that every row's hash_prev links to the row before it, starting at origin."""
+    errors: list[str] = []
+    expected = origin
+    for line, (_, record) in enumerate(scan_records(path, fields=("hash_prev", "hash_self")), 1):
+        if record.get("hash_prev") != expected:
+            errors.append(f"line {line}: hash_prev mismatch")
+        expected = record.get("hash_self", ZERO_HASH)
+    return errors
+
+
+def _segment_entry(path: Path, origin: str, name: str, check_segment: SegmentCheck | None) -> dict[str, Any]:
+    errors = (check_segment or check_linkage)(path, origin)
+    if errors:
+        raise ValueError(f"refusing to seal a broken chain: {errors[0]}")
+    first: dict[str, Any] | None = None
+    last: dict[str, Any] = {}
+    lines = 0
+    for _, record in scan_records(path, fields=("hash_prev", "hash_self", "timestamp", "ts")):
+        first = first or record
+        last = record
+        lines += 1
+    if first is None:
+        raise ValueError("refusing to seal an empty segment")
+    return {
+        "name": name,
+        "lines": lines,
+        "bytes": path.stat().st_size,
+        "sha256": file_digest(path),
+        "hash_head": str(first.get("hash_prev", "")),
+        "hash_tail": str(last.get("hash_self", "")),
+        "first_timestamp": _row_time(first),
+        "last_timestamp": _row_time(last),
+        "sealed_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def _finish_pending(path: Path, entry: dict[str, Any]) -> None:
+    """Complete a rotation that recorded its manifest entry but stopped before the rename."""
+    target = segments_dir(path) / str(entry["name"])
+    if "archive" in entry or target.exists():
+        return
+    if path.exists() and path.stat().st_size == entry["bytes"] and file_digest(path) == entry["sha256"]:
+        os.replace(path, target)
+        return
+    raise ValueError(f"sealed segment {entry['name']} is missing from {segments_dir(path)}")
+
+
+def active_age_seconds(path: Path, now: datetime | None = None) -> float | None:
+    """Seconds since the active segment was opened, from the manifest or its first row."""
+    started = read_manifest(path).get("active_since")
+    if not started and path.exists():
+        first = next(scan_records(path, fields=("timestamp", "ts")), None)
+        started = _row_time(first[1]) if first else ""
+    if not started:
+        return None
+    try:
+        opened = datetime.fromisoformat(str(started))
+    except ValueError:
+        return None
+    if opened.tzinfo is None:
+        opened = opened.replace(tzinfo=timezone.utc)
+    return ((now or datetime.now(timezone.utc)) - opened).total_seconds()
+
+
+def rotation_due(path: Path, policy: RotationPolicy, now: datetime | None = None) -> bool:
+    if not path.exists() or path.stat().st_size == 0:
+        return False
+    if policy.max_bytes is not None and path.stat().st_size >= policy.max_bytes:
+        return True
+    if policy.max_age_seconds is not None:
+        age = active_age_seconds(path, now)
+        return age is not None and age >= policy.max_age_seconds
+    return False
+
+
+def seal_active_segment(path: Path, check_segment: SegmentCheck | None = None) -> dict[str, Any] | None:
+    """Move the active ledger into the next sealed segment and record it in the manifest.
+
+    The caller holds the ledger lock. Every row is checked with check_segment
+    (the owning ledger's full row verifier; hash_prev linkage alone when None)
+    and a segment with any error is refused. The manifest entry is written before the
+    rename, so tail_hash keeps returning the same hash if a crash lands between
+    the two steps; the next rotation completes the rename.
+    """
+    manifest = read_manifest(path)
+    segments = manifest["segments"]
+    if segments:
+        _finish_pending(path, segments[-1])
+    if not path.exists() or next(scan_records(path, fields=()), None) is None:
+        return None
+    origin = chain_origin(path)
+    name = f"{len(segments) + 1:06d}.jsonl"
+    entry = _segment_entry(path, origin, name, check_segment)
+    segments_dir(path).mkdir(parents=True, exist_ok=True)
+    manifest["segments"] = segments + [entry]
+    manifest["active_since"] = entry["sealed_at"]
+    _write_manifest(path, manifest)
+    target = segments_dir(path) / name
+    os.replace(path, target)
+    if index_path(path).exists():
+        os.replace(index_path(path), index_path(target))
+    head_path(path).unlink(missing_ok=True)
+    return entry
+
+
+def iter_sealed_records(path: Path, fields: Iterable[str] | None = None) -> Iterator[dict[str, Any]]:
+    """Yield records of every sealed segment, oldest first; compressed ones one block at a time."""
+    wanted = tuple(fields) if fields is not None else None
+    for entry in read_manifest(path)["segments"]:
+        stored = stored_segment_path(path, entry)
+        rows = scan_archive(stored) if "archive" in entry else scan_records(stored)
+        for _, record in rows:
+            yield record if wanted is None else {key: record[key] for key in wanted if key in record}
+
+
+def iter_ledger_records(path: Path, fields: Iterable[str] | None = None, active_only: bool = False) -> Iterator[dict[str, Any]]:
+    """Yield records of every sealed segment, oldest first, then the active segment.
+
+    active_only skips the sealed segments.
+    """
+    wanted = tuple(fields) if fields is not None else None
+    if not active_only:
+        yield from iter_sealed_records(path, wanted)
+    for _, record in scan_records(path, fields=wanted):
+        yield record
+
+
+def rotate_if_due(path: Path, policy: RotationPolicy, check_segment: SegmentCheck | None = None) -> dict[str, Any] | None:
+    """Seal the active segment when the policy is due. The caller holds the ledger lock."""
+    if not rotation_due(path, policy):
+        return None
+    return seal_active_segment(path, check_segment)
+
+
+def rotate_ledger(path: Path, policy: RotationPolicy | None = None, check_segment: SegmentCheck | None = None) -> dict[str, Any] | None:
+    """Seal the active segment now, or only when policy is due."""
+    with ledger_lock(path):
+        if policy is not None:
+            return rotate_if_due(path, policy, check_segment)
+        return seal_active_segment(path, check_segment)
+
+
+def compress_segment(path: Path, name: str) -> dict[str, Any]:
+    """Transcode one sealed segment to XZ blocks and drop the JSONL once the archive round-trips.
+
+    The segment's secondary index sidecar is dropped with it, since its
+    offsets point into the JSONL.
+    """
+    entry = next((item for item in read_manifest(path)["segments"] if item["name"] == name), None)
+    if entry is None:
+        raise ValueError(f"unknown segment {name}")
+    if "archive" in entry:
+        return entry
+    source = segments_dir(path) / name
+    target = archive_path(source)
+    index = write_archive(source, target)
+    if index["raw_sha256"] != entry["sha256"] or archive_digest(target) != entry["sha256"]:
+        target.unlink(missing_ok=True)
+        raise ValueError(f"segment {name} did not round-trip through its archive")
+    with ledger_lock(path):
+        manifest = read_manifest(path)
+        for item in manifest["segments"]:
+            if item["name"] == name:
+                item["archive"] = {"name": target.name, "bytes": target.stat().st_size, "sha256": file_digest(target), "blocks": len(index["blocks"])}
+                entry = item
+        _write_manifest(path, manifest)
+    source.unlink()
+    index_path(source).unlink(missing_ok=True)
+    return entry
+
+
+def compress_sealed_segments(path: Path) -> list[dict[str, Any]]:
+    return [compress_segment(path, str(entry["name"])) for entry in read_manifest(path)["segments"] if "archive" not in entry]
+
+
+def _check_archived(path: Path, entry: dict[str, Any], check_segment: SegmentCheck) -> list[str]:
+    archive = stored_segment_path(path, entry)
+    handle, name = tempfile.mkstemp(prefix=str(entry["name"]) + ".", suffix=".restore", dir=segments_dir(path))
+    os.close(handle)
+    restored = Path(name)
+    try:
+        try:
+            restore_segment(archive, restored)
+        except (OSError, ValueError) as exc:
+            return [f"archive unreadable: {exc}"]
+        errors = [] if file_digest(restored) == entry["sha256"] else ["restored bytes do not match manifest sha256"]
+        return errors + check_segment(restored, str(entry["hash_head"]))
+    finally:
+        restored.unlink(missing_ok=True)
+
+
+# (path, dev, inode, size, mtime, ctime, sha256) of stored segments already hashed by this process.
+_VERIFIED_DIGESTS: set[tuple[Any, ...]] = set()
+
+
+def _digest_verified(target: Path, expected: str, digest: Callable[[Path], str]) -> bool:
+    """Hash target once per file identity; any rewrite changes the identity and hashes it again."""
+    stat = target.stat()
+    key = (str(target), stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns, stat.st_ctime_ns, expected)
+    if key in _VERIFIED_DIGESTS:
+        return True
+    if digest(target) != expected:
+        return False
+    _VERIFIED_DIGESTS.add(key)
+    return True
+
+
+def segment_fingerprint(path: Path, entry: dict[str, Any]) -> list[Any]:
+    """[name, sha256, stored file identity] of a sealed segment; any rewrite of the stored file changes it."""
+    return [str(entry["name"]), str(entry["sha256"]), file_identity(stored_segment_path(path, entry))]
+
+
+def segment_fingerprints(path: Path) -> list[list[Any]]:
+    return [segment_fingerprint(path, entry) for entry in read_manifest(path)["segments"]]
+
+
+def verify_segments(path: Path, check_segment: SegmentCheck | None = None, trusted: Iterable[list[Any]] = ()) -> list[str]:
+    """Check the manifest chain of sealed segments.
+
+    Each segment's head must link to the previous tail, and the stored file
+    must match the manifest size and sha256 (the archive's own sha256 once
+    compressed). Rows were fully checked when the segment was sealed, so the
+    digest is enough to show they are unchanged; it is computed once per file
+    identity in this process. With check_segment, rows are re-checked too.
+
+    trusted holds segment_fingerprint values verified earlier, for example
+    kept in a signed state file; a segment whose fingerprint still matches
+    gets only the linkage check.
+    """
+    errors: list[str] = []
+    expected = ZERO_HASH
+    known = {json.dumps(item) for item in trusted}
+    for entry in read_manifest(path)["segments"]:
+        name = str(entry["name"])
+        target = stored_segment_path(path, entry)
+        archived = "archive" in entry
+        if entry["hash_head"] != expected:
+            errors.append(f"segment {name}: hash_head does not link to previous segment")
+        expected = str(entry["hash_tail"])
+        if known and json.dumps(segment_fingerprint(path, entry)) in known:
+            continue
+        if not target.exists():
+            errors.append(f"segment {name}: missing")
+            continue
+        if target.stat().st_size != (entry["archive"]["bytes"] if archived else entry["bytes"]):
+            errors.append(f"segment {name}: size does not match manifest")
+            continue
+        if archived and "sha256" in entry["archive"]:
+            expected_digest, digest = str(entry["archive"]["sha256"]), file_digest
+        else:
+            expected_digest, digest = str(entry["sha256"]), archive_digest if archived else file_digest
+        try:
+            if not _digest_verified(target, expected_digest, digest):
+                errors.append(f"segment {name}: sha256 does not match manifest")
+        except (OSError, ValueError) as exc:
+            errors.append(f"segment {name}: archive unreadable: {exc}")
+            continue
+        if check_segment is None:
+            continue
+        messages = _check_archived(path, entry, check_segment) if archived else check_segment(target, str(entry["hash_head"]))
+        errors.extend(f"segment {name}: {message}" for message in messages)
+    return errors
+
+
+def _row_check(kind: str, signing_key_env: str) -> SegmentCheck:
+    if kind == "receipt":
+        from echo_root_receipt import receipt_segment_errors
+
+        return receipt_segment_errors
+    if kind == "audit":
+        from ve_audit_chain import audit_segment_check
+
+        return audit_segment_check(os.environ.get(signing_key_env, "demo-local-signing-key"))
+    return check_linkage
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="VE ledger segment rotation")
+    parser.add_argument("--ledger", required=True)
+    parser.add_argument("--kind", choices=("receipt", "audit", "linkage"), default="receipt", help="Row verifier a segment must pass before it is sealed.")
+    parser.add_argument("--signing-key-env", default="VE_AUDIT_SIGNING_KEY", help="Audit signing key variable for --kind audit.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rotate = sub.add_parser("rotate", help="Seal the active segment (only when due if a limit is given).")
+    rotate.add_argument("--max-bytes", type=int)
+    rotate.add_argument("--max-age-hours", type=float)
+    rotate.add_argument("--compress", action="store_true", help="Compress every sealed segment after rotating.")
+    sub.add_parser("compress", help="Transcode sealed JSONL segments to XZ block archives.")
+    sub.add_parser("list")
+    verify = sub.add_parser("verify", help="Check segment manifest linkage.")
+    verify.add_argument("--active-only", action="store_true", help="Trust sealed segments on manifest linkage and sha256 instead of re-checking their rows.")
+    args = parser.parse_args()
+    ledger = Path(args.ledger)
+    check = _row_check(args.kind, args.signing_key_env)
+    if args.command == "rotate":
+        policy = None
+        if args.max_bytes is not None or args.max_age_hours is not None:
+            policy = RotationPolicy(args.max_bytes, args.max_age_hours * 3600 if args.max_age_hours is not None else None)
+        entry = rotate_ledger(ledger, policy, check)
+        if args.compress:
+            compress_sealed_segments(ledger)
+        print(json.dumps({"rotated": entry is not None, "segment": entry}, indent=2))
+        return 0
+    if args.command == "compress":
+        print(json.dumps({"compressed": compress_sealed_segments(ledger)}, indent=2))
+        return 0
+    if args.command == "list":
+        print(json.dumps(read_manifest(ledger), indent=2))
+        return 0
+    errors = verify_segments(ledger, None if args.active_only else check)
+    if ledger.exists():
+        errors.extend(check(ledger, chain_origin(ledger)))
+    print(json.dumps({"ok": not errors, "errors": errors}, indent=2))
+    return 0 if not errors else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
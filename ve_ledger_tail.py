@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from ve_fs_watch import DirectoryWatcher
+from ve_ledger_io import ZERO_HASH, chain_origin, record_before, tail_record
+
+
+RowCheck = Callable[[dict[str, Any]], list[str]]
+POLL_INTERVAL_SECONDS = 0.5
+
+
+def resolve_start(path: Path, from_offset: int | None = None, after_hash: str | None = None) -> tuple[int, str]:
+    """Return (byte offset, hash the next row must link to) for a follow cursor.
+
+    With neither argument the cursor is the current end of the active segment.
+    from_offset is trusted when the row before it carries after_hash (or when
+    after_hash is omitted). Otherwise after_hash is looked up in the active
+    segment, so a cursor taken before a rotation resumes at the new segment.
+    """
+    origin = chain_origin(path)
+    if not path.exists():
+        if after_hash not in (None, origin) or from_offset not in (None, 0):
+            raise ValueError("follow cursor not found: the active segment is empty")
+        return 0, origin
+    if from_offset is None and after_hash is None:
+        found = tail_record(path)
+        return path.stat().st_size, origin if found is None else str(found[1].get("hash_self", ZERO_HASH))
+    if from_offset is not None:
+        try:
+            found = record_before(path, from_offset)
+        except ValueError:
+            pass
+        else:
+            previous = origin if found is None else str(found[1].get("hash_self", ZERO_HASH))
+            if after_hash is None or previous == after_hash:
+                return from_offset, previous
+    if after_hash == origin:
+        return 0, origin
+    if after_hash is not None:
+        offset = 0
+        with path.open("rb") as handle:
+            for line in handle:
+                offset += len(line)
+                try:
+                    record = json.loads(line) if line.strip() else None
+                except ValueError:
+                    continue
+                if isinstance(record, dict) and record.get("hash_self") == after_hash:
+                    return offset, after_hash
+    raise ValueError("follow cursor not found in the active segment")
+
+
+class LedgerFollower:
+    """Read rows appended to a hash-chained ledger from a cursor, verifying each one.
+
+    Every event carries the row's byte offset within its segment, the offset
+    after it, its hash_self, and the errors found: hash_prev linkage to the
+    previous row plus whatever check_row reports. Only complete lines are
+    consumed, so a row that is still being written is picked up whole on a
+    later poll. When the active segment is rotated away, the rest of the old
+    file is drained and following continues at the start of the new one.
+    Waiting uses inotify on the ledger's directory where available and falls
+    back to polling.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        from_offset: int | None = None,
+        after_hash: str | None = None,
+        check_row: RowCheck | None = None,
+        poll_interval: float = POLL_INTERVAL_SECONDS,
+    ) -> None:
+        self.path = path
+        self.check_row = check_row
+        self.poll_interval = poll_interval
+        self.offset, self.last_hash = resolve_start(path, from_offset, after_hash)
+        self._handle: Any = None
+        self._identity: tuple[int, int] | None = None
+        self._buffer = b""
+        self.watcher: DirectoryWatcher | None
+        try:
+            self.watcher = DirectoryWatcher()
+            self.watcher.watch(path.parent)
+        except OSError:
+            self.watcher = None
+
+    def _open(self) -> bool:
+        if self._handle is not None:
+            return True
+        try:
+            handle = self.path.open("rb")
+        except FileNotFoundError:
+            return False
+        stat = os.fstat(handle.fileno())
+        if stat.st_size < self.offset:
+            handle.close()
+            raise ValueError(f"ledger shrank below the followed offset {self.offset}")
+        handle.seek(self.offset)
+        self._handle, self._identity = handle, (stat.st_dev, stat.st_ino)
+        return True
+
+    def _rotated(self) -> bool:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return True
+        return (stat.st_dev, stat.st_ino) != self._identity
+
+    def _event(self, line: bytes) -> dict[str, Any] | None:
+        start = self.offset
+        self.offset += len(line)
+        if not line.strip():
+            return None
+        event: dict[str, Any] = {"offset": start, "next_offset": self.offset}
+        try:
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError("row is not a JSON object")
+        except ValueError as exc:
+            return {**event, "hash_self": None, "valid": False, "errors": [f"invalid JSON: {exc}"], "record": None}
+        errors = [] if record.get("hash_prev") == self.last_hash else ["hash_prev mismatch"]
+        if self.check_row is not None:
+            errors.extend(self.check_row(record))
+        self.last_hash = record.get("hash_self", ZERO_HASH)
+        return {**event, "hash_self": record.get("hash_self"), "valid": not errors, "errors": errors, "record": record}
+
+    def poll(self, max_events: int | None = None) -> list[dict[str, Any]]:
+        """Return events for the complete rows appended since the last poll, without blocking."""
+        events: list[dict[str, Any]] = []
+        while max_events is None or len(events) < max_events:
+            newline = self._buffer.find(b"\n")
+            if newline >= 0:
+                line, self._buffer = self._buffer[: newline + 1], self._buffer[newline + 1 :]
+                event = self._event(line)
+                if event is not None:
+                    events.append(event)
+                continue
+            if not self._open():
+                break
+            rotated = self._rotated()
+            chunk = self._handle.read(1 << 20)
+            if chunk:
+                self._buffer += chunk
+                continue
+            if not rotated:
+                if os.fstat(self._handle.fileno()).st_size < self._handle.tell():
+                    raise ValueError(f"ledger shrank below the followed offset {self.offset}")
+                break
+            # The old segment is sealed and fully read; a torn last row is reported rather than dropped.
+            if self._buffer.strip():
+                event = self._event(self._buffer)
+                if event is not None:
+                    events.append(event)
+            self._handle.close()
+            self._handle, self._buffer, self.offset = None, b"", 0
+        return events
+
+    def wait(self, timeout: float) -> None:
+        """Sleep until the ledger directory changes or timeout seconds pass."""
+        if self.watcher is not None:
+            self.watcher.wait(timeout)
+        else:
+            time.sleep(min(timeout, self.poll_interval))
+
+    def follow(self, timeout: float | None = None, stop: threading.Event | None = None) -> Iterator[dict[str, Any]]:
+        """Yield events as rows arrive until timeout seconds pass without stopping, or stop is set."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while stop is None or not stop.is_set():
+            yield from self.poll()
+            remaining = self.poll_interval if deadline is None else min(self.poll_interval, deadline - time.monotonic())
+            if remaining <= 0:
+                return
+            self.wait(remaining)
+
+    def cursor(self) -> dict[str, Any]:
+        return {"offset": self.offset, "hash": self.last_hash}
+
+    def close(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+        if self.watcher is not None:
+            self.watcher.close()
+            self.watcher = None
+
+
+def row_check(kind: str, signing_key: str = "") -> RowCheck:
+    """Per-row verification for a ledger kind.
+
+    "receipt" checks schema and hash, "audit" hash and signature, and
+    "lessons" and "pairing" the row's content hash.
+    """
+    if kind == "lessons":
+        from ve_lessons_ledger import lesson_row_errors
+
+        return lesson_row_errors
+    if kind == "pairing":
+        from ve_pairing_recorder import pairing_row_errors
+
+        return pairing_row_errors
+    if kind == "receipt":
+        from echo_root_receipt import validate_schema
+
+        return validate_schema
+    if kind == "audit":
+        from ve_audit_chain import audit_row_errors
+
+        return lambda record: audit_row_errors(record, signing_key)
+    raise ValueError(f"unknown ledger kind {kind!r}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Follow a hash-chained VE ledger and print verified NDJSON events")
+    parser.add_argument("--ledger", default="ve_data/gate_pipeline_audit.jsonl")
+    parser.add_argument("--kind", choices=("audit", "receipt"), default="audit")
+    parser.add_argument("--signing-key-env", default="VE_AUDIT_SIGNING_KEY")
+    start = parser.add_mutually_exclusive_group()
+    start.add_argument("--from-start", action="store_true", help="Begin at the first row of the active segment.")
+    start.add_argument("--from-offset", type=int, help="Begin at this byte offset of the active segment.")
+    parser.add_argument("--after-hash", help="Begin after the row with this hash_self (checked against --from-offset).")
+    parser.add_argument("--once", action="store_true", help="Print what is there now and exit instead of following.")
+    parser.add_argument("--timeout", type=float, help="Stop following after this many seconds.")
+    args = parser.parse_args()
+    path = Path(args.ledger)
+    follower = LedgerFollower(
+        path,
+        from_offset=0 if args.from_start else args.from_offset,
+        after_hash=args.after_hash,
+        check_row=row_check(args.kind, os.environ.get(args.signing_key_env, "demo-local-signing-key")),
+    )
+    try:
+        events = follower.poll() if args.once else follower.follow(args.timeout)
+        for event in events:
+            print(json.dumps(event, sort_keys=True), flush=True)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        follower.close()
+    print(json.dumps({"cursor": follower.cursor()}, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
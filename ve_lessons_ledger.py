@@ -8,6 +8,11 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+from ve_storage import open_log
+
+
+LESSON_INDEX_FIELDS = ("tags", "confidence")
+
 
 @dataclass(frozen=True)
 class LessonRecord:
@@ -25,6 +30,12 @@ def stable_hash(payload: dict[str, Any]) -> str:
     return hashlib.sha256(json.dumps(payload, sort_keys=True, separators=(",", ":")).encode("utf-8")).hexdigest()
 
 
+def lesson_row_errors(item: dict[str, Any]) -> list[str]:
+    """Re-hash one stored lesson row."""
+    body = {key: value for key, value in item.items() if key != "hash_self"}
+    return [] if item.get("hash_self") == stable_hash(body) else ["hash_self does not match lesson body"]
+
+
 def append_lesson(path: Path, incident: str, outcome: str, fix: str, lesson: str, confidence: str, tags: list[str]) -> LessonRecord:
     body = {
         "ts": datetime.now(timezone.utc).isoformat(),
@@ -36,30 +47,27 @@ def append_lesson(path: Path, incident: str, outcome: str, fix: str, lesson: str
         "tags": tags,
     }
     record = LessonRecord(**body, hash_self=stable_hash(body))
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("a", encoding="utf-8") as handle:
-        handle.write(json.dumps(asdict(record), sort_keys=True) + "\n")
+    log = open_log(path, LESSON_INDEX_FIELDS)
+    try:
+        log.append([asdict(record)])
+    finally:
+        log.close()
     return record
 
 
 def list_lessons(path: Path, tag: str = "") -> list[LessonRecord]:
     if not path.exists():
         return []
-    rows = []
-    with path.open("r", encoding="utf-8") as handle:
-        for line in handle:
-            if not line.strip():
-                continue
-            item = LessonRecord(**json.loads(line))
-            if tag and tag not in item.tags:
-                continue
-            rows.append(item)
-    return rows
+    log = open_log(path, LESSON_INDEX_FIELDS)
+    try:
+        return [LessonRecord(**item) for item in (log.records("tags", tag) if tag else log.records())]
+    finally:
+        log.close()
 
 
 def main() -> int:
     parser = argparse.ArgumentParser(description="VE habitat lessons learned ledger")
-    parser.add_argument("--ledger", default="ve_data/habitat_lessons.jsonl")
+    parser.add_argument("--ledger", default="ve_data/habitat_lessons.jsonl", help="A .sqlite path selects the SQLite store.")
     sub = parser.add_subparsers(dest="command", required=True)
 
     add = sub.add_parser("add")
@@ -9,8 +9,10 @@ from pathlib import Path
 from typing import Any
 
 from ve_pairing_clarifier import assess_clarification_need
+from ve_storage import open_log
 
 ALLOWED_CLARIFICATION_RESOLVERS = {"human", "operator", "contact"}
+PAIRING_INDEX_FIELDS = ("session_id", "consent_to_train", "tags")
 
 
 @dataclass(frozen=True)
@@ -36,6 +38,12 @@ def stable_hash(payload: dict[str, Any]) -> str:
     return hashlib.sha256(encoded).hexdigest()
 
 
+def pairing_row_errors(item: dict[str, Any]) -> list[str]:
+    """Re-hash one stored pairing row."""
+    body = {key: value for key, value in item.items() if key != "hash_self"}
+    return [] if item.get("hash_self") == stable_hash(body) else ["hash_self does not match pairing body"]
+
+
 def append_pairing_record(
     path: Path,
     session_id: str,
@@ -80,42 +88,43 @@ def append_pairing_record(
         "tags": tags or [],
     }
     record = PairingRecord(**body, hash_self=stable_hash(body))
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("a", encoding="utf-8") as handle:
-        handle.write(json.dumps(asdict(record), sort_keys=True) + "\n")
+    log = open_log(path, PAIRING_INDEX_FIELDS)
+    try:
+        log.append([asdict(record)])
+    finally:
+        log.close()
     return record
 
 
+def _training_row(item: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "messages": [
+            {
+                "role": "system",
+                "content": f"You are a {item['ai_role']}. Preserve user consent, scope, and auditability.",
+            },
+            {"role": "user", "content": item["human_input"]},
+            {"role": "assistant", "content": item["ai_output"]},
+        ],
+        "metadata": {
+            "session_id": item["session_id"],
+            "turn_id": item["turn_id"],
+            "human_intent": item["human_intent"],
+            "outcome_label": item["outcome_label"],
+            "redaction_status": item["redaction_status"],
+            "tags": item.get("tags", []),
+        },
+    }
+
+
 def export_training_candidates(source: Path, output: Path) -> int:
     rows = []
     if source.exists():
-        with source.open("r", encoding="utf-8") as handle:
-            for line in handle:
-                if not line.strip():
-                    continue
-                item = json.loads(line)
-                if item.get("consent_to_train") is not True:
-                    continue
-                rows.append(
-                    {
-                        "messages": [
-                            {
-                                "role": "system",
-                                "content": f"You are a {item['ai_role']}. Preserve user consent, scope, and auditability.",
-                            },
-                            {"role": "user", "content": item["human_input"]},
-                            {"role": "assistant", "content": item["ai_output"]},
-                        ],
-                        "metadata": {
-                            "session_id": item["session_id"],
-                            "turn_id": item["turn_id"],
-                            "human_intent": item["human_intent"],
-                            "outcome_label": item["outcome_label"],
-                            "redaction_status": item["redaction_status"],
-                            "tags": item.get("tags", []),
-                        },
-                    }
-                )
+        log = open_log(source, PAIRING_INDEX_FIELDS)
+        try:
+            rows = [_training_row(item) for item in log.records("consent_to_train", True) if item.get("consent_to_train") is True]
+        finally:
+            log.close()
     output.parent.mkdir(parents=True, exist_ok=True)
     output.write_text("\n".join(json.dumps(row) for row in rows) + ("\n" if rows else ""), encoding="utf-8")
     return len(rows)
@@ -126,7 +135,7 @@ def main() -> int:
     sub = parser.add_subparsers(dest="command", required=True)
 
     record = sub.add_parser("record", help="Append one consented pairing record")
-    record.add_argument("--ledger", default="ve_data/pairing_records.jsonl")
+    record.add_argument("--ledger", default="ve_data/pairing_records.jsonl", help="A .sqlite path selects the SQLite store.")
     record.add_argument("--session-id", required=True)
     record.add_argument("--turn-id", required=True)
     record.add_argument("--human-input", required=True)
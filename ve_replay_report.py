@@ -1,45 +1,23 @@
 from __future__ import annotations
 
 import argparse
+import hmac
+import json
+import os
+import tempfile
+from dataclasses import asdict
 from html import escape
 from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator
 
-from ve_gate_replay import replay_gate_audit
+from ve_audit_chain import audit_segment_check, sha256, sign, verify_audit_chain
+from ve_gate_replay import AUDIT_REPLAY_FIELDS, iter_replay_records, replay_record
+from ve_ledger_io import chain_origin, file_identity, record_before
+from ve_ledger_segments import iter_sealed_records, segment_fingerprints, verify_segments
+from ve_ledger_tail import LedgerFollower, row_check
 
 
-def render_html(summary: dict) -> str:
-    sessions = "\n".join(
-        "<tr>"
-        f"<td>{escape(item['pairing_id'])}</td>"
-        f"<td>{item['records']}</td>"
-        f"<td>{item['advisory_events']}</td>"
-        f"<td>{item['adverse_events']}</td>"
-        f"<td>{item['classifier_changes']}</td>"
-        f"<td>{item['max_twin_delta']:.3f}</td>"
-        "</tr>"
-        for item in summary["sessions"]
-    )
-    records = "\n".join(
-        "<tr>"
-        f"<td>{escape(item['trace_id'])}</td>"
-        f"<td>{escape(item['pairing_id'])}</td>"
-        f"<td>{escape(item['action_class'])}</td>"
-        f"<td>{escape(item['actual_decision'])}</td>"
-        f"<td>{escape(item['replay_deviation_class'])}</td>"
-        f"<td>{item['twin_delta']:.3f}</td>"
-        f"<td>{'yes' if item['classifier_changed'] else 'no'}</td>"
-        "</tr>"
-        for item in summary["records"]
-    )
-    chain_status = "VALID" if summary["audit_chain_valid"] else "INVALID"
-    return f"""<!doctype html>
-<html lang="en">
-<head>
-  <meta charset="utf-8">
-  <meta name="viewport" content="width=device-width, initial-scale=1">
-  <title>VE Gate Replay Report</title>
-  <style>
-    :root {{
+STYLE = """    :root {
       color-scheme: dark;
       --bg: #071014;
       --panel: #0f2027;
@@ -50,69 +28,69 @@ def render_html(summary: dict) -> str:
       --accent: #26e3c2;
       --warn: #f2b84b;
       --bad: #ff6b6b;
-    }}
-    body {{
+    }
+    body {
       margin: 0;
       background: var(--bg);
       color: var(--ink);
       font-family: "Segoe UI", Arial, sans-serif;
-    }}
-    header, main {{
+    }
+    header, main {
       padding: 28px clamp(20px, 5vw, 64px);
-    }}
-    header {{
+    }
+    header {
       background: var(--panel);
       border-bottom: 1px solid var(--line);
-    }}
-    h1 {{
+    }
+    h1 {
       margin: 0 0 8px;
       font-size: clamp(28px, 4vw, 42px);
       letter-spacing: 0;
-    }}
-    h2 {{
+    }
+    h2 {
       margin: 0 0 14px;
       font-size: 20px;
       letter-spacing: 0;
-    }}
-    p {{
+    }
+    p {
       color: var(--muted);
       margin: 0;
       line-height: 1.5;
       max-width: 860px;
-    }}
-    main {{
+    }
+    main {
       display: grid;
       gap: 28px;
-    }}
-    .metrics {{
+    }
+    .metrics {
       display: grid;
       grid-template-columns: repeat(auto-fit, minmax(170px, 1fr));
       gap: 12px;
-    }}
-    article {{
+    }
+    article {
       background: var(--panel);
       border: 1px solid var(--line);
       border-radius: 8px;
       padding: 16px;
       display: grid;
       gap: 8px;
-    }}
-    article strong {{
+    }
+    article strong {
       color: var(--muted);
       font-size: 12px;
       text-transform: uppercase;
-    }}
-    article span {{
+    }
+    article span {
       font-size: 28px;
       font-weight: 700;
-    }}
-    .valid {{
+    }
+    .valid {
       color: var(--accent);
-    }}
-    .invalid {{
+    }
+    .invalid {
       color: var(--bad);
-    }}
-    table {{
+    }
+    table {
       width: 100%;
       border-collapse: collapse;
       background: var(--panel);
@@ -120,30 +98,83 @@ def render_html(summary: dict) -> str:
       border-radius: 8px;
       overflow: hidden;
       font-size: 14px;
-    }}
-    th, td {{
+    }
+    th, td {
       text-align: left;
       padding: 10px 12px;
       border-bottom: 1px solid var(--line);
       vertical-align: top;
-    }}
-    th {{
+    }
+    th {
       background: var(--panel-2);
       color: var(--muted);
       font-size: 12px;
       text-transform: uppercase;
-    }}
-    code {{
+    }
+    code {
       color: var(--accent);
-    }}
-    @media (max-width: 760px) {{
-      table {{
+    }
+    @media (max-width: 760px) {
+      table {
         display: block;
         overflow-x: auto;
         white-space: nowrap;
-      }}
-    }}
-  </style>
+      }
+    }
+"""
+
+
+RECORDS_HEAD = "<thead><tr><th>Trace</th><th>Pairing</th><th>Action</th><th>Decision</th><th>Replay Class</th><th>Twin Delta</th><th>Classifier Changed</th></tr></thead>"
+
+
+def _record_row(item: dict) -> str:
+    return (
+        "<tr>"
+        f"<td>{escape(item['trace_id'])}</td>"
+        f"<td>{escape(item['pairing_id'])}</td>"
+        f"<td>{escape(item['action_class'])}</td>"
+        f"<td>{escape(item['actual_decision'])}</td>"
+        f"<td>{escape(item['replay_deviation_class'])}</td>"
+        f"<td>{item['twin_delta']:.3f}</td>"
+        f"<td>{'yes' if item['classifier_changed'] else 'no'}</td>"
+        "</tr>"
+    )
+
+
+def _session_row(item: dict) -> str:
+    return (
+        "<tr>"
+        f"<td>{escape(item['pairing_id'])}</td>"
+        f"<td>{item['records']}</td>"
+        f"<td>{item['advisory_events']}</td>"
+        f"<td>{item['adverse_events']}</td>"
+        f"<td>{item['classifier_changes']}</td>"
+        f"<td>{item['max_twin_delta']:.3f}</td>"
+        "</tr>"
+    )
+
+
+def _joined(items: Iterable[dict], render: Callable[[dict], str]) -> Iterator[str]:
+    """Yield render(item) for each item, newline-separated, without building the joined string."""
+    for index, item in enumerate(items):
+        yield "\n" + render(item) if index else render(item)
+
+
+def _record_rows(records: Iterable[dict]) -> str:
+    return "".join(_joined(records, _record_row))
+
+
+def iter_html(summary: dict, pager: str = "") -> Iterator[str]:
+    """Yield the HTML report in chunks; summary["sessions"] and summary["records"] may be iterators."""
+    chain_status = "VALID" if summary["audit_chain_valid"] else "INVALID"
+    yield f"""<!doctype html>
+<html lang="en">
+<head>
+  <meta charset="utf-8">
+  <meta name="viewport" content="width=device-width, initial-scale=1">
+  <title>VE Gate Replay Report</title>
+  <style>
+{STYLE}  </style>
 </head>
 <body>
   <header>
@@ -163,14 +194,18 @@ def render_html(summary: dict) -> str:
       <h2>Sessions</h2>
       <table>
         <thead><tr><th>Pairing</th><th>Records</th><th>Advisory</th><th>Adverse</th><th>Classifier Changes</th><th>Max Twin Delta</th></tr></thead>
-        <tbody>{sessions}</tbody>
+        <tbody>"""
+    yield from _joined(summary["sessions"], _session_row)
+    yield f"""</tbody>
       </table>
     </section>
     <section>
-      <h2>Records</h2>
+      <h2>Records</h2>{pager}
       <table>
-        <thead><tr><th>Trace</th><th>Pairing</th><th>Action</th><th>Decision</th><th>Replay Class</th><th>Twin Delta</th><th>Classifier Changed</th></tr></thead>
-        <tbody>{records}</tbody>
+        {RECORDS_HEAD}
+        <tbody>"""
+    yield from _joined(summary["records"], _record_row)
+    yield """</tbody>
       </table>
     </section>
     <p>Replay diff shows whether current classifier logic reinterprets historical signed records.</p>
@@ -180,13 +215,17 @@ def render_html(summary: dict) -> str:
 """
 
 
-def render_markdown(summary: dict) -> str:
+def render_html(summary: dict, pager: str = "") -> str:
+    return "".join(iter_html(summary, pager))
+
+
+def _markdown_session_row(item: dict) -> str:
+    return f"| {item['pairing_id']} | {item['records']} | {item['advisory_events']} | {item['adverse_events']} | {item['classifier_changes']} | {item['max_twin_delta']:.3f} |"
+
+
+def iter_markdown(summary: dict) -> Iterator[str]:
     status = "VALID" if summary["audit_chain_valid"] else "INVALID"
-    session_rows = "\n".join(
-        f"| {item['pairing_id']} | {item['records']} | {item['advisory_events']} | {item['adverse_events']} | {item['classifier_changes']} | {item['max_twin_delta']:.3f} |"
-        for item in summary["sessions"]
-    )
-    return f"""# VE Gate Replay Report
+    yield f"""# VE Gate Replay Report
 
 | Metric | Value |
 | --- | ---: |
@@ -201,27 +240,316 @@ def render_markdown(summary: dict) -> str:
 
 | Pairing | Records | Advisory | Adverse | Classifier Changes | Max Twin Delta |
 | --- | ---: | ---: | ---: | ---: | ---: |
-{session_rows}
 """
+    yield from _joined(summary["sessions"], _markdown_session_row)
+    yield "\n"
+
+
+def render_markdown(summary: dict) -> str:
+    return "".join(iter_markdown(summary))
+
+
+def write_chunks(path: Path, chunks: Iterable[str]) -> None:
+    """Write chunks to path as they are produced, so only one chunk is held at a time."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as handle:
+        for chunk in chunks:
+            handle.write(chunk)
+
+
+def _totals() -> dict[str, Any]:
+    return {"records_replayed": 0, "adverse_events": 0, "advisory_events": 0, "classifier_changes": 0, "max_twin_delta": None, "sessions": []}
 
 
 def write_replay_report(ledger: Path, html_out: Path, markdown_out: Path, signing_key: str) -> dict:
-    summary = replay_gate_audit(ledger, signing_key)
-    html_out.parent.mkdir(parents=True, exist_ok=True)
-    markdown_out.parent.mkdir(parents=True, exist_ok=True)
-    html_out.write_text(render_html(summary), encoding="utf-8")
-    markdown_out.write_text(render_markdown(summary), encoding="utf-8")
+    """Replay every row once and write both reports with memory bounded by the session count.
+
+    Rows are folded into the totals and sessions as they are replayed and
+    spooled to a temporary file, because the HTML shows the totals before the
+    record table. The returned summary has no "records".
+    """
+    chain_valid = verify_audit_chain(ledger, signing_key)
+    totals = _totals()
+    sessions: dict[str, dict] = {}
+    with tempfile.TemporaryFile("w+", encoding="utf-8") as spool:
+        for record in iter_replay_records(ledger):
+            row = asdict(record)
+            _add_record(totals, sessions, row)
+            spool.write(json.dumps(row) + "\n")
+        spool.seek(0)
+        summary = {
+            "audit_chain_valid": chain_valid,
+            **totals,
+            "max_twin_delta": 0.0 if totals["max_twin_delta"] is None else totals["max_twin_delta"],
+        }
+        write_chunks(html_out, iter_html({**summary, "records": (json.loads(line) for line in spool)}))
+    write_chunks(markdown_out, iter_markdown(summary))
     return summary
 
 
+STATE_FORMAT = "ve-replay-report-state-v3"
+DEFAULT_PAGE_SIZE = 500
+PAGE_LINKS = 5
+POLL_BATCH = 1000
+
+
+def state_path(html_out: Path) -> Path:
+    return html_out.with_name(html_out.stem + ".state.json")
+
+
+def pages_dir(html_out: Path) -> Path:
+    return html_out.with_name(html_out.stem + "_pages")
+
+
+def _page_name(number: int) -> str:
+    return f"records-{number:06d}.html"
+
+
+def _fresh_state(ledger: Path, page_size: int) -> dict[str, Any]:
+    return {
+        "format": STATE_FORMAT,
+        "ledger": str(ledger.resolve()),
+        "origin": chain_origin(ledger),
+        "page_size": page_size,
+        "cursor": {"offset": 0, "hash": chain_origin(ledger)},
+        "active_file": None,
+        "sealed": [],
+        "rows_valid": True,
+        **_totals(),
+        "pages": 0,
+        "tail": [],
+    }
+
+
+def _read_state(path: Path, ledger: Path, page_size: int, signing_key: str) -> dict[str, Any] | None:
+    """Return the saved state only if its HMAC verifies and it belongs to this ledger and page size."""
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        body = {key: value for key, value in data.items() if key != "hmac"}
+    except (OSError, ValueError, AttributeError):
+        return None
+    if not hmac.compare_digest(str(data.get("hmac", "")), sign(sha256(body), signing_key)):
+        return None
+    fresh = _fresh_state(ledger, page_size)
+    if any(body.get(key) != fresh[key] for key in ("format", "ledger", "origin", "page_size")):
+        return None
+    return body
+
+
+def _active_file(ledger: Path) -> list[int] | None:
+    identity = file_identity(ledger)
+    return None if identity is None else identity[:2]
+
+
+def _resume(ledger: Path, state: dict[str, Any], check: Callable[[dict], list[str]]) -> bool:
+    """O(1) check that the saved cursor still holds.
+
+    The active segment must be the same file (device and inode) with the row
+    before the cursor still carrying the cursor hash, as resolve_start checks
+    a follow cursor, and that row must still pass check. Rows before it are
+    trusted on the signed state, the way verify_audit_chain_incremental
+    trusts its signed checkpoint.
+    """
+    offset = int(state["cursor"]["offset"])
+    if offset == 0:
+        return True
+    if _active_file(ledger) != state.get("active_file"):
+        return False
+    try:
+        found = record_before(ledger, offset)
+    except (OSError, ValueError):
+        return False
+    return found is not None and found[1].get("hash_self") == state["cursor"]["hash"] and not check(found[1])
+
+
+def _write_state(path: Path, state: dict[str, Any], signing_key: str) -> None:
+    temp = path.with_name(path.name + ".tmp")
+    temp.write_text(json.dumps({**state, "hmac": sign(sha256(state), signing_key)}, sort_keys=True), encoding="utf-8")
+    os.replace(temp, path)
+
+
+def render_records_page(records: list[dict], number: int, report_name: str, has_next: bool) -> str:
+    links = [f'<a href="../{escape(report_name)}">Report</a>']
+    if number > 1:
+        links.append(f'<a href="{_page_name(number - 1)}">Previous</a>')
+    if has_next:
+        links.append(f'<a href="{_page_name(number + 1)}">Next</a>')
+    return f"""<!doctype html>
+<html lang="en">
+<head>
+  <meta charset="utf-8">
+  <meta name="viewport" content="width=device-width, initial-scale=1">
+  <title>VE Gate Replay Records - Page {number}</title>
+  <style>
+{STYLE}  </style>
+</head>
+<body>
+  <header>
+    <h1>VE Gate Replay Records</h1>
+    <p>Page {number}. {' | '.join(links)}</p>
+  </header>
+  <main>
+    <table>
+      {RECORDS_HEAD}
+      <tbody>{_record_rows(records)}</tbody>
+    </table>
+  </main>
+</body>
+</html>
+"""
+
+
+def _pager(state: dict[str, Any], directory: str) -> str:
+    pages = state["pages"]
+    if not pages:
+        return ""
+    numbers = sorted({1, *range(max(1, pages - PAGE_LINKS + 1), pages + 1)})
+    links: list[str] = []
+    for index, number in enumerate(numbers):
+        if index and number != numbers[index - 1] + 1:
+            links.append("&hellip;")
+        links.append(f'<a href="{escape(directory)}/{_page_name(number)}">{number}</a>')
+    return f"\n      <p>Latest {len(state['tail'])} of {state['records_replayed']} records. Pages: {' '.join(links)}</p>"
+
+
+def _add_record(state: dict[str, Any], sessions: dict[str, dict], record: dict) -> None:
+    pairing_id = record["pairing_id"]
+    session = sessions.get(pairing_id)
+    if session is None:
+        session = {"pairing_id": pairing_id, "records": 0, "adverse_events": 0, "advisory_events": 0, "max_twin_delta": 0.0, "classifier_changes": 0}
+        sessions[pairing_id] = session
+        state["sessions"].append(session)
+    adverse = record["replay_deviation_class"] == "adverse_event"
+    advisory = record["replay_deviation_class"] == "advisory"
+    changed = bool(record["classifier_changed"])
+    session["records"] += 1
+    session["adverse_events"] += adverse
+    session["advisory_events"] += advisory
+    session["classifier_changes"] += changed
+    session["max_twin_delta"] = max(session["max_twin_delta"], record["twin_delta"])
+    state["records_replayed"] += 1
+    state["adverse_events"] += adverse
+    state["advisory_events"] += advisory
+    state["classifier_changes"] += changed
+    peak = state["max_twin_delta"]
+    state["max_twin_delta"] = record["twin_delta"] if peak is None else max(peak, record["twin_delta"])
+
+
+def write_replay_report_incremental(
+    ledger: Path,
+    html_out: Path,
+    markdown_out: Path,
+    signing_key: str,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    state_file: Path | None = None,
+) -> dict:
+    """Update the reports from rows appended since the last run.
+
+    The running totals, per-session aggregates, and a cursor into the active
+    segment are kept in an HMAC-signed state file. Records are written to
+    fixed-size pages next to the HTML report; only the last page is rewritten,
+    and the HTML shows that page with links to the others.
+
+    A run resumes only when the active segment is the same file (device and
+    inode) and the row before the cursor still carries the cursor hash; that
+    check reads one row. Anything else, including a rotation, rebuilds from
+    the first sealed segment: sealed rows are replayed, then the active
+    segment from its origin. The totals then match write_replay_report for
+    every row the report has read.
+
+    Sealed segments are verified (digest and rows) once per stored file: the
+    state records each verified segment's name, sha256 and file identity,
+    and later runs only re-check the manifest linkage for those.
+    """
+    if page_size < 1:
+        raise ValueError("page_size must be positive")
+    state_file = state_path(html_out) if state_file is None else state_file
+    directory = pages_dir(html_out)
+    check = row_check("audit", signing_key)
+    state = _read_state(state_file, ledger, page_size, signing_key)
+    trusted = [] if state is None else state["sealed"]
+    rebuilt = state is None or not _resume(ledger, state, check)
+    if rebuilt:
+        state = _fresh_state(ledger, page_size)
+        for stale in directory.glob("records-*.html"):
+            stale.unlink()
+    directory.mkdir(parents=True, exist_ok=True)
+    sessions = {item["pairing_id"]: item for item in state["sessions"]}
+    added = 0
+
+    def fold(item: dict[str, Any]) -> None:
+        nonlocal added
+        record = replay_record(item)
+        if record is None:
+            return
+        if not state["pages"] or len(state["tail"]) == page_size:
+            state["pages"] += 1
+            state["tail"] = []
+        row = asdict(record)
+        _add_record(state, sessions, row)
+        state["tail"].append(row)
+        added += 1
+        if len(state["tail"]) == page_size:
+            page = render_records_page(state["tail"], state["pages"], html_out.name, has_next=True)
+            (directory / _page_name(state["pages"])).write_text(page, encoding="utf-8")
+
+    sealed_valid = not verify_segments(ledger, audit_segment_check(signing_key), trusted)
+    state["sealed"] = segment_fingerprints(ledger) if sealed_valid else []
+    if rebuilt:
+        for item in iter_sealed_records(ledger, AUDIT_REPLAY_FIELDS):
+            fold(item)
+    follower = LedgerFollower(ledger, state["cursor"]["offset"], state["cursor"]["hash"], check)
+    try:
+        while events := follower.poll(POLL_BATCH):
+            for event in events:
+                state["rows_valid"] = state["rows_valid"] and event["valid"]
+                if event["record"] is not None:
+                    fold(event["record"])
+        state["cursor"] = follower.cursor()
+    finally:
+        follower.close()
+    state["active_file"] = _active_file(ledger)
+    if state["tail"] and len(state["tail"]) < page_size:
+        page = render_records_page(state["tail"], state["pages"], html_out.name, has_next=False)
+        (directory / _page_name(state["pages"])).write_text(page, encoding="utf-8")
+
+    summary = {
+        "audit_chain_valid": state["rows_valid"] and sealed_valid,
+        "records_replayed": state["records_replayed"],
+        "adverse_events": state["adverse_events"],
+        "advisory_events": state["advisory_events"],
+        "max_twin_delta": 0.0 if state["max_twin_delta"] is None else state["max_twin_delta"],
+        "classifier_changes": state["classifier_changes"],
+        "sessions": state["sessions"],
+        "records": state["tail"],
+    }
+    write_chunks(html_out, iter_html(summary, _pager(state, directory.name)))
+    write_chunks(markdown_out, iter_markdown(summary))
+    _write_state(state_file, state, signing_key)
+    return {**summary, "records_added": added, "pages": state["pages"], "rebuilt": rebuilt}
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Generate VE gate replay HUD-style reports")
     parser.add_argument("--ledger", default="ve_data/gate_pipeline_audit.jsonl")
     parser.add_argument("--html-out", default="ve_data/gate_replay_report.html")
     parser.add_argument("--markdown-out", default="ve_data/gate_replay_report.md")
     parser.add_argument("--signing-key", default="demo-local-signing-key")
+    parser.add_argument("--incremental", action="store_true", help="Process only rows appended since the last run and page the record table.")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE, help="Records per page in incremental mode.")
+    parser.add_argument("--state", default=None, help="State file for incremental mode (default: next to --html-out).")
     args = parser.parse_args()
-    summary = write_replay_report(Path(args.ledger), Path(args.html_out), Path(args.markdown_out), args.signing_key)
+    if args.incremental:
+        summary = write_replay_report_incremental(
+            Path(args.ledger),
+            Path(args.html_out),
+            Path(args.markdown_out),
+            args.signing_key,
+            args.page_size,
+            None if args.state is None else Path(args.state),
+        )
+    else:
+        summary = write_replay_report(Path(args.ledger), Path(args.html_out), Path(args.markdown_out), args.signing_key)
     print(f"wrote_reports=true audit_chain_valid={str(summary['audit_chain_valid']).lower()} records={summary['records_replayed']}")
     return 0 if summary["audit_chain_valid"] else 1
 
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import lzma
+import os
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+
+ARCHIVE_FORMAT = "ve-xz-blocks-1"
+BLOCK_TARGET_BYTES = 256 * 1024
+
+
+def archive_path(segment: Path) -> Path:
+    return segment.with_name(segment.name + ".xz")
+
+
+def block_index_path(archive: Path) -> Path:
+    return archive.with_name(archive.name + ".index.json")
+
+
+def _blocks(source: Path, target_bytes: int) -> Iterator[tuple[int, int, list[bytes]]]:
+    """Yield (raw offset, first line, raw lines) groups cut on line boundaries."""
+    offset = 0
+    line = 1
+    pending: list[bytes] = []
+    pending_bytes = 0
+    with source.open("rb") as handle:
+        for raw in handle:
+            pending.append(raw)
+            pending_bytes += len(raw)
+            if pending_bytes >= target_bytes:
+                yield offset, line, pending
+                offset += pending_bytes
+                line += len(pending)
+                pending, pending_bytes = [], 0
+    if pending:
+        yield offset, line, pending
+
+
+def write_archive(source: Path, target: Path, block_target_bytes: int = BLOCK_TARGET_BYTES) -> dict[str, Any]:
+    """Transcode a sealed JSONL segment into independently compressed XZ blocks.
+
+    Every block is its own XZ stream cut on a line boundary, so the archive is
+    also a plain multi-stream .xz file and decompresses to the exact source
+    bytes. The block index records where each block sits in both the archive
+    and the original segment.
+    """
+    blocks: list[dict[str, Any]] = []
+    digest = hashlib.sha256()
+    temp = target.with_name(target.name + ".tmp")
+    with temp.open("wb") as handle:
+        for raw_offset, first_line, lines in _blocks(source, block_target_bytes):
+            raw = b"".join(lines)
+            digest.update(raw)
+            packed = lzma.compress(raw, format=lzma.FORMAT_XZ, preset=6)
+            blocks.append(
+                {
+                    "offset": handle.tell(),
+                    "length": len(packed),
+                    "raw_offset": raw_offset,
+                    "raw_bytes": len(raw),
+                    "first_line": first_line,
+                    "lines": len(lines),
+                }
+            )
+            handle.write(packed)
+        handle.flush()
+        os.fsync(handle.fileno())
+    index = {
+        "format": ARCHIVE_FORMAT,
+        "raw_bytes": sum(block["raw_bytes"] for block in blocks),
+        "raw_sha256": digest.hexdigest(),
+        "blocks": blocks,
+    }
+    index_temp = block_index_path(target).with_name(block_index_path(target).name + ".tmp")
+    index_temp.write_text(json.dumps(index, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    os.replace(temp, target)
+    os.replace(index_temp, block_index_path(target))
+    return index
+
+
+def read_block_index(archive: Path) -> dict[str, Any]:
+    index = json.loads(block_index_path(archive).read_text(encoding="utf-8"))
+    if index.get("format") != ARCHIVE_FORMAT:
+        raise ValueError(f"unsupported segment archive format: {index.get('format')!r}")
+    return index
+
+
+def read_blocks(archive: Path, blocks: Iterable[dict[str, Any]]) -> Iterator[bytes]:
+    """Decompress only the given blocks, in the order given."""
+    with archive.open("rb") as handle:
+        for block in blocks:
+            handle.seek(block["offset"])
+            try:
+                raw = lzma.decompress(handle.read(block["length"]), format=lzma.FORMAT_XZ)
+            except lzma.LZMAError as exc:
+                raise ValueError(f"archive block at offset {block['offset']} is corrupt: {exc}") from exc
+            if len(raw) != block["raw_bytes"]:
+                raise ValueError(f"archive block at offset {block['offset']} decompressed to the wrong size")
+            yield raw
+
+
+def iter_raw(archive: Path) -> Iterator[bytes]:
+    """Yield the original segment bytes block by block."""
+    return read_blocks(archive, read_block_index(archive)["blocks"])
+
+
+def archive_digest(archive: Path) -> str:
+    digest = hashlib.sha256()
+    for raw in iter_raw(archive):
+        digest.update(raw)
+    return digest.hexdigest()
+
+
+def restore_segment(archive: Path, target: Path) -> None:
+    """Write the exact original segment bytes back to target."""
+    temp = target.with_name(target.name + ".tmp")
+    with temp.open("wb") as handle:
+        for raw in iter_raw(archive):
+            handle.write(raw)
+    os.replace(temp, target)
+
+
+def scan_archive(archive: Path) -> Iterator[tuple[int, dict[str, Any]]]:
+    """Yield (raw offset, record) for archived rows, decompressing one block at a time."""
+    blocks = read_block_index(archive)["blocks"]
+    for block, raw in zip(blocks, read_blocks(archive, blocks)):
+        offset = block["raw_offset"]
+        for line in io.BytesIO(raw):
+            if line.strip():
+                yield offset, json.loads(line)
+            offset += len(line)
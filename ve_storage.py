@@ -0,0 +1,338 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sqlite3
+from contextlib import closing, contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Protocol
+
+from ve_ledger_io import ZERO_HASH, append_record, append_records, encode_line, iter_records, ledger_lock, tail_hash
+
+
+SQLITE_SUFFIXES = {".sqlite", ".sqlite3", ".db"}
+BUSY_TIMEOUT_SECONDS = 10.0
+RecordBuilder = Callable[[str], dict[str, Any]]
+RowCheck = Callable[[dict[str, Any]], list[str]]
+
+_LOG_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS records (seq INTEGER PRIMARY KEY, hash_prev TEXT NOT NULL, hash_self TEXT NOT NULL, body TEXT NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS records_hash ON records (hash_self)",
+    "CREATE TABLE IF NOT EXISTS keys (field TEXT NOT NULL, value TEXT NOT NULL, seq INTEGER NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS keys_lookup ON keys (field, value, seq)",
+)
+_TABLE_SCHEMA = ("CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, body TEXT NOT NULL)",)
+
+
+def is_sqlite(path: Path) -> bool:
+    return path.suffix in SQLITE_SUFFIXES
+
+
+def connect(path: Path, schema: Iterable[str] = (), synchronous: str = "FULL") -> sqlite3.Connection:
+    """Open a WAL-mode database in autocommit mode; transactions are explicit."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT_SECONDS, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(f"PRAGMA synchronous={synchronous}")
+    for statement in schema:
+        conn.execute(statement)
+    return conn
+
+
+@contextmanager
+def write_transaction(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """BEGIN IMMEDIATE ... COMMIT, so concurrent writers queue on the busy timeout instead of failing mid-way."""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def key_value(value: Any) -> str | None:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (str, int, float)):
+        return str(value)
+    return None
+
+
+def record_keys(record: dict[str, Any], fields: Iterable[str]) -> list[tuple[str, str]]:
+    """Return the (field, value) pairs a row is indexed under; a list field is indexed per element."""
+    found: list[tuple[str, str]] = []
+    for field in fields:
+        value = record.get(field)
+        for item in value if isinstance(value, list) else [value]:
+            text = key_value(item)
+            if text is not None:
+                found.append((field, text))
+    return found
+
+
+def matches(record: dict[str, Any], field: str, value: Any) -> bool:
+    return (field, key_value(value)) in record_keys(record, (field,))
+
+
+class RecordLog(Protocol):
+    """An append-only record store: a flat JSONL ledger or an indexed SQLite table."""
+
+    def append(self, records: list[dict[str, Any]]) -> None: ...
+
+    def append_chained(self, build: RecordBuilder) -> dict[str, Any]: ...
+
+    def records(self, field: str | None = None, value: Any = None) -> Iterator[dict[str, Any]]: ...
+
+    def links(self) -> Iterator[tuple[str, str, dict[str, Any]]]: ...
+
+    def last_hash(self) -> str: ...
+
+    def close(self) -> None: ...
+
+
+class JsonlLog:
+    """The existing JSONL ledger behind the RecordLog interface; queries scan the file."""
+
+    def __init__(self, path: Path, index_fields: Iterable[str] = ()) -> None:
+        self.path = path
+
+    def append(self, records: list[dict[str, Any]]) -> None:
+        with ledger_lock(self.path):
+            append_records(self.path, records)
+
+    def append_chained(self, build: RecordBuilder) -> dict[str, Any]:
+        with ledger_lock(self.path):
+            record = build(tail_hash(self.path))
+            append_record(self.path, record)
+        return record
+
+    def records(self, field: str | None = None, value: Any = None) -> Iterator[dict[str, Any]]:
+        for record in iter_records(self.path):
+            if field is None or matches(record, field, value):
+                yield record
+
+    def links(self) -> Iterator[tuple[str, str, dict[str, Any]]]:
+        """Yield (hash_prev, hash_self, record) in append order; JSONL keeps the hashes only in the body."""
+        for record in iter_records(self.path):
+            yield str(record.get("hash_prev", "")), str(record.get("hash_self", "")), record
+
+    def last_hash(self) -> str:
+        return tail_hash(self.path)
+
+    def close(self) -> None:
+        pass
+
+
+class SqliteLog:
+    """Records in one SQLite table with hash_prev/hash_self columns and a field index.
+
+    Each append is one transaction, and a chained append reads the tail hash
+    inside it, so concurrent writers can never fork the chain. Queries on
+    index_fields use the index; other fields fall back to a scan. The indexed
+    fields are stored with the data, and opening with a different set
+    re-indexes the existing rows.
+    """
+
+    def __init__(self, path: Path, index_fields: Iterable[str] = ()) -> None:
+        self.path = path
+        self.conn = connect(path, _LOG_SCHEMA)
+        row = self.conn.execute("SELECT value FROM meta WHERE name = 'index_fields'").fetchone()
+        stored = tuple(json.loads(row[0])) if row else ()
+        self.index_fields = tuple(index_fields) or stored
+        if self.index_fields != stored:
+            self._reindex()
+
+    def _reindex(self) -> None:
+        with write_transaction(self.conn):
+            self.conn.execute("DELETE FROM keys")
+            for seq, body in self.conn.execute("SELECT seq, body FROM records").fetchall():
+                self.conn.executemany(
+                    "INSERT INTO keys (field, value, seq) VALUES (?, ?, ?)",
+                    [(field, value, seq) for field, value in record_keys(json.loads(body), self.index_fields)],
+                )
+            self.conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('index_fields', ?)", (json.dumps(self.index_fields),))
+
+    def _insert(self, record: dict[str, Any]) -> None:
+        cursor = self.conn.execute(
+            "INSERT INTO records (hash_prev, hash_self, body) VALUES (?, ?, ?)",
+            (str(record.get("hash_prev", "")), str(record.get("hash_self", "")), json.dumps(record, sort_keys=True)),
+        )
+        self.conn.executemany(
+            "INSERT INTO keys (field, value, seq) VALUES (?, ?, ?)",
+            [(field, value, cursor.lastrowid) for field, value in record_keys(record, self.index_fields)],
+        )
+
+    def append(self, records: list[dict[str, Any]]) -> None:
+        with write_transaction(self.conn):
+            for record in records:
+                self._insert(record)
+
+    def append_chained(self, build: RecordBuilder) -> dict[str, Any]:
+        with write_transaction(self.conn):
+            record = build(self.last_hash())
+            self._insert(record)
+        return record
+
+    def records(self, field: str | None = None, value: Any = None) -> Iterator[dict[str, Any]]:
+        if field is None:
+            rows = self.conn.execute("SELECT body FROM records ORDER BY seq")
+        elif field in self.index_fields:
+            rows = self.conn.execute(
+                "SELECT body FROM records WHERE seq IN (SELECT seq FROM keys WHERE field = ? AND value = ?) ORDER BY seq",
+                (field, key_value(value)),
+            )
+        else:
+            rows = (row for row in self.conn.execute("SELECT body FROM records ORDER BY seq") if matches(json.loads(row[0]), field, value))
+        for (body,) in rows:
+            yield json.loads(body)
+
+    def links(self) -> Iterator[tuple[str, str, dict[str, Any]]]:
+        """Yield (hash_prev column, hash_self column, record) in append order."""
+        for hash_prev, hash_self, body in self.conn.execute("SELECT hash_prev, hash_self, body FROM records ORDER BY seq"):
+            yield hash_prev, hash_self, json.loads(body)
+
+    def last_hash(self) -> str:
+        row = self.conn.execute("SELECT hash_self FROM records ORDER BY seq DESC LIMIT 1").fetchone()
+        return ZERO_HASH if row is None else row[0]
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def open_log(path: Path, index_fields: Iterable[str] = ()) -> RecordLog:
+    """A SqliteLog for .sqlite/.sqlite3/.db paths, otherwise the JSONL ledger."""
+    return SqliteLog(path, index_fields) if is_sqlite(path) else JsonlLog(path, index_fields)
+
+
+class SqliteTable:
+    """Keyed records (one row per key) for registries that are rewritten in place as JSONL."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.conn = connect(path, _TABLE_SCHEMA)
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        row = self.conn.execute("SELECT body FROM entries WHERE key = ?", (key,)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def put(self, key: str, record: dict[str, Any]) -> None:
+        self.conn.execute("INSERT OR REPLACE INTO entries (key, body) VALUES (?, ?)", (key, json.dumps(record, sort_keys=True)))
+
+    def replace(self, records: dict[str, dict[str, Any]]) -> None:
+        """Swap the whole table for records in one transaction."""
+        with write_transaction(self.conn):
+            self.conn.execute("DELETE FROM entries")
+            for key, record in records.items():
+                self.put(key, record)
+
+    def update(self, key: str, change: Callable[[dict[str, Any]], dict[str, Any]]) -> dict[str, Any] | None:
+        """Read, change, and write one row in a single transaction; None when the key is absent."""
+        with write_transaction(self.conn):
+            current = self.get(key)
+            if current is None:
+                return None
+            updated = change(current)
+            self.put(key, updated)
+        return updated
+
+    def values(self) -> list[dict[str, Any]]:
+        return [json.loads(body) for (body,) in self.conn.execute("SELECT body FROM entries ORDER BY key")]
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def verify_links(log: RecordLog, origin: str = ZERO_HASH, check_row: RowCheck | None = None) -> list[str]:
+    """Check each row's stored hash columns against its body, hash_prev linkage, and check_row.
+
+    check_row is the owning ledger's row check (content hash, schema or
+    signature); without it only the columns and linkage are checked.
+    """
+    errors: list[str] = []
+    expected = origin
+    for line, (hash_prev, hash_self, record) in enumerate(log.links(), start=1):
+        if (hash_prev, hash_self) != (str(record.get("hash_prev", "")), str(record.get("hash_self", ""))):
+            errors.append(f"line {line}: hash_prev/hash_self columns do not match the row body")
+        if check_row is not None:
+            errors.extend(f"line {line}: {message}" for message in check_row(record))
+        if "hash_prev" not in record:
+            continue
+        if record["hash_prev"] != expected:
+            errors.append(f"line {line}: hash_prev does not link to previous row")
+        expected = str(record.get("hash_self", ""))
+    return errors
+
+
+def import_jsonl(source: Path, target: Path, key: str | None = None, index_fields: Iterable[str] = ()) -> int:
+    """Copy a JSONL file into a SQLite store: a keyed table when key is given, else a record log."""
+    rows = list(iter_records(source))
+    if key is not None:
+        with closing(SqliteTable(target)) as table, write_transaction(table.conn):
+            for row in rows:
+                table.put(str(row[key]), row)
+        return len(rows)
+    log = SqliteLog(target, index_fields)
+    try:
+        log.append(rows)
+    finally:
+        log.close()
+    return len(rows)
+
+
+def export_jsonl(source: Path, target: Path, key: str | None = None) -> int:
+    """Write a SQLite store back out as sorted-key JSONL, in append order (or key order for a table)."""
+    if key is not None:
+        with closing(SqliteTable(source)) as table:
+            rows = table.values()
+    else:
+        log = SqliteLog(source)
+        try:
+            rows = list(log.records())
+        finally:
+            log.close()
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_bytes(b"".join(encode_line(row) for row in rows))
+    return len(rows)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Move VE ledgers and registries between JSONL and SQLite")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name in ("import", "export"):
+        command = sub.add_parser(name)
+        command.add_argument("source")
+        command.add_argument("target")
+        command.add_argument("--key", help="Registry key field (e.g. contact_id); omit for append-only ledgers.")
+        if name == "import":
+            command.add_argument("--index", action="append", default=[], help="Field to index; repeatable.")
+    verify = sub.add_parser("verify")
+    verify.add_argument("store")
+    verify.add_argument("--origin", default=ZERO_HASH, help="hash_prev of the first row, for a store imported from a rotated segment.")
+    verify.add_argument("--kind", choices=("lessons", "pairing", "receipt", "audit"), help="Also run this ledger's row hash check.")
+    verify.add_argument("--signing-key-env", default="VE_AUDIT_SIGNING_KEY", help="Audit signing key variable for --kind audit.")
+    args = parser.parse_args()
+    if args.command == "import":
+        print(json.dumps({"imported": import_jsonl(Path(args.source), Path(args.target), args.key, args.index)}))
+        return 0
+    if args.command == "export":
+        print(json.dumps({"exported": export_jsonl(Path(args.source), Path(args.target), args.key)}))
+        return 0
+    check_row = None
+    if args.kind is not None:
+        from ve_ledger_tail import row_check
+
+        check_row = row_check(args.kind, os.environ.get(args.signing_key_env, "demo-local-signing-key"))
+    log = open_log(Path(args.store))
+    try:
+        errors = verify_links(log, args.origin, check_row)
+    finally:
+        log.close()
+    print(json.dumps({"ok": not errors, "errors": errors[:20]}))
+    return 0 if not errors else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import argparse
+import json
+import math
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from typing import Any, Iterable
+
+try:
+    import numpy as np
+except ImportError:  # Optional: the sweep histograms fall back to pure Python.
+    np = None
+
+from echo_root_receipt import DECISION_CODES, RECEIPT_GATE_RULES, REPLAY_FIELDS, GateConfig, replay_request
+from self_proposal import POLICY_THRESHOLDS, SELF_PROPOSAL_GATE_RULES, AutonomyCharter, _thresholds
+from ve_columnar import ColumnTable
+from ve_ledger_segments import iter_ledger_records
+
+
+INF = float("inf")
+SWEEP_KINDS = {"original": "str", "fixed": "i8", "paused": "bool", "rho": "f8", "proceed_delta": "f8", "abort_delta": "f8"}
+# Thresholds that never fire, so a replay shows only what no threshold can change.
+_OPEN_RECEIPT_CONFIG = GateConfig(proceed_rho=-INF, proceed_delta=INF, abort_delta=INF)
+_OPEN_POLICY = {tier: {"rho": -INF, "delta": INF} for tier in POLICY_THRESHOLDS}
+_PROCEED, _PAUSE, _ABORT, _SAFE_MODE = (DECISION_CODES.index(name) for name in ("PROCEED", "PAUSE", "ABORT", "SAFE_MODE"))
+
+
+def _sweep_row(original: Any, open_decision: str, source: dict[str, Any]) -> dict[str, Any]:
+    """Split one replayed request into what thresholds cannot change and the values they act on.
+
+    open_decision is the gate's answer with thresholds that never fire:
+    SAFE_MODE or ABORT stays fixed at every grid point, PAUSE stays paused
+    unless the delta abort fires, and PROCEED depends on the grid.
+    """
+    row = {"original": str(original), "fixed": -1, "paused": open_decision == "PAUSE", "rho": 0.0, "proceed_delta": 0.0, "abort_delta": -INF}
+    if open_decision in {"SAFE_MODE", "ABORT"}:
+        row["fixed"] = DECISION_CODES.index(open_decision)
+        return row
+    abort_delta = float(source.get("delta", 0.0))
+    row["abort_delta"] = -INF if math.isnan(abort_delta) else abort_delta
+    if not row["paused"]:
+        row["rho"] = float(source.get("rho", 0.0))
+        row["proceed_delta"] = float(source.get("delta", 1.0))
+    return row
+
+
+def load_receipt_rows(path: Path, active_only: bool = False) -> ColumnTable:
+    """Replay every receipt once against open thresholds; see _sweep_row."""
+    table = ColumnTable(SWEEP_KINDS)
+    for receipt in iter_ledger_records(path, REPLAY_FIELDS, active_only):
+        request = replay_request(receipt)
+        decision, _ = RECEIPT_GATE_RULES.decide(request, config=_OPEN_RECEIPT_CONFIG)
+        table.append(_sweep_row(receipt.get("decision", ""), decision, request))
+    return table
+
+
+def load_self_proposal_rows(
+    path: Path,
+    tier: str = "standard",
+    charter: AutonomyCharter | dict[str, Any] | None = None,
+    active_only: bool = False,
+) -> ColumnTable:
+    """Replay self-proposal receipts; the grid replaces the rho/delta thresholds of one policy tier.
+
+    Proposals in other tiers keep their POLICY_THRESHOLDS. Receipts do not
+    record the charter they were gated under, so it is passed in.
+    """
+    resolved = charter if isinstance(charter, AutonomyCharter) else AutonomyCharter.from_dict(charter)
+    table = ColumnTable(SWEEP_KINDS)
+    for proposal in iter_ledger_records(path, active_only=active_only):
+        outcome = SELF_PROPOSAL_GATE_RULES.evaluate(
+            proposal,
+            charter=resolved,
+            chain_valid=bool(proposal.get("receipt_chain_valid", True)),
+            policy_ok=bool(proposal.get("policy_present", True)),
+            policy_thresholds=_OPEN_POLICY,
+            abort_delta=INF,
+        )
+        row = _sweep_row(proposal.get("decision", ""), outcome.decision, proposal)
+        row_tier = str(proposal.get("policy_tier", "standard"))
+        if row["fixed"] < 0 and not row["paused"] and (row_tier if row_tier in POLICY_THRESHOLDS else "standard") != tier:
+            own = _thresholds(row_tier)
+            if row["rho"] >= own["rho"] and row["proceed_delta"] <= own["delta"]:
+                row["rho"], row["proceed_delta"] = INF, -INF
+            else:
+                row["paused"] = True
+        table.append(row)
+    return table
+
+
+def _grid(values: Iterable[float]) -> list[float]:
+    grid = sorted({float(value) for value in values})
+    if not grid:
+        raise ValueError("threshold grids must not be empty")
+    return grid
+
+
+def _sweep_numpy(table: ColumnTable, rho: list[float], delta: list[float], abort: list[float]) -> list[int]:
+    classes = len(table.dictionaries["original"])
+    n_rho, n_delta, n_abort = len(rho), len(delta), len(abort)
+    original = table.raw("original")
+    fixed = table.raw("fixed")
+    out = np.zeros((classes, len(DECISION_CODES), n_rho, n_delta, n_abort), dtype=np.int64)
+    for code in (_SAFE_MODE, _ABORT):
+        out[:, code] += np.bincount(original[fixed == code], minlength=classes)[:, None, None, None]
+
+    open_rows = fixed < 0
+    eligible = open_rows & (table.raw("paused") == 0)
+    # Bin each row by how many grid values sit on each side of it; a row aborts for abort index k < a.
+    cls = original[open_rows]
+    cut = np.searchsorted(abort, table.raw("abort_delta")[open_rows], side="left")
+    aborted = np.bincount(cls * (n_abort + 1) + cut, minlength=classes * (n_abort + 1)).reshape(classes, n_abort + 1)
+    aborted = aborted[:, ::-1].cumsum(axis=1)[:, ::-1][:, 1:]
+
+    # An eligible row proceeds at (i, j, k) when i < r, j >= d and k >= a.
+    r = np.searchsorted(rho, table.raw("rho")[eligible], side="right")
+    d = np.searchsorted(delta, table.raw("proceed_delta")[eligible], side="left")
+    a = np.searchsorted(abort, table.raw("abort_delta")[eligible], side="left")
+    flat = ((original[eligible] * (n_rho + 1) + r) * (n_delta + 1) + d) * (n_abort + 1) + a
+    hist = np.bincount(flat, minlength=classes * (n_rho + 1) * (n_delta + 1) * (n_abort + 1)).reshape(classes, n_rho + 1, n_delta + 1, n_abort + 1)
+    proceed = hist[:, ::-1].cumsum(axis=1)[:, ::-1][:, 1:].cumsum(axis=2)[:, :, :n_delta].cumsum(axis=3)[:, :, :, :n_abort]
+
+    out[:, _PROCEED] = proceed
+    out[:, _PAUSE] = np.bincount(cls, minlength=classes)[:, None, None, None] - aborted[:, None, None, :] - proceed
+    out[:, _ABORT] += aborted[:, None, None, :]
+    return out.ravel().tolist()
+
+
+def _sweep_python(table: ColumnTable, rho: list[float], delta: list[float], abort: list[float]) -> list[int]:
+    classes = len(table.dictionaries["original"])
+    n_rho, n_delta, n_abort = len(rho), len(delta), len(abort)
+    size = (n_rho + 1) * (n_delta + 1) * (n_abort + 1)
+    hist = [0] * (classes * size)
+    aborted = [[0] * (n_abort + 1) for _ in range(classes)]
+    open_rows = [0] * classes
+    fixed_counts = [[0] * len(DECISION_CODES) for _ in range(classes)]
+    columns = [table.raw(name) for name in ("original", "fixed", "paused", "rho", "proceed_delta", "abort_delta")]
+    for cls, fixed, paused, row_rho, row_delta, row_abort in zip(*columns):
+        if fixed >= 0:
+            fixed_counts[cls][fixed] += 1
+            continue
+        open_rows[cls] += 1
+        cut = bisect_left(abort, row_abort)
+        aborted[cls][cut] += 1
+        if not paused:
+            r, d = bisect_right(rho, row_rho), bisect_left(delta, row_delta)
+            hist[((cls * (n_rho + 1) + r) * (n_delta + 1) + d) * (n_abort + 1) + cut] += 1
+
+    def at(cls: int, r: int, d: int, a: int) -> int:
+        return ((cls * (n_rho + 1) + r) * (n_delta + 1) + d) * (n_abort + 1) + a
+
+    for cls in range(classes):
+        for r in range(n_rho + 1):
+            for d in range(n_delta + 1):
+                for a in range(1, n_abort + 1):
+                    hist[at(cls, r, d, a)] += hist[at(cls, r, d, a - 1)]
+            for d in range(1, n_delta + 1):
+                for a in range(n_abort + 1):
+                    hist[at(cls, r, d, a)] += hist[at(cls, r, d - 1, a)]
+        for r in range(n_rho - 1, -1, -1):
+            for d in range(n_delta + 1):
+                for a in range(n_abort + 1):
+                    hist[at(cls, r, d, a)] += hist[at(cls, r + 1, d, a)]
+        for a in range(n_abort - 1, -1, -1):
+            aborted[cls][a] += aborted[cls][a + 1]
+
+    out = [0] * (classes * len(DECISION_CODES) * n_rho * n_delta * n_abort)
+    block = n_rho * n_delta * n_abort
+    for cls in range(classes):
+        for i in range(n_rho):
+            for j in range(n_delta):
+                for k in range(n_abort):
+                    cell = (i * n_delta + j) * n_abort + k
+                    proceed = hist[at(cls, i + 1, j, k)]
+                    abort_count = aborted[cls][k + 1]
+                    base = cls * len(DECISION_CODES) * block
+                    out[base + _PROCEED * block + cell] = proceed
+                    out[base + _PAUSE * block + cell] = open_rows[cls] - abort_count - proceed
+                    out[base + _ABORT * block + cell] = abort_count + fixed_counts[cls][_ABORT]
+                    out[base + _SAFE_MODE * block + cell] = fixed_counts[cls][_SAFE_MODE]
+    return out
+
+
+def sweep(table: ColumnTable, rho: Iterable[float], delta: Iterable[float], abort: Iterable[float]) -> dict[str, Any]:
+    """Decision counts and shifts from the recorded decisions at every (rho, delta, abort_delta) grid point.
+
+    Each row is binned once by where its values fall between grid values, and
+    cumulative sums over those bins give every grid point at once, so the cost
+    is one pass over the rows plus one pass over the grid.
+    """
+    rho_grid, delta_grid, abort_grid = _grid(rho), _grid(delta), _grid(abort)
+    counts = (_sweep_numpy if np is not None else _sweep_python)(table, rho_grid, delta_grid, abort_grid)
+    labels = table.dictionaries["original"]
+    block = len(rho_grid) * len(delta_grid) * len(abort_grid)
+    points = []
+    for i, rho_value in enumerate(rho_grid):
+        for j, delta_value in enumerate(delta_grid):
+            for k, abort_value in enumerate(abort_grid):
+                cell = (i * len(delta_grid) + j) * len(abort_grid) + k
+                decisions = dict.fromkeys(DECISION_CODES, 0)
+                shifts: dict[str, int] = {}
+                for cls, label in enumerate(labels):
+                    for code, decision in enumerate(DECISION_CODES):
+                        count = counts[(cls * len(DECISION_CODES) + code) * block + cell]
+                        decisions[decision] += count
+                        if count and label != decision:
+                            shifts[f"{label}->{decision}"] = count
+                points.append(
+                    {
+                        "rho": rho_value,
+                        "delta": delta_value,
+                        "abort_delta": abort_value,
+                        "decisions": decisions,
+                        "changed": sum(shifts.values()),
+                        "shifts": shifts,
+                    }
+                )
+    recorded = table.values("original")
+    return {
+        "receipts": table.rows,
+        "recorded": {label: recorded.count(label) for label in labels},
+        "grid": {"rho": rho_grid, "delta": delta_grid, "abort_delta": abort_grid},
+        "points": points,
+    }
+
+
+def parse_grid(spec: str) -> list[float]:
+    """Parse "start:stop:step" (stop included) or a comma-separated list of values."""
+    if ":" not in spec:
+        return [float(item) for item in spec.split(",") if item.strip()]
+    start, stop, step = (float(item) for item in spec.split(":"))
+    if step <= 0:
+        raise ValueError("grid step must be positive")
+    count = int(math.floor((stop - start) / step + 1e-9)) + 1
+    return [round(start + index * step, 10) for index in range(count)]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="What-if threshold sweep over historical gate decisions")
+    parser.add_argument("--ledger", default="receipts/demo_receipts.jsonl")
+    parser.add_argument("--kind", choices=["receipt", "self-proposal"], default="receipt")
+    parser.add_argument("--rho", default="0.70", help='Grid as "start:stop:step" or "a,b,c".')
+    parser.add_argument("--delta", default="0.30")
+    parser.add_argument("--abort", default="0.40")
+    parser.add_argument("--tier", default="standard", help="Self-proposal policy tier the grid replaces.")
+    parser.add_argument("--charter", help="Autonomy charter JSON for self-proposal replays.")
+    parser.add_argument("--active-only", action="store_true", help="Sweep only the active segment.")
+    args = parser.parse_args()
+    ledger = Path(args.ledger)
+    if args.kind == "receipt":
+        table = load_receipt_rows(ledger, args.active_only)
+    else:
+        charter = json.loads(Path(args.charter).read_text(encoding="utf-8")) if args.charter else None
+        table = load_self_proposal_rows(ledger, args.tier, charter, args.active_only)
+    result = sweep(table, parse_grid(args.rho), parse_grid(args.delta), parse_grid(args.abort))
+    print(json.dumps({"ledger": str(ledger), "kind": args.kind, **result}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,9 +2,24 @@ from __future__ import annotations
 
 import argparse
 import json
-from dataclasses import asdict, dataclass
+import math
+import threading
+from dataclasses import asdict, dataclass, replace
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Any
+
+from ve_storage import connect, write_transaction
+
+
+EWMA_ALPHA = 0.2
+WINDOW_SIZE = 32
+DRIFT_SIGMAS = 2.0
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS twins (pairing_id TEXT PRIMARY KEY, observations INTEGER NOT NULL, updated_utc TEXT NOT NULL, state TEXT NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)",
+)
 
 
 @dataclass(frozen=True)
@@ -18,13 +33,13 @@ class TwinState:
     gamma_baseline: float
     delta_baseline: float
     observations: int = 0
+    delta_mean: float = 0.0
+    delta_m2: float = 0.0
+    delta_ewma: float = 0.30
+    delta_window: tuple[float, ...] = ()
 
 
-def load_twin(path: Path, pairing_id: str) -> TwinState:
-    if path.exists():
-        data = json.loads(path.read_text(encoding="utf-8"))
-        if data.get("pairing_id") == pairing_id:
-            return TwinState(**data)
+def new_twin(pairing_id: str) -> TwinState:
     return TwinState(
         pairing_id=pairing_id,
         updated_utc=datetime.now(timezone.utc).isoformat(),
@@ -37,40 +52,211 @@ def load_twin(path: Path, pairing_id: str) -> TwinState:
     )
 
 
-def update_twin(
-    path: Path,
-    pairing_id: str,
+def twin_from_dict(data: dict[str, Any]) -> TwinState:
+    """Build a TwinState, seeding the running statistics of files written before they existed."""
+    data = dict(data)
+    data.setdefault("delta_mean", data.get("delta_baseline", 0.0) if data.get("observations") else 0.0)
+    data.setdefault("delta_ewma", data.get("delta_baseline", 0.30))
+    data["delta_window"] = tuple(float(item) for item in data.get("delta_window", ()))
+    return TwinState(**data)
+
+
+def twin_record(twin: TwinState) -> dict[str, Any]:
+    """The twin as reported in gate envelopes: every field except the raw delta window."""
+    record = asdict(twin)
+    del record["delta_window"]
+    return record
+
+
+def observe(
+    current: TwinState,
     observed_action_class: str,
     observed_decision: str,
     rho: float,
     gamma: float,
     delta: float,
+    alpha: float = EWMA_ALPHA,
+    window: int = WINDOW_SIZE,
 ) -> TwinState:
-    current = load_twin(path, pairing_id)
+    """Fold one gate decision into the twin in constant time.
+
+    The baselines stay cumulative means. delta also gets a Welford mean and
+    sum of squares, an EWMA, and the last `window` values for quantiles.
+    """
     n = current.observations + 1
-    updated = TwinState(
-        pairing_id=pairing_id,
+    step = delta - current.delta_mean
+    mean = current.delta_mean + step / n
+    return replace(
+        current,
         updated_utc=datetime.now(timezone.utc).isoformat(),
-        expected_cadence=current.expected_cadence,
         expected_action_class=observed_action_class or current.expected_action_class,
         expected_decision=observed_decision or current.expected_decision,
         rho_baseline=round(((current.rho_baseline * current.observations) + rho) / n, 3),
         gamma_baseline=round(((current.gamma_baseline * current.observations) + gamma) / n, 3),
         delta_baseline=round(((current.delta_baseline * current.observations) + delta) / n, 3),
         observations=n,
+        delta_mean=mean,
+        delta_m2=current.delta_m2 + step * (delta - mean),
+        delta_ewma=delta if current.observations == 0 else current.delta_ewma + alpha * (delta - current.delta_ewma),
+        delta_window=(current.delta_window + (delta,))[-window:],
     )
+
+
+def delta_stddev(twin: TwinState) -> float:
+    """Sample standard deviation of observed delta, 0.0 before two observations."""
+    if twin.observations < 2:
+        return 0.0
+    return math.sqrt(max(twin.delta_m2, 0.0) / (twin.observations - 1))
+
+
+def delta_quantile(twin: TwinState, q: float) -> float:
+    """Nearest-rank quantile of the recent delta window, or the baseline when it is empty."""
+    if not twin.delta_window:
+        return twin.delta_baseline
+    ordered = sorted(twin.delta_window)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
+
+
+def predicted_delta(twin: TwinState, observed_delta: float, variance_aware: bool = False) -> float:
+    """Gap between observed delta and the twin's expectation.
+
+    By default the gap is to the cumulative baseline. variance_aware measures
+    from the EWMA instead and discounts DRIFT_SIGMAS standard deviations, so
+    only drift beyond the pairing's normal spread remains.
+    """
+    if not variance_aware:
+        return round(abs(observed_delta - twin.delta_baseline), 3)
+    gap = abs(observed_delta - twin.delta_ewma)
+    return round(max(0.0, gap - DRIFT_SIGMAS * delta_stddev(twin)), 3)
+
+
+def twin_drift(twin: TwinState, observed_delta: float) -> dict[str, Any]:
+    stddev = delta_stddev(twin)
+    return {
+        "delta_ewma": round(twin.delta_ewma, 3),
+        "delta_stddev": round(stddev, 3),
+        "z_score": round((observed_delta - twin.delta_ewma) / stddev, 3) if stddev else None,
+        "window_p50": round(delta_quantile(twin, 0.5), 3),
+        "window_p90": round(delta_quantile(twin, 0.9), 3),
+        "variance_aware_delta": predicted_delta(twin, observed_delta, variance_aware=True),
+    }
+
+
+class TwinStore:
+    """Twin states for many pairings in one SQLite database, one row per pairing.
+
+    The database runs in WAL mode, so readers never block the writer. Each
+    update is a single read-modify-write transaction on one row, taken with
+    BEGIN IMMEDIATE so concurrent writers serialise instead of losing updates.
+    On first open, a legacy single-pairing file with the same name and a
+    .json suffix is imported.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.conn = connect(path, _SCHEMA, synchronous="NORMAL")
+        self._import_legacy(path.with_suffix(".json"))
+
+    def _import_legacy(self, legacy: Path) -> None:
+        """Copy a legacy twin file in once; the file is left in place and a newer row is never replaced."""
+        if not legacy.exists() or self.conn.execute("SELECT 1 FROM meta WHERE name = 'legacy_imported'").fetchone():
+            return
+        twin = twin_from_dict(json.loads(legacy.read_text(encoding="utf-8")))
+        with write_transaction(self.conn):
+            if self.conn.execute("SELECT 1 FROM meta WHERE name = 'legacy_imported'").fetchone():
+                return
+            self.conn.execute(
+                "INSERT OR IGNORE INTO twins (pairing_id, observations, updated_utc, state) VALUES (?, ?, ?, ?)",
+                (twin.pairing_id, twin.observations, twin.updated_utc, json.dumps(asdict(twin), sort_keys=True)),
+            )
+            self.conn.execute("INSERT INTO meta (name, value) VALUES ('legacy_imported', ?)", (str(legacy),))
+
+    def _get(self, pairing_id: str) -> TwinState | None:
+        row = self.conn.execute("SELECT state FROM twins WHERE pairing_id = ?", (pairing_id,)).fetchone()
+        return None if row is None else twin_from_dict(json.loads(row[0]))
+
+    def load(self, pairing_id: str) -> TwinState:
+        return self._get(pairing_id) or new_twin(pairing_id)
+
+    def update(
+        self,
+        pairing_id: str,
+        observed_action_class: str,
+        observed_decision: str,
+        rho: float,
+        gamma: float,
+        delta: float,
+    ) -> TwinState:
+        with write_transaction(self.conn):
+            updated = observe(self.load(pairing_id), observed_action_class, observed_decision, rho, gamma, delta)
+            self.conn.execute(
+                "INSERT INTO twins (pairing_id, observations, updated_utc, state) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (pairing_id) DO UPDATE SET observations = excluded.observations, "
+                "updated_utc = excluded.updated_utc, state = excluded.state",
+                (pairing_id, updated.observations, updated.updated_utc, json.dumps(asdict(updated), sort_keys=True)),
+            )
+        return updated
+
+    def pairings(self) -> list[str]:
+        return [row[0] for row in self.conn.execute("SELECT pairing_id FROM twins ORDER BY pairing_id")]
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+_STORES = threading.local()
+
+
+def open_store(path: Path) -> TwinStore:
+    """Return this thread's cached TwinStore for path."""
+    stores = _STORES.__dict__.setdefault("stores", {})
+    key = str(path.resolve())
+    if key not in stores:
+        stores[key] = TwinStore(path)
+    return stores[key]
+
+
+def close_stores() -> None:
+    """Close this thread's cached TwinStore connections."""
+    for store in _STORES.__dict__.pop("stores", {}).values():
+        store.close()
+
+
+def _legacy(path: Path) -> bool:
+    return path.suffix == ".json"
+
+
+def load_twin(path: Path, pairing_id: str) -> TwinState:
+    """Load one pairing's twin. A .json path is a legacy single-pairing file; anything else is a TwinStore."""
+    if not _legacy(path):
+        return open_store(path).load(pairing_id)
+    if path.exists():
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if data.get("pairing_id") == pairing_id:
+            return twin_from_dict(data)
+    return new_twin(pairing_id)
+
+
+def update_twin(
+    path: Path,
+    pairing_id: str,
+    observed_action_class: str,
+    observed_decision: str,
+    rho: float,
+    gamma: float,
+    delta: float,
+) -> TwinState:
+    if not _legacy(path):
+        return open_store(path).update(pairing_id, observed_action_class, observed_decision, rho, gamma, delta)
+    updated = observe(load_twin(path, pairing_id), observed_action_class, observed_decision, rho, gamma, delta)
     path.parent.mkdir(parents=True, exist_ok=True)
     path.write_text(json.dumps(asdict(updated), indent=2), encoding="utf-8")
     return updated
 
 
-def predicted_delta(twin: TwinState, observed_delta: float) -> float:
-    return round(abs(observed_delta - twin.delta_baseline), 3)
-
-
 def main() -> int:
     parser = argparse.ArgumentParser(description="VE lightweight pairing digital twin state")
-    parser.add_argument("--state", default="ve_data/twin_state.json")
+    parser.add_argument("--state", default="ve_data/twin_state.sqlite", help="Twin store; a .json path is a legacy single-pairing file.")
     parser.add_argument("--pairing-id", required=True)
     sub = parser.add_subparsers(dest="command", required=True)
 